@@ -0,0 +1,43 @@
+import random
+import sys
+import time
+import constants as c
+from heuristics.ALNS import ALNS
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RandomizedSearch import RandomizedSearch
+
+# Compares ALNS with RandomizedSearch.get_solution on the five test days: the search runs the number of iterations, 500
+# by default or given as argument, and ALNS gets the same time, including its initial construction. Both start from
+# random.seed(0).
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+number_iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+
+def describe(schedule):
+    return 'costs %d, %2d trucks, %d too long' % (schedule.get_total_costs(), schedule.get_total_number_of_trucks(),
+                                                   len(schedule.get_too_long_trucks_without_split()))
+
+
+results = []
+for day in days:
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=5
+    )
+    input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+
+    random.seed(0)
+    tic = time.time()
+    search_solution = RandomizedSearch(input=input, config=config).get_solution(number_iterations)[0]
+    search_time = time.time() - tic
+    random.seed(0)
+    alns = ALNS(input=input, config=config, time_limit=search_time)
+    alns_solution = alns.get_solution()
+    results.append('%-6s %5.1f s; randomized search %s; ALNS %s, %d iterations' % (
+        day, search_time, describe(search_solution), describe(alns_solution), alns.number_of_iterations))
+
+print('\n'.join(results))
@@ -0,0 +1,70 @@
+import random
+import time
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.Shipment import Shipment
+from heuristics.Truck import Truck
+from heuristics.ActiveTrucks import ActiveTrucks
+from heuristics.DeterministicCS import DeterministicCS, get_active_trucks_with_space, cost_active_truck, \
+    cheapest_compatible_shipment_truck, cost_inactive_truck
+from heuristics.RandomizedCS import RandomizedCS
+
+# Compares scoring the active trucks one by one with the vectorized ActiveTrucks.score on the 237 shipment day. The
+# greedy of DeterministicCS is replayed and at every shipment both ways must choose the same truck.
+
+config = Config(
+    shipments_file_time_windows='/test_data/Data 22_01 - Shipments.csv',
+    gap_percentage=1.0,
+    time_window_interval_in_minutes=20,
+    max_number_shipment_multiplication=5
+)
+
+input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+sorted_shipments_tw = sorted(input.shipments_tw, key=lambda shipment_tw: (
+    shipment_tw.latest_start_time, shipment_tw.latest_start_time - shipment_tw.earliest_start_time))
+print('Number of shipments: ', len(sorted_shipments_tw))
+
+trucks = [Truck(depot) for depot, number_of_trucks in input.depots.items() for _ in range(number_of_trucks)]
+active_trucks = ActiveTrucks()
+time_per_truck = 0
+time_vectorized = 0
+for shipment_tw in sorted_shipments_tw:
+    tic = time.perf_counter()
+    active_trucks_with_space = get_active_trucks_with_space(shipment_tw, [truck for truck in active_trucks.trucks])
+    best_truck_per_truck = None
+    if len(active_trucks_with_space) > 0:
+        best_truck_per_truck = min(active_trucks_with_space, key=lambda truck: cost_active_truck(truck, cheapest_compatible_shipment_truck(truck, shipment_tw)))
+    time_per_truck += time.perf_counter() - tic
+
+    tic = time.perf_counter()
+    positions, start_times, costs = active_trucks.score(shipment_tw)
+    best_truck_vectorized = None
+    if len(positions) > 0:
+        best = int(costs.argmin())
+        best_truck_vectorized = active_trucks.trucks[positions[best]]
+    time_vectorized += time.perf_counter() - tic
+
+    if best_truck_per_truck is not best_truck_vectorized:
+        raise ValueError('Different truck chosen for shipment ' + shipment_tw.id)
+    if best_truck_vectorized is not None:
+        best_truck_vectorized.add_shipment(Shipment(input_shipment=shipment_tw, start_time=float(start_times[best])))
+        active_trucks.update(positions[best])
+    else:
+        shipment = Shipment(start_time=shipment_tw.earliest_start_time, input_shipment=shipment_tw)
+        rank, the_best_truck = min([(rank, truck) for rank, truck in enumerate(trucks) if not truck.is_active()],
+                                   key=lambda rank_truck: cost_inactive_truck(rank_truck[1], shipment))
+        the_best_truck.add_shipment(shipment)
+        active_trucks.add_truck(the_best_truck, rank)
+
+print('Active trucks at the end: ', len(active_trucks))
+print('Scoring truck by truck: %8.4f s' % time_per_truck)
+print('Vectorized scoring:     %8.4f s' % time_vectorized)
+print('Speedup: %.1fx' % (time_per_truck / time_vectorized))
+
+for name, scheduler in [('DeterministicCS', DeterministicCS), ('RandomizedCS', RandomizedCS)]:
+    random.seed(0)
+    tic = time.time()
+    schedule = scheduler(input=input, config=config).get_solution()
+    toc = time.time()
+    print(name, 'on 22_01: ', schedule.get_total_costs(), ' in ', round(toc - tic, 3), ' s')
@@ -0,0 +1,42 @@
+import sys
+import constants as c
+from heuristics.ColumnGeneration import ColumnGeneration
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.MDVSPTWILP import MDVSPTWILP
+
+# Compares ColumnGeneration with the arc flow model of MDVSPTWILP solved by HiGHS on the five test days: the time, the
+# costs and the number of trucks of the schedule, and the number of trucks that are too long and cannot be split, which
+# the arc flow model does not prevent. The maximum number of discretized shipments per time window of the arc flow
+# model can be given as argument, default 5.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+max_number_shipment_multiplication = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+
+def describe(day, name, time, schedule):
+    too_long = len(schedule.get_too_long_trucks_without_split())
+    return '%-6s %-18s %7.2f s, costs %d, %d trucks, %d too long without split' % (
+        day, name, time, schedule.get_total_costs(), schedule.get_total_number_of_trucks(), too_long)
+
+
+results = []
+for day in days:
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=max_number_shipment_multiplication
+    )
+    input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+
+    ilp = MDVSPTWILP(input=input, config=config, solver='highs')
+    schedule = ilp.get_solution()
+    results.append(describe(day, 'arc flow', ilp.build_time + ilp.solve_time, schedule))
+
+    column_generation = ColumnGeneration(input=input, config=config)
+    schedule = column_generation.get_solution()
+    results.append(describe(day, 'column generation', column_generation.solve_time, schedule) +
+                   ', LP value %d' % column_generation.lp_value)
+
+print('\n'.join(results))
@@ -0,0 +1,47 @@
+import random
+import time
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RandomizedSearch import RandomizedSearch
+
+# Compares Schedule.post_improve_depots, which moves every truck that starts after 1.25 to its nearest depot, with
+# Schedule.post_optimize_depots, which solves the assignment of the trucks to the depots with their capacities, on a
+# randomized construction of each of the five test days, with the default and the real depot capacities. Prints the
+# total costs, the number of trucks over the capacity of their depot and the time.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+depots_files = [c.depots_file, c.root + '/test_data/Data - depots real.csv']
+
+
+def get_number_over_capacity(schedule, depots):
+    return sum(max(schedule.get_number_of_trucks_per_depot(depot) - capacity, 0) for depot, capacity in depots.items())
+
+
+results = []
+for day in days:
+    for depots_file in depots_files:
+        config = Config(
+            shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+            gap_percentage=1.0,
+            time_window_interval_in_minutes=20,
+            max_number_shipment_multiplication=5
+        )
+        input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=depots_file)
+        random.seed(0)
+        construction = RandomizedSearch(input=input, config=config).get_construction()
+        result = '%-6s %-26s %2d trucks' % (day, depots_file[len(c.root + '/test_data/'):],
+                                            construction.get_total_number_of_trucks())
+        for name in ['post_improve_depots', 'post_optimize_depots']:
+            schedule = construction.snapshot()
+            tic = time.time()
+            if name == 'post_improve_depots':
+                schedule.post_improve_depots()
+            else:
+                schedule.post_optimize_depots(input.depots)
+            result += '; %s %5.1f ms, costs %d, %2d over capacity' % (
+                name, 1000 * (time.time() - tic), schedule.get_total_costs(),
+                get_number_over_capacity(schedule, input.depots))
+        results.append(result)
+
+print('\n'.join(results))
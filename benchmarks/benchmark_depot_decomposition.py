@@ -0,0 +1,37 @@
+import os
+import sys
+import constants as c
+from heuristics.Config import Config
+from heuristics.DepotDecomposition import DepotDecomposition, DepotLayerModel
+from heuristics.InputTW import InputTW
+
+# Compares DepotDecomposition, with a process per core, with solving the same multi depot time space network at once
+# by HiGHS on the five test days: the time, the lower bound and the network costs of the schedule of the decomposition
+# and the optimum of the whole network. The depots file can be given as argument, default the one in constants, for
+# instance '/test_data/Data - depots real.csv' with the real depot capacities.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+depots_file = c.root + sys.argv[1] if len(sys.argv) > 1 else c.depots_file
+
+results = []
+for day in days:
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=2
+    )
+    input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=depots_file)
+
+    decomposition = DepotDecomposition(input=input, config=config, number_of_workers=os.cpu_count(), solver='highs')
+    decomposition.get_solution()
+    model = DepotLayerModel(input=input, config=config, solver='highs')
+    model.get_solution()
+    decomposition_result = 'lower bound %d, costs %s, gap %s' % (
+        decomposition.lower_bound, '%d' % decomposition.upper_bound if decomposition.upper_bound < float('inf') else '-',
+        '%.1f%%' % (100 * decomposition.get_gap()) if decomposition.upper_bound < float('inf') else '-')
+    model_result = '%d' % model.objective if model.objective is not None else 'infeasible'
+    results.append('%-6s decomposition %6.1f s, %s; whole network %6.1f s, costs %s' % (
+        day, decomposition.solve_time, decomposition_result, model.build_time + model.solve_time, model_result))
+
+print('\n'.join(results))
@@ -0,0 +1,46 @@
+import sys
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.MDVSPTWILP import MDVSPTWILP
+
+# Compares the build and solve time of MDVSPTWILP with the flow solvers on the five test days. The multi depot model is
+# solved with Gurobi and HiGHS, the single depot model (only the shipments the depot can execute, one discretized
+# shipment per time window) also with the network simplex. The maximum number of discretized shipments per time window
+# of the multi depot model can be given as argument, default 5.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+max_number_shipment_multiplication = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+single_depot = 'FC3'
+
+
+def run(day, multiplication, solver, depot=None):
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=multiplication
+    )
+    input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+    if depot is not None:
+        input.shipments_tw = [shipment_tw for shipment_tw in input.shipments_tw if 'IB' in shipment_tw.type or
+                              c.time_diff_table[shipment_tw.start_location_index][c.location_index[depot]] < 1]
+        input.depots = {depot: len(input.shipments_tw)}
+    ilp = MDVSPTWILP(input=input, config=config, solver=solver)
+    try:
+        schedule = ilp.get_solution()
+    except Exception as error:
+        return '%-6s %-16s failed: %s' % (day, solver, str(error).splitlines()[0][:60])
+    return '%-6s %-16s build %7.2f s, solve %7.2f s, %s, %d trucks' % (
+        day, ilp.solver_used.name, ilp.build_time, ilp.solve_time, ilp.solver_used.status,
+        schedule.get_total_number_of_trucks())
+
+
+results = []
+for day in days:
+    for solver in ['gurobi', 'highs']:
+        results.append('multi depot   ' + run(day, max_number_shipment_multiplication, solver))
+    for solver in ['network_simplex', 'gurobi', 'highs']:
+        results.append('single depot  ' + run(day, 1, solver, depot=single_depot))
+
+print('\n'.join(results))
@@ -0,0 +1,41 @@
+import sys
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from ilp_models.MDVSP_TSN_model import MDVSPTSNModel
+from ilp_models.MDVSP_TSN_old_model import MDVSPTSNOldModel
+from ilp_models.MDVSP_TW_FixedOBStartDepots_model import MDVSPTWFixedOBStartDepotsModel
+from ilp_models.MDVSP_TW_model import MDVSPTWModel
+from ilp_models.MDVSP_model import MDVSPModel
+from ilp_models.MDVSPTW_TSN_model import MDVSPTWTSNModel
+from ilp_models.SDVSP_TSN_model import SDVSPTSNModel
+from ilp_models.SDVSP_model import SDVSPModel
+from ilp_models.VSPLPR_model import VSPLPRModel
+
+# Builds every formulation of ilp_models on the five test days and prints the number of arcs and nodes and the build
+# time. With the argument solve the single depot models, which are solved in seconds, are also solved and extracted.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+model_classes = [SDVSPModel, SDVSPTSNModel, MDVSPModel, MDVSPTSNModel, MDVSPTSNOldModel, MDVSPTWModel,
+                 MDVSPTWTSNModel, MDVSPTWFixedOBStartDepotsModel, VSPLPRModel]
+solved_model_classes = [SDVSPModel, SDVSPTSNModel]
+is_solving = len(sys.argv) > 1 and sys.argv[1] == 'solve'
+
+for day in days:
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=5
+    )
+    input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+    for model_class in model_classes:
+        model = model_class(input=input, config=config)
+        network = model.build()
+        line = '%s %-32s %8d arcs %7d nodes, build %7.3f s' % (day, model_class.__name__, network.get_number_of_arcs(),
+                                                              len(network.nodes), model.build_time)
+        if is_solving and model_class in solved_model_classes:
+            schedule = model.get_solution()
+            line += ', solve %7.3f s, extract %6.3f s, objective %.1f, %d trucks' % (
+                model.solve_time, model.extract_time, model.objective, schedule.get_total_number_of_trucks())
+        print(line)
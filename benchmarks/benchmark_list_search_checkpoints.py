@@ -0,0 +1,35 @@
+import random
+import time
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RandomizedtiesCS import RandomizedtiesCS
+
+# Time per neighbour of ListSearch on the 237 shipment day: two positions of the order are swapped, the order is
+# constructed and the swap is rejected again. Without checkpoints every neighbour is a construction from scratch, with
+# checkpoints it resumes from the first position that differs from the construction before it.
+
+number_of_neighbours = 200
+
+config = Config(
+    shipments_file_time_windows='/test_data/Data 22_01 - Shipments.csv',
+    gap_percentage=1.0,
+    time_window_interval_in_minutes=20,
+    max_number_shipment_multiplication=5
+)
+
+input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+
+for checkpoints in [False, True]:
+    random.seed(0)
+    cs = RandomizedtiesCS(input=input, config=config, checkpoints=checkpoints)
+    cs.get_solution()
+    order = cs.sorted_shipments_tw
+    tic = time.time()
+    for i in range(number_of_neighbours):
+        r1, r2 = random.sample(range(len(order) - 2), 2)
+        order[r1], order[r2] = order[r2], order[r1]
+        cs.get_solution().get_total_costs()
+        order[r1], order[r2] = order[r2], order[r1]
+    toc = time.time()
+    print('Checkpoints: %5s, time per neighbour: %6.2f ms' % (checkpoints, (toc - tic) / number_of_neighbours * 1000))
@@ -0,0 +1,45 @@
+import random
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.LocalSearch import LocalSearch
+from heuristics.RandomizedSearch import RandomizedSearch
+
+# Runs LocalSearch with both policies on a randomized construction of each of the five test days, and of the five days
+# together as one day of about 1000 shipments, with the capacity of every depot raised so the construction fits. Prints
+# the costs and trucks before and after, and the time of the local search.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+
+
+def get_input(day):
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=5
+    )
+    return config, InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+
+
+instances = [(day,) + get_input(day) for day in days]
+config, all_days_input = get_input(days[0])
+all_days_input.shipments_tw = [shipment_tw for day, _, input in instances for shipment_tw in input.shipments_tw]
+all_days_input.depots = {depot: 1000 for depot in all_days_input.depots}
+instances.append(('all', config, all_days_input))
+
+results = []
+for name, config, input in instances:
+    random.seed(0)
+    construction = RandomizedSearch(input=input, config=config).get_construction()
+    result = '%-6s %4d shipments, construction costs %d, %3d trucks' % (
+        name, len(input.shipments_tw), construction.get_total_costs(), construction.get_total_number_of_trucks())
+    for policy in ['first', 'best']:
+        schedule = construction.snapshot()
+        local_search = LocalSearch(policy=policy)
+        local_search.improve(schedule)
+        result += '; %s %5.2f s, costs %d, %3d trucks' % (policy, local_search.solve_time, schedule.get_total_costs(),
+                                                          schedule.get_total_number_of_trucks())
+    results.append(result)
+
+print('\n'.join(results))
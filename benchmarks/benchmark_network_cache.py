@@ -0,0 +1,38 @@
+import sys
+import tempfile
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.NetworkCache import NetworkCache
+from ilp_models.MDVSP_TW_model import MDVSPTWModel
+from ilp_models.MDVSPTW_TSN_model import MDVSPTWTSNModel
+
+# Compares building the networks of MDVSPTWModel, which has the arcs of MDVSPTWILP, and MDVSPTWTSNModel with loading
+# them from a NetworkCache on the five test days. The cache is a temporary directory, so the first build is always a
+# miss and includes writing the network. The maximum number of discretized shipments per time window can be given as
+# argument, default 5.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+max_number_shipment_multiplication = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+results = []
+with tempfile.TemporaryDirectory() as directory:
+    cache = NetworkCache(directory=directory)
+    for day in days:
+        config = Config(
+            shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+            gap_percentage=1.0,
+            time_window_interval_in_minutes=20,
+            max_number_shipment_multiplication=max_number_shipment_multiplication
+        )
+        input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+        for model_class in [MDVSPTWModel, MDVSPTWTSNModel]:
+            build_times = []
+            for _ in range(2):
+                model = model_class(input=input, config=config, cache=cache)
+                model.build()
+                build_times.append(model.build_time)
+            results.append('%-6s %-16s %8d arcs, build and save %6.2f s, load %6.2f s' % (
+                day, model_class.__name__, model.network.get_number_of_arcs(), build_times[0], build_times[1]))
+
+print('\n'.join(results))
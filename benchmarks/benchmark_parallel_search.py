@@ -0,0 +1,34 @@
+import os
+import time
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RandomizedSearch import RandomizedSearch
+
+# Runs RandomizedSearch.get_solution_parallel on the 237 shipment day with 1, 2, 4, ... workers up to the number of
+# cores and prints the running time and the speedup over one worker.
+
+number_iterations = 400
+
+config = Config(
+    shipments_file_time_windows='/test_data/Data 22_01 - Shipments.csv',
+    gap_percentage=1.0,
+    time_window_interval_in_minutes=20,
+    max_number_shipment_multiplication=5
+)
+
+input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+search = RandomizedSearch(input=input, config=config)
+
+number_of_workers = 1
+time_one_worker = None
+while number_of_workers <= os.cpu_count():
+    tic = time.time()
+    solution_1, solution_2, solution_3 = search.get_solution_parallel(number_iterations, number_of_workers=number_of_workers)
+    running_time = time.time() - tic
+    if time_one_worker is None:
+        time_one_worker = running_time
+    print('%2d workers: %8.2f s, speedup %.1fx, best costs %d' % (number_of_workers, running_time,
+                                                                   time_one_worker / running_time,
+                                                                   solution_1.get_total_costs()))
+    number_of_workers *= 2
@@ -0,0 +1,43 @@
+import sys
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RollingHorizon import RollingHorizon
+from ilp_models.MDVSP_TW_FixedOBStartDepots_model import MDVSPTWFixedOBStartDepotsModel
+
+# Compares RollingHorizon, with 4 hour slices and 2 hours overlap, with solving MDVSPTWFixedOBStartDepotsModel for the
+# whole day on the five test days: the number of arcs of the largest network, the time and the number of trucks, and
+# for the rolling horizon the number of slices. The whole day model does not check the maximum duration, the trucks
+# that are continued over slices are kept within it, so the number of too long trucks is reported as well. The maximum
+# number of discretized shipments per time window can be given as argument, default 2.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+max_number_shipment_multiplication = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+
+
+def describe(schedule):
+    if schedule is None:
+        return 'no feasible schedule'
+    return '%3d trucks, %2d too long' % (len(schedule.get_trucks()), len(schedule.get_too_long_trucks_without_split()))
+
+
+results = []
+for day in days:
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=max_number_shipment_multiplication
+    )
+    input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+
+    rolling_horizon = RollingHorizon(input=input, config=config, solver='highs')
+    rolling_horizon_schedule = rolling_horizon.get_solution()
+    model = MDVSPTWFixedOBStartDepotsModel(input=input, config=config, solver='highs')
+    model_schedule = model.get_solution()
+    results.append('%-6s rolling horizon %2d slices, %7d arcs, %6.1f s, %s; whole day %7d arcs, %6.1f s, %s' % (
+        day, len(rolling_horizon.slice_sizes), max(rolling_horizon.slice_arcs), rolling_horizon.solve_time,
+        describe(rolling_horizon_schedule), model.network.get_number_of_arcs(), model.build_time + model.solve_time,
+        describe(model_schedule)))
+
+print('\n'.join(results))
@@ -0,0 +1,55 @@
+import time
+import timeit
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.DeterministicCS import DeterministicCS
+
+# Compares the label based pandas lookups with the interned integer lookups on all shipment pairs of one day
+
+config = Config(
+    shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv',
+    gap_percentage=1.0,
+    time_window_interval_in_minutes=20,
+    max_number_shipment_multiplication=5
+)
+
+input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+
+label_pairs = [(ship_1.end_location, ship_2.start_location) for ship_1 in input.shipments_tw for ship_2 in input.shipments_tw]
+index_pairs = [(ship_1.end_location_index, ship_2.start_location_index) for ship_1 in input.shipments_tw for ship_2 in input.shipments_tw]
+
+
+def pandas_lookups():
+    for from_location, to_location in label_pairs:
+        c.time_diff_matrix.at[from_location, to_location]
+
+
+def numpy_lookups():
+    for from_index, to_index in index_pairs:
+        c.time_diff_array[from_index, to_index]
+
+
+def table_lookups():
+    for from_index, to_index in index_pairs:
+        c.time_diff_table[from_index][to_index]
+
+
+def vectorized_lookups():
+    c.time_diff_array[[pair[0] for pair in index_pairs], [pair[1] for pair in index_pairs]]
+
+
+number_of_lookups = len(index_pairs)
+print('Number of lookups per run: ', number_of_lookups)
+results = {}
+for name, function in [('pandas .at', pandas_lookups), ('numpy scalar', numpy_lookups),
+                       ('time_diff_table', table_lookups), ('numpy fancy indexing', vectorized_lookups)]:
+    seconds = min(timeit.repeat(function, number=1, repeat=3))
+    results[name] = seconds
+    print('%22s: %8.4f s, %8.1f ns per lookup' % (name, seconds, seconds / number_of_lookups * 1e9))
+print('Speedup time_diff_table over pandas .at: %.1fx' % (results['pandas .at'] / results['time_diff_table']))
+
+tic = time.time()
+schedule = DeterministicCS(input=input, config=config).get_solution()
+toc = time.time()
+print('DeterministicCS on 31_03: ', schedule.get_total_costs(), ' in ', round(toc - tic, 3), ' s')
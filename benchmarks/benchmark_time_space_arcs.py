@@ -0,0 +1,76 @@
+import sys
+import time
+import numpy as np
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from ilp_models.MDVSPTW_TSN_model import MDVSPTWTSNModel
+
+# Compares the sweep of ShipmentArcs.get_first_match_arcs, which the connection arcs of every time space network model
+# are built from, with the previous implementation that compared all pairs of shipments of a depot layer, on the five
+# test days: the number of connection arcs, which must be equal, and the time for all depot layers. The time to build
+# the whole MDVSPTWTSNModel network is given as well. The maximum number of discretized shipments per time window can be
+# given as argument, default 5.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+max_number_shipment_multiplication = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+
+def get_first_match_arcs_all_pairs(shipment_arcs, positions):
+    empty_driving_time = c.time_diff_array[np.ix_(shipment_arcs.end_location_index[positions],
+                                                  shipment_arcs.start_location_index[positions])]
+    waiting_time = shipment_arcs.start_time[positions][np.newaxis, :] - \
+        shipment_arcs.end_time[positions][:, np.newaxis] - empty_driving_time
+    is_compatible = 0 <= waiting_time
+    order = np.lexsort((positions, shipment_arcs.start_time[positions]))
+    first, second = [], []
+    for location in np.unique(shipment_arcs.start_location_index[positions]):
+        columns = order[shipment_arcs.start_location_index[positions[order]] == location]
+        is_compatible_at_location = is_compatible[:, columns]
+        rows = np.flatnonzero(is_compatible_at_location.any(axis=1))
+        first.append(rows)
+        second.append(columns[is_compatible_at_location[rows].argmax(axis=1)])
+    first, second = np.concatenate(first), np.concatenate(second)
+    costs = c.weight_waiting_time * waiting_time[first, second] + \
+        c.weight_empty_driving_time * empty_driving_time[first, second]
+    return positions[first], positions[second], costs
+
+
+def get_connection_arcs(shipment_arcs, positions, get_first_match_arcs):
+    first_positions, second_positions, costs = get_first_match_arcs(positions)
+    order = np.lexsort((-first_positions, -shipment_arcs.end_time[first_positions], second_positions,
+                        shipment_arcs.end_location_index[first_positions]))
+    first_positions, second_positions = first_positions[order], second_positions[order]
+    is_latest = np.ones(len(order), dtype=bool)
+    is_latest[1:] = (second_positions[1:] != second_positions[:-1]) | \
+        (shipment_arcs.end_location_index[first_positions[1:]] != shipment_arcs.end_location_index[first_positions[:-1]])
+    return set(zip(first_positions[is_latest].tolist(), second_positions[is_latest].tolist()))
+
+
+results = []
+for day in days:
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=max_number_shipment_multiplication
+    )
+    input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+    model = MDVSPTWTSNModel(input=input, config=config)
+    shipment_arcs = model.shipment_arcs
+    layers = [shipment_arcs.get_depot_positions(depot) for depot in model.depots]
+
+    line = '%-6s %6d shipments' % (day, len(model.shipments))
+    arcs = []
+    for name, get_first_match_arcs in [('all pairs', lambda positions: get_first_match_arcs_all_pairs(shipment_arcs,
+                                                                                                        positions)),
+                                       ('sweep', shipment_arcs.get_first_match_arcs)]:
+        tic = time.time()
+        arcs.append([get_connection_arcs(shipment_arcs, positions, get_first_match_arcs) for positions in layers])
+        line += ', %s %6d arcs %6.2f s' % (name, sum(len(layer_arcs) for layer_arcs in arcs[-1]), time.time() - tic)
+    assert arcs[0] == arcs[1]
+    model.build()
+    results.append(line + ', network %6d arcs built in %5.2f s' % (model.network.get_number_of_arcs(),
+                                                                    model.build_time))
+
+print('\n'.join(results))
@@ -0,0 +1,49 @@
+import random
+import time
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RandomizedCS import RandomizedCS
+from heuristics.RandomizedSearch import run_construction
+from heuristics.RandomizedtiesCS import RandomizedtiesCS
+from heuristics.RandomizedtiesCSnomaxduration import RandomizedtiesCSnomaxduration
+
+# Runs Schedule.post_optimize_timing on 5 randomized constructions of each of the five test days, for three of the
+# concurrent schedulers. Prints the total move costs of the trucks before and after, the number of trucks that are too
+# long and cannot be split before and after, and the average time of the optimization per construction.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+schedulers = [RandomizedtiesCS, RandomizedtiesCSnomaxduration, RandomizedCS]
+number_of_constructions = 5
+
+
+def get_number_too_long(schedule):
+    return sum(truck.is_too_long() and not truck.is_splittable() for truck in schedule.get_trucks())
+
+
+results = []
+for day in days:
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=5
+    )
+    input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+    for scheduler in schedulers:
+        random.seed(0)
+        costs_before = costs_after = too_long_before = too_long_after = solve_time = 0
+        for i in range(number_of_constructions):
+            schedule = run_construction(scheduler(input=input, config=config))
+            costs_before += sum(truck.get_move_costs() for truck in schedule.get_trucks())
+            too_long_before += get_number_too_long(schedule)
+            tic = time.time()
+            schedule.post_optimize_timing()
+            solve_time += time.time() - tic
+            costs_after += sum(truck.get_move_costs() for truck in schedule.get_trucks())
+            too_long_after += get_number_too_long(schedule)
+        results.append('%-6s %-29s move costs %9d -> %9d, too long without split %3d -> %3d, %4.1f ms' % (
+            day, scheduler.__name__, costs_before, costs_after, too_long_before, too_long_after,
+            1000 * solve_time / number_of_constructions))
+
+print('\n'.join(results))
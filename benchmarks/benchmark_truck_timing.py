@@ -0,0 +1,46 @@
+import random
+import time
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RandomizedSearch import RandomizedSearch
+from heuristics.TruckTiming import TruckTiming, shift_shipments_backward, shift_shipments_forward
+
+# Starts every shipment of a randomized construction of each of the five test days as early as it can, and times the
+# trucks again with the greedy shift_shipments_forward and shift_shipments_backward passes and with TruckTiming.place.
+# Prints the total costs, waiting time and duration of the trucks and the time of both.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+
+results = []
+for day in days:
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=5
+    )
+    input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+    random.seed(0)
+    construction = RandomizedSearch(input=input, config=config).get_construction()
+    for truck in construction.get_trucks():
+        truck.set_start_times(TruckTiming(truck).earliest_start_times)
+    result = '%-6s %3d trucks, costs %d' % (day, construction.get_total_number_of_trucks(),
+                                           construction.get_total_costs())
+    for name in ['shifts', 'place']:
+        schedule = construction.snapshot()
+        tic = time.time()
+        for truck in schedule.get_trucks():
+            if name == 'shifts':
+                shift_shipments_forward(truck)
+                shift_shipments_backward(truck)
+            else:
+                TruckTiming(truck).place()
+        toc = time.time()
+        trucks = schedule.get_trucks()
+        result += '; %s %5.1f ms, costs %d, waiting %6.2f, duration %7.2f' % (
+            name, 1000 * (toc - tic), schedule.get_total_costs(), sum(truck.get_waiting_time() for truck in trucks),
+            sum(truck.get_duration() for truck in trucks))
+    results.append(result)
+
+print('\n'.join(results))
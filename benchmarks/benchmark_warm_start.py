@@ -0,0 +1,39 @@
+import sys
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.MDVSPTWILP import MDVSPTWILP
+from heuristics.RandomizedSearch import RandomizedSearch
+
+# Solves MDVSPTWILP on the five test days without and with the best schedule of RandomizedSearch as MIP start and
+# prints the time until the first incumbent, the final gap and the costs. The solver can be given as argument, default
+# gurobi, the only backend that takes a MIP start.
+
+days = ['22_01', '31_03', '15_04', '16_04', '17_04']
+solver = sys.argv[1] if len(sys.argv) > 1 else 'gurobi'
+number_iterations = 200
+
+for day in days:
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + day + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=5
+    )
+    input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+    start = RandomizedSearch(input=input, config=config).get_solution(number_iterations)[0]
+    print('%s heuristic start: costs %d, %d trucks' % (day, start.get_total_costs(),
+                                                       start.get_total_number_of_trucks()))
+    for with_start in [False, True]:
+        ilp = MDVSPTWILP(input=input, config=config, solver=solver)
+        try:
+            schedule = ilp.get_solution(start=start if with_start else None)
+        except Exception as error:
+            print('%s %-10s failed: %s' % (day, 'warm' if with_start else 'cold', str(error).splitlines()[0][:60]))
+            continue
+        time_to_first_incumbent = ilp.solver_used.time_to_first_incumbent
+        print('%s %-10s first incumbent %s, solve %7.2f s, gap %s, %s, costs %d, %d trucks' % (
+            day, 'warm' if with_start else 'cold',
+            'n/a' if time_to_first_incumbent is None else '%7.2f s' % time_to_first_incumbent, ilp.solve_time,
+            'n/a' if ilp.solver_used.gap is None else '%.4f' % ilp.solver_used.gap, ilp.solver_used.status,
+            schedule.get_total_costs(), schedule.get_total_number_of_trucks()))
@@ -1,4 +1,5 @@
 import os
+import numpy as np
 import pandas as pd
 
 # -------------------------------------------- Parameters ----------------------------------------------
@@ -23,6 +24,7 @@ weight_waiting_time = 30
 weight_empty_driving_time = 60
 fixed_cost_new_truck = 100000
 weight_length = 150
+penalty_too_long_without_split = 100000  # Used in move evaluation for too long truck days without a split point
 
 # Last and first shipment indicators, used in greedy alg
 day_duration_last_shipment = 11
@@ -40,9 +42,19 @@ depots_file = root + '/test_data/Data - depots.csv'
 #depots_file = root + '/test_data/Data - depots real.csv'
 
 time_diff_matrix_file = root + '/test_data/Data - distance matrix.csv'
+network_cache_directory = root + '/.network_cache'  # Built network models, see heuristics/NetworkCache.py
 time_diff_matrix = pd.read_csv(time_diff_matrix_file)
 time_diff_matrix.set_index('Location', drop=True, inplace=True)
 
+# Location interning: every location is mapped once to a row/column index of a contiguous float64 array. Hot paths look
+# up travel times with time_diff_table[from_index][to_index] (plain lists are the fastest scalar lookup in Python),
+# vectorized code uses time_diff_array directly. Entries that are not numeric in the csv (e.g. '-') become NaN.
+locations = list(time_diff_matrix.index)
+location_index = {location: index for index, location in enumerate(locations)}
+time_diff_array = np.ascontiguousarray(
+    time_diff_matrix.loc[locations, locations].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64))
+time_diff_table = time_diff_array.tolist()
+
 # ------------------------------------------- Old parameters --------------------------------------------------
 
 #min_duration = 2  # This parameter is used in the algorithms
@@ -0,0 +1,232 @@
+import copy
+import math
+import random
+import time
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.Schedule import Schedule
+from heuristics.RandomizedSearch import run_construction
+from heuristics.RandomizedtiesCS import RandomizedtiesCS
+
+# Scores of a destroy operator for an iteration that finds a new best schedule, a better schedule than the current one
+# and a worse schedule that is accepted
+score_new_best = 33
+score_better = 9
+score_accepted = 13
+
+
+# ---------------------------------------------- ALNS Class -----------------------------------------------------------
+
+class ALNS:
+    """
+    Adaptive large neighbourhood search that improves a schedule instead of constructing new ones from scratch. Every
+    iteration a destroy operator selects shipments of the current schedule, which are removed from snapshots of its
+    trucks and put back by RandomizedtiesCS with the snapshots as input trucks. Only the trucks that lose or get a
+    shipment copy their shipments, and only their move costs are evaluated again, see __repair. The operators are chosen
+    by roulette wheel on weights that adapt to their scores every segment_length iterations, and a new schedule is
+    accepted by simulated annealing with a temperature that falls with the time used, until time_limit seconds. The
+    costs of a schedule are the move costs of its trucks, which come from their running aggregates, so a too long truck
+    that cannot be split is penalized. The destroy operators remove:
+    - random: random shipments
+    - worst: the shipments that save the most costs when removed from their truck
+    - related: the shipments closest in start time and start location to a random shipment
+    - tails: the shipments after a random time of the trucks that are free closest to that time
+    - trucks: all shipments of the too long trucks, or else of the trucks with the fewest shipments
+    """
+
+    def __init__(self, input: InputTW, config: Config, initial_solution: Schedule = None, time_limit: float = 60,
+                 min_removed: int = 4, max_removed_fraction: float = 0.15, segment_length: int = 50,
+                 reaction: float = 0.2, start_worsening: float = 0.01, end_worsening: float = 0.0001):
+        self.input = input
+        self.config = config
+        self.initial_solution = initial_solution
+        self.time_limit = time_limit
+        self.min_removed = min_removed
+        self.max_removed_fraction = max_removed_fraction
+        self.segment_length = segment_length
+        self.reaction = reaction
+        self.start_worsening = start_worsening
+        self.end_worsening = end_worsening
+        self.operators = [self.__destroy_random, self.__destroy_worst, self.__destroy_related, self.__destroy_tails,
+                          self.__destroy_trucks]
+        self.weights = [1.0] * len(self.operators)
+        self.number_of_iterations = 0
+        self.best_costs = None
+        self.solve_time = None
+
+    def get_solution(self):
+        """
+        Improve the initial solution, or a randomized construction if there is none, until the time limit
+        :return: best Schedule found
+        """
+        tic = time.time()
+        if self.initial_solution is None:
+            current = run_construction(RandomizedtiesCS(input=self.input, config=self.config))
+        else:
+            current = self.initial_solution.snapshot()
+        current_total = get_costs(current)
+        best, best_total = current, current_total
+        # A schedule start_worsening worse than the initial one is accepted with probability 1/2 at the start
+        start_temperature = self.start_worsening * current_total / math.log(2)
+        end_temperature = self.end_worsening * current_total / math.log(2)
+
+        scores = [0.0] * len(self.operators)
+        uses = [0] * len(self.operators)
+        self.number_of_iterations = 0
+        while time.time() - tic < self.time_limit:
+            operator = random.choices(range(len(self.operators)), weights=self.weights)[0]
+            trucks = [truck for truck in current.get_trucks() if truck.is_active()]
+            selected = self.operators[operator](trucks, self.__get_number_to_remove())
+            repaired = self.__repair(trucks, current_total, selected)
+            self.number_of_iterations += 1
+            uses[operator] += 1
+            if repaired is not None:
+                candidate, candidate_total = repaired
+                fraction = min((time.time() - tic) / self.time_limit, 1)
+                temperature = start_temperature * (end_temperature / start_temperature) ** fraction
+                accepted = True
+                if candidate_total < best_total:
+                    best, best_total = candidate, candidate_total
+                    scores[operator] += score_new_best
+                elif candidate_total < current_total:
+                    scores[operator] += score_better
+                elif candidate_total < float('inf') and \
+                        random.random() < math.exp(-(candidate_total - current_total) / temperature):
+                    scores[operator] += score_accepted
+                else:
+                    accepted = False
+                if accepted:
+                    current, current_total = candidate, candidate_total
+
+            # Every iteration counts towards the segment, also the ones of which the candidate is rejected
+            if self.number_of_iterations % self.segment_length == 0:
+                self.__update_weights(scores, uses)
+                scores = [0.0] * len(self.operators)
+                uses = [0] * len(self.operators)
+        self.best_costs = best_total
+        self.solve_time = time.time() - tic
+        return best
+
+    def __get_number_to_remove(self):
+        max_removed = max(self.min_removed, int(self.max_removed_fraction * len(self.input.shipments_tw)))
+        return random.randint(self.min_removed, max_removed)
+
+    def __update_weights(self, scores, uses):
+        for operator in range(len(self.operators)):
+            if uses[operator] > 0:
+                self.weights[operator] = (1 - self.reaction) * self.weights[operator] + \
+                                         self.reaction * scores[operator] / uses[operator]
+            self.weights[operator] = max(self.weights[operator], 0.1)
+
+    def __repair(self, trucks: list, total_costs, selected: list):
+        """
+        Remove the selected shipments, pairs of the index of a truck in trucks and the index of a shipment on it, from
+        snapshots of trucks and put them back with RandomizedtiesCS, the snapshots are its input trucks. Only the trucks
+        that lose or get a shipment are copied, see Truck.snapshot, and only their move costs are evaluated again to get
+        the costs of the new schedule from total_costs, the costs of trucks.
+        :return: (Schedule, float), or None if a shipment could not be placed
+        """
+        repair_input = copy.copy(self.input)
+        repair_input.shipments_tw = [trucks[k].get_shipments()[i].input_shipment for k, i in selected]
+        cs = RandomizedtiesCS(input=repair_input, config=self.config, input_trucks=trucks)
+        touched = set()
+        for k, i in sorted(selected, reverse=True):
+            cs.trucks[k].remove_ith_shipment(i)
+            touched.add(k)
+        repaired = run_construction(cs)
+        if len(cs.unplaced_shipments_tw) > 0:
+            return None
+        if total_costs == float('inf'):
+            return repaired, get_costs(repaired)
+
+        positions = {id(truck): k for k, truck in enumerate(cs.trucks)}
+        new_costs = 0
+        for truck in cs.placed_trucks:
+            if id(truck) in positions:
+                touched.add(positions[id(truck)])
+            else:
+                new_costs += truck.get_move_costs()
+        # The trucks that lost all their shipments and got none back are not in the schedule and cost nothing
+        for k in touched:
+            new_costs += cs.trucks[k].get_move_costs() - trucks[k].get_move_costs()
+        return repaired, total_costs + new_costs
+
+    # ----- Destroy operators -----
+    # Every operator selects shipments of the trucks of the current schedule without changing them, it returns pairs of
+    # the index of a truck and the index of a shipment on it
+
+    def __destroy_random(self, trucks: list, number_to_remove):
+        shipments = [(k, i) for k, truck in enumerate(trucks) for i in range(len(truck.get_shipments()))]
+        return random.sample(shipments, min(number_to_remove, len(shipments)))
+
+    def __destroy_worst(self, trucks: list, number_to_remove):
+        """
+        Select the shipments with the lowest removal costs, the ith lowest drawn with a bias towards the first ones
+        """
+        savings = [(truck.get_removal_costs(i), (k, i)) for k, truck in enumerate(trucks)
+                   for i in range(len(truck.get_shipments()))]
+        savings.sort(key=lambda saving: saving[0])
+        selected = []
+        for _ in range(min(number_to_remove, len(savings))):
+            selected.append(savings.pop(int(len(savings) * random.random() ** 3))[1])
+        return selected
+
+    def __destroy_related(self, trucks: list, number_to_remove):
+        """
+        Select a random shipment and the shipments closest to it: the difference in start time plus the driving time
+        between the start locations
+        """
+        shipments = [(k, i, shipment) for k, truck in enumerate(trucks) for i, shipment in enumerate(truck.get_shipments())]
+        seed_shipment = random.choice(shipments)[2]
+        shipments.sort(key=lambda shipment: abs(shipment[2].start_time - seed_shipment.start_time) +
+                       c.time_diff_table[seed_shipment.start_location_index][shipment[2].start_location_index])
+        return [(k, i) for k, i, _ in shipments[:number_to_remove]]
+
+    def __destroy_tails(self, trucks: list, number_to_remove):
+        """
+        Select the shipments from the start time of a random shipment on, of the trucks with the first shipments after
+        it that start closest to it, up to number_to_remove shipments. The scheduler only adds shipments after the last
+        shipment of a truck, so this frees the trucks for the removed shipments as well.
+        """
+        seed_time = random.choice([shipment for truck in trucks for shipment in truck.get_shipments()]).start_time
+        tails = []
+        for k, truck in enumerate(trucks):
+            tail = [(k, i) for i, shipment in enumerate(truck.get_shipments()) if shipment.start_time >= seed_time]
+            if len(tail) > 0:
+                first_start_time = truck.get_shipments()[tail[0][1]].start_time
+                tails.append((first_start_time - seed_time, random.random(), tail))
+        tails.sort(key=lambda tail: tail[:2])
+        selected = []
+        for _, _, tail in tails:
+            if len(selected) > 0 and len(selected) + len(tail) > number_to_remove:
+                break
+            selected += tail
+        return selected
+
+    def __destroy_trucks(self, trucks: list, number_to_remove):
+        """
+        Select the shipments of the too long trucks that cannot be split, or else of the trucks with the fewest
+        shipments, a random one first, up to number_to_remove shipments
+        """
+        positions = [k for k, truck in enumerate(trucks) if truck.is_too_long() and not truck.is_splittable()]
+        if len(positions) == 0:
+            positions = sorted(range(len(trucks)), key=lambda k: (len(trucks[k].get_shipments()), random.random()))
+        selected = []
+        for k in positions:
+            number_of_shipments = len(trucks[k].get_shipments())
+            if len(selected) > 0 and len(selected) + number_of_shipments > number_to_remove:
+                break
+            selected += [(k, i) for i in range(number_of_shipments)]
+        return selected
+
+
+# ----------------------------------------------- Help Functions ------------------------------------------------------
+
+def get_costs(schedule: Schedule):
+    """
+    The sum of the move costs of the trucks, see Truck.get_move_costs, from the running aggregates of the trucks
+    :return: float
+    """
+    return sum(truck.get_move_costs() for truck in schedule.get_trucks())
+
@@ -0,0 +1,156 @@
+from bisect import bisect_left
+import numpy as np
+import constants as c
+
+# Files
+from heuristics.Shipment import ShipmentTW
+from heuristics.Truck import Truck
+
+
+# ---------------------------------------------- ActiveTrucks Class ---------------------------------------------------
+
+class ActiveTrucks:
+    """
+    The active trucks of a concurrent scheduler, with the state that is needed to score them against a new shipment
+    kept in NumPy arrays: depot, first and last location, start time of the first shipment, end time of the last
+    shipment, pull out time and maximum duration. Trucks are ordered by rank, the position of the truck in the list of
+    trucks of the scheduler, so ties are broken in the same way as when looping over that list. It is used by
+    DeterministicCS, RandomizedCS and RandomizedtiesCS. The beforeafter, nomaxduration and withswap variants keep
+    scoring truck by truck, since their compatibility and costs follow other rules than score.
+    """
+
+    def __init__(self, trucks: list = None, ranks: list = None):
+        self.trucks = []
+        self.ranks = []
+        self.__capacity = 0
+        self.__resize(16)
+        if trucks is not None:
+            self.__resize(max(16, 2 * len(trucks)))
+            self.trucks = list(trucks)
+            self.ranks = list(ranks)
+            for i in range(len(self.trucks)):
+                self.update(i)
+
+    def __len__(self):
+        return len(self.trucks)
+
+    def __resize(self, capacity):
+        n = len(self.trucks)
+        old_arrays = [] if self.__capacity == 0 else [self.__depot_index, self.__first_location_index,
+                                                      self.__last_location_index, self.__first_start_time,
+                                                      self.__last_end_time, self.__pull_out, self.__max_duration]
+        new_arrays = [np.zeros(capacity, dtype=np.intp) for _ in range(3)] + [np.zeros(capacity) for _ in range(4)]
+        for old_array, new_array in zip(old_arrays, new_arrays):
+            new_array[:n] = old_array[:n]
+        self.__depot_index, self.__first_location_index, self.__last_location_index, self.__first_start_time, \
+            self.__last_end_time, self.__pull_out, self.__max_duration = new_arrays
+        self.__capacity = capacity
+
+    @property
+    def depot_index(self):
+        return self.__depot_index[:len(self.trucks)]
+
+    def add_truck(self, truck: Truck, rank):
+        """
+        Add a truck that just became active
+        :return: position of the truck
+        """
+        n = len(self.trucks)
+        if n == self.__capacity:
+            self.__resize(2 * self.__capacity)
+        i = bisect_left(self.ranks, rank)
+        self.trucks.insert(i, truck)
+        self.ranks.insert(i, rank)
+        if i < n:
+            for array in [self.__depot_index, self.__first_location_index, self.__last_location_index,
+                          self.__first_start_time, self.__last_end_time, self.__pull_out, self.__max_duration]:
+                array[i + 1:n + 1] = array[i:n]
+        self.update(i)
+        return i
+
+    def remove_truck(self, i):
+        """
+        Remove the ith truck, for instance when its activation is undone
+        :return: the removed truck
+        """
+        n = len(self.trucks)
+        truck = self.trucks.pop(i)
+        del self.ranks[i]
+        for array in [self.__depot_index, self.__first_location_index, self.__last_location_index,
+                      self.__first_start_time, self.__last_end_time, self.__pull_out, self.__max_duration]:
+            array[i:n - 1] = array[i + 1:n]
+        return truck
+
+    def update(self, i):
+        """
+        Refresh the state of the ith truck after its shipments have changed
+        """
+        truck = self.trucks[i]
+        first_shipment = truck.get_first_shipment()
+        last_shipment = truck.get_last_shipment()
+        self.__depot_index[i] = truck.start_depot_index
+        self.__first_location_index[i] = first_shipment.start_location_index
+        self.__last_location_index[i] = last_shipment.end_location_index
+        self.__first_start_time[i] = first_shipment.start_time
+        self.__last_end_time[i] = last_shipment.end_time
+        self.__pull_out[i] = c.time_diff_table[truck.start_depot_index][first_shipment.start_location_index]
+        self.__max_duration[i] = truck.get_max_duration()
+
+    def score(self, shipment_tw: ShipmentTW, before: bool = False, max_duration: float = None):
+        """
+        Score all active trucks against shipment_tw in one pass. This gives the same results as
+        are_compatible_tw_truck, cheapest_compatible_shipment_truck, duration_with_potential_shipment and
+        cost_active_truck of the concurrent schedulers applied to every truck. If before is True the shipment may also
+        be placed before the first shipment of a truck. Without max_duration the maximum duration of each truck is used.
+        :return: positions of the trucks with space, unrounded start times of the cheapest shipments on them, costs
+        """
+        n = len(self.trucks)
+        first_location_index = self.__first_location_index[:n]
+        first_start_time = self.__first_start_time[:n]
+        last_end_time = self.__last_end_time[:n]
+        table = c.time_diff_array
+        driving_after = table[self.__last_location_index[:n], shipment_tw.start_location_index]
+        end_waiting_after = last_end_time + driving_after
+        fits = (shipment_tw.earliest_start_time - c.max_waiting_time <= end_waiting_after) & \
+               (end_waiting_after <= shipment_tw.latest_start_time)
+        start_times = np.maximum(end_waiting_after, shipment_tw.earliest_start_time)
+        if before:
+            driving_before = table[shipment_tw.end_location_index, first_location_index]
+            fits_before = (shipment_tw.earliest_end_time + driving_before <= first_start_time) & \
+                          (first_start_time <= shipment_tw.latest_end_time + driving_before + c.max_waiting_time)
+            fits |= fits_before
+            start_times = np.where(fits_before,
+                                   np.minimum(first_start_time - driving_before - shipment_tw.get_length(),
+                                              shipment_tw.latest_start_time),
+                                   start_times)
+        positions = np.flatnonzero(fits)
+        start_times = start_times[positions]
+
+        # Shipment.set_start_time rounds with the built in round, which is not always equal to np.round
+        length = shipment_tw.get_length()
+        raw_start_times = start_times.tolist()
+        rounded_start_times = np.array([round(start_time, 3) for start_time in raw_start_times])
+        rounded_end_times = np.array([round(start_time + length, 3) for start_time in raw_start_times])
+
+        depot_index = self.__depot_index[positions]
+        pull_in = table[shipment_tw.end_location_index, depot_index]
+        durations = self.__pull_out[positions] + (rounded_end_times - first_start_time[positions]) + pull_in
+        if max_duration is None:
+            has_space = durations < self.__max_duration[positions]
+        else:
+            has_space = durations < max_duration
+        positions = positions[has_space]
+        raw_start_times = start_times[has_space]
+        rounded_start_times = rounded_start_times[has_space]
+        durations = durations[has_space]
+        pull_in = pull_in[has_space]
+
+        last_end_time = last_end_time[positions]
+        driving_time = driving_after[positions]
+        costs = c.weight_waiting_time * (rounded_start_times - last_end_time - driving_time) + \
+                c.weight_empty_driving_time * driving_time
+        back_to_depot = (rounded_start_times > c.start_time_last_shipment + 8) | \
+                        (durations > c.day_duration_last_shipment)
+        costs = np.where(back_to_depot, costs + c.weight_empty_driving_time * pull_in, costs)
+        costs = np.where(last_end_time + driving_time <= rounded_start_times, costs, 1000000000)
+        return positions, raw_start_times, costs
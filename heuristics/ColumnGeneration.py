@@ -0,0 +1,577 @@
+import heapq
+import time
+from bisect import bisect_right
+from operator import attrgetter
+import numpy as np
+from scipy.optimize import linprog, milp, LinearConstraint, Bounds
+from scipy.sparse import csc_matrix, hstack, identity
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.Schedule import Schedule
+from heuristics.Shipment import Shipment
+from heuristics.Truck import Truck, get_max_duration
+
+
+# ------------------------------------------ ColumnGeneration Class --------------------------------------------------
+
+class ColumnGeneration:
+    """
+    Set partitioning model of the MDVSPTW solved by column generation. A column is a whole truck day of a depot: a
+    sequence of shipments with start times in their time windows that is not too long, or that can be split into two
+    driver days. The LP master (every shipment exactly once, at most the capacity of trucks per depot) is solved by
+    HiGHS through scipy.optimize.linprog and new columns are priced by a labeling algorithm per depot over the time
+    window compatibility graph of the shipments. An integer solution is found by diving: the columns of the LP solution
+    with the highest values are fixed and columns are generated for the remaining shipments, until all shipments are
+    covered. A final integer master over the columns of the dive and the columns with the lowest reduced costs is
+    solved by scipy.optimize.milp. Unlike the arc flow models, no time windows are discretized and the costs of a
+    column are the exact costs of its truck day.
+    """
+
+    def __init__(self, input: InputTW, config: Config, max_labels_per_node: int = 10, max_successors: int = 10,
+                 max_columns_per_depot: int = 50, max_iterations: int = 200, max_dive_iterations: int = 2,
+                 max_master_columns: int = 500, time_limit: float = c.ilp_time_limit):
+        self.input = input
+        self.shipments_tw = input.shipments_tw
+        self.depots = input.depots
+        self.config = config
+        self.max_labels_per_node = max_labels_per_node
+        self.max_successors = max_successors
+        self.max_columns_per_depot = max_columns_per_depot
+        self.max_iterations = max_iterations
+        self.max_dive_iterations = max_dive_iterations
+        self.max_master_columns = max_master_columns
+        self.time_limit = time_limit
+
+        # Plain lists, the fastest scalar lookup in the labeling
+        self.earliest_start_time = [shipment.earliest_start_time for shipment in self.shipments_tw]
+        self.latest_start_time = [shipment.latest_start_time for shipment in self.shipments_tw]
+        self.length = [shipment.get_length() for shipment in self.shipments_tw]
+        self.start_location_index = [shipment.start_location_index for shipment in self.shipments_tw]
+        self.end_location_index = [shipment.end_location_index for shipment in self.shipments_tw]
+        self.is_inbound = ['IB' in shipment.type for shipment in self.shipments_tw]
+        self.positions = {shipment.id: position for position, shipment in enumerate(self.shipments_tw)}
+        self.successors = self.__get_successors()
+        self.visited_bits = self.__get_visited_bits()
+
+        self.columns = []
+        self.master_matrices = (np.zeros(0), csc_matrix((len(self.shipments_tw), 0)),
+                                csc_matrix((len(self.depots), 0)))
+        self.column_keys = {}
+        self.start_columns = []
+        self.fixed_columns = []
+        self.is_covered = [False] * len(self.shipments_tw)
+        self.lp_value = None
+        self.lp_solution = None
+        self.duals = None
+        self.dive_costs = None
+        self.number_of_iterations = 0
+        self.pricing_time = 0
+        self.lp_time = 0
+        self.integer_master_time = None
+        self.solve_time = None
+        self.status = None
+
+    def get_solution(self, start: Schedule = None):
+        """
+        Generate columns until no column with negative reduced costs is found, dive to an integer solution and solve the
+        integer master, and return the cheapest of the two. The initial columns are the trucks with a single shipment
+        and the trucks of start, for instance a schedule of RandomizedSearch
+        :return: Schedule
+        """
+        tic = time.time()
+        depot_list = list(self.depots.keys())
+        for depot in depot_list:
+            for position, is_depot_shipment in enumerate(self.get_depot_shipments(depot)):
+                if is_depot_shipment:
+                    shipment_tw = self.shipments_tw[position]
+                    self.add_column(Truck(start_depot=depot, shipments=[
+                        Shipment(input_shipment=shipment_tw, start_time=shipment_tw.earliest_start_time)]))
+        if start is not None:
+            for truck in start.get_trucks():
+                if truck.is_active() and not (truck.is_too_long() and not truck.is_splittable()):
+                    self.add_column(truck)
+                    self.start_columns.append(self.get_column(truck))
+
+        self.__generate_columns(depot_list, tic, self.max_iterations)
+        root_duals = self.duals
+        root_lp_value = self.lp_value
+        dive_columns = self.__dive(depot_list, tic)
+        self.lp_value = root_lp_value
+
+        master_tic = time.time()
+        integer_master_columns = self.__solve_integer_master(depot_list, root_duals, dive_columns,
+                                                             max(self.time_limit - (time.time() - tic), 1))
+        self.integer_master_time = time.time() - master_tic
+        self.solve_time = time.time() - tic
+
+        print('ITERATIONS: ', self.number_of_iterations)
+        print('COLUMNS: ', len(self.columns))
+        print('LP VALUE: ', self.lp_value)
+        print('DIVE COSTS: ', self.dive_costs)
+        print('PRICING TIME: ', self.pricing_time)
+        print('LP TIME: ', self.lp_time)
+        print('INTEGER MASTER TIME: ', self.integer_master_time)
+        print('SOLVE TIME: ', self.solve_time)
+
+        chosen_columns = dive_columns
+        if integer_master_columns is not None and (self.dive_costs is None or
+                                                   self.__get_costs(integer_master_columns) < self.dive_costs):
+            chosen_columns = integer_master_columns
+        trucks = []
+        for column in chosen_columns:
+            depot, positions, start_times, _ = self.columns[column]
+            trucks.append(Truck(start_depot=depot, shipments=[
+                Shipment(input_shipment=self.shipments_tw[position], start_time=start_time)
+                for position, start_time in zip(positions, start_times)]))
+        return Schedule(config=self.config, trucks=trucks)
+
+    def __generate_columns(self, depot_list, tic, max_iterations, is_converging=True):
+        """
+        Solve the LP master and add priced columns until pricing finds no new columns, max_iterations is reached or the
+        time limit is exceeded. The last LP solution is for the current columns. Pricing is over the cheapest successors
+        of every shipment, and if is_converging over all successors when that gives no columns
+        """
+        for _ in range(max_iterations):
+            self.number_of_iterations += 1
+            shipment_duals, depot_duals = self.__solve_lp_master(depot_list)
+            if time.time() - tic > self.time_limit:
+                return
+
+            pricing_tic = time.time()
+            number_new_columns = self.__add_priced_columns(depot_list, shipment_duals, depot_duals,
+                                                           self.max_successors)
+            if number_new_columns == 0 and is_converging and self.max_successors is not None:
+                number_new_columns = self.__add_priced_columns(depot_list, shipment_duals, depot_duals, None)
+            self.pricing_time += time.time() - pricing_tic
+            if number_new_columns == 0:
+                return
+        self.__solve_lp_master(depot_list)
+
+    def __dive(self, depot_list, tic):
+        """
+        Fix the columns of the LP solution with value one, or the column with the highest value if there is none, and
+        generate columns for the shipments that are not covered yet, until all shipments are covered. dive_costs stays
+        None if the LP only covers the remaining shipments with artificial columns
+        :return: list of fixed columns
+        """
+        number_of_columns = len(self.columns)
+        while not all(self.is_covered):
+            values = self.lp_solution
+            order = [column for column in np.argsort(-values, kind='stable').tolist()
+                     if values[column] > 1e-6 and column not in self.fixed_columns]
+            if len(order) == 0:
+                break
+            to_fix = [column for column in order if values[column] > 1 - 1e-6] or order[:1]
+            for column in to_fix:
+                positions = self.columns[column][1]
+                if not any(self.is_covered[position] for position in positions):
+                    self.fixed_columns.append(column)
+                    for position in positions:
+                        self.is_covered[position] = True
+            self.__generate_columns(depot_list, tic, self.max_dive_iterations, is_converging=False)
+        if all(self.is_covered):
+            self.dive_costs = self.__get_costs(self.fixed_columns)
+        else:
+            print('Dive did not cover all shipments')
+        dive_columns = self.fixed_columns
+        self.fixed_columns = []
+        self.is_covered = [False] * len(self.shipments_tw)
+        print('DIVE: ', len(self.columns) - number_of_columns, 'columns added')
+        return dive_columns
+
+    def __get_costs(self, columns):
+        return sum(self.columns[column][3] for column in columns)
+
+    def add_column(self, truck: Truck):
+        """
+        Add the truck day as column if it is not a column yet
+        :return: 1 if the column is new, 0 otherwise
+        """
+        key = self.__get_column_key(truck)
+        if key in self.column_keys:
+            return 0
+        self.column_keys[key] = len(self.columns)
+        self.columns.append((truck.start_depot, key[1],
+                             tuple(shipment.start_time for shipment in truck.shipments), truck.get_total_costs()))
+        return 1
+
+    def get_column(self, truck: Truck):
+        return self.column_keys[self.__get_column_key(truck)]
+
+    def __get_column_key(self, truck: Truck):
+        return truck.start_depot, tuple(self.positions[shipment.input_shipment.id] for shipment in truck.shipments)
+
+    # ----- Pricing -----
+
+    def __add_priced_columns(self, depot_list, shipment_duals, depot_duals, max_successors):
+        number_new_columns = 0
+        for depot, depot_dual in zip(depot_list, depot_duals.tolist()):
+            for truck in self.price(depot, shipment_duals, depot_dual, max_successors):
+                number_new_columns += self.add_column(truck)
+        return number_new_columns
+
+    def price(self, depot, shipment_duals, depot_dual, max_successors=None):
+        """
+        Truck days of depot with negative reduced costs, found by a labeling algorithm. A label is a path of shipments
+        that starts every shipment as early as possible and moves the whole path later when it has to wait, which
+        minimizes both the waiting time and the duration of the path. Labels are extended in order of end time and a
+        label is dropped when another label at the same shipment is at least as good in all resources, or when more
+        than max_labels_per_node labels with lower costs are kept, so the pricing is a heuristic. With max_successors,
+        a label is only extended to that many successors with the lowest empty driving costs minus dual. Truck days are
+        only generated if they are not too long without the extra time get_max_duration gives for waiting, or
+        splittable
+        :return: list of at most max_columns_per_depot trucks, best first
+        """
+        table = c.time_diff_table
+        depot_index = c.location_index[depot]
+        is_depot_shipment = [is_depot_shipment and not is_covered for is_depot_shipment, is_covered in
+                             zip(self.get_depot_shipments(depot), self.is_covered)]
+        duals = shipment_duals.tolist()
+        successors = []
+        for arcs in self.successors:
+            arcs = [arc for arc in arcs if is_depot_shipment[arc[0]]]
+            if max_successors is not None:
+                arcs = sorted(arcs, key=lambda arc: c.weight_empty_driving_time * arc[1] - duals[arc[0]])[
+                    :max_successors]
+            successors.append(arcs)
+
+        labels_at = {}
+        heap = []
+        counter = 0
+        for position in [position for position, is_depot in enumerate(is_depot_shipment) if is_depot]:
+            pull_out = table[depot_index][self.start_location_index[position]]
+            earliest_start_time = self.earliest_start_time[position]
+            end_time = earliest_start_time + self.length[position]
+            truck_start_time = earliest_start_time - pull_out
+            label = Label(node=position, start_time=earliest_start_time, end_time=end_time,
+                          slack=self.latest_start_time[position] - earliest_start_time,
+                          truck_start_time=truck_start_time, waiting_time=0,
+                          costs=c.fixed_cost_new_truck + c.weight_empty_driving_time * pull_out - duals[position] -
+                          depot_dual,
+                          relief_point=self.__get_relief_point(None, position, earliest_start_time, end_time,
+                                                               truck_start_time, depot),
+                          visited=self.visited_bits[position], parent=None, shift=0)
+            if self.__insert(labels_at, label):
+                heapq.heappush(heap, (label.end_time, counter, label))
+                counter += 1
+
+        candidates = {}
+        while heap:
+            label = heapq.heappop(heap)[2]
+            if label.is_dominated:
+                continue
+            reduced_costs = self.__get_completion_costs(label, depot_index)
+            if reduced_costs < -1e-6:
+                path = label.get_path()
+                if path not in candidates or reduced_costs < candidates[path][0]:
+                    candidates[path] = (reduced_costs, label)
+            for position, driving_time in successors[label.node]:
+                new_label = self.__extend(label, position, driving_time, duals[position], depot)
+                if new_label is not None and self.__insert(labels_at, new_label):
+                    heapq.heappush(heap, (new_label.end_time, counter, new_label))
+                    counter += 1
+
+        best = sorted(candidates.values(), key=lambda candidate: candidate[0])[:self.max_columns_per_depot]
+        trucks = []
+        for _, label in best:
+            truck = self.__get_truck(label, depot)
+            if not (truck.is_too_long() and not truck.is_splittable()):
+                trucks.append(truck)
+        return trucks
+
+    def get_depot_shipments(self, depot):
+        """
+        For every shipment whether a truck of depot can execute it: all inbound shipments and the shipments that start
+        at the depot, as in ShipmentArcs.get_depot_positions
+        :return: list of bools
+        """
+        starts_at_depot = c.time_diff_array[self.start_location_index, c.location_index[depot]] < 1
+        return (np.array(self.is_inbound) | starts_at_depot).tolist()
+
+    def __extend(self, label, position, driving_time, dual, depot):
+        """
+        Label of the path of label followed by the shipment at position, or None if the shipment cannot follow
+        :return: Label or None
+        """
+        if label.visited & self.visited_bits[position]:
+            return None
+        arrival_time = label.end_time + driving_time
+        if arrival_time > self.latest_start_time[position]:
+            return None
+        waiting_time = self.earliest_start_time[position] - arrival_time
+        shift = 0
+        if waiting_time > 0:
+            shift = min(waiting_time, label.slack)
+            waiting_time -= shift
+            if waiting_time > c.max_waiting_time:
+                return None
+            start_time = self.earliest_start_time[position]
+        else:
+            waiting_time = 0
+            start_time = arrival_time
+        end_time = start_time + self.length[position]
+        truck_start_time = label.truck_start_time + shift
+        return Label(node=position, start_time=start_time, end_time=end_time,
+                     slack=min(label.slack - shift, self.latest_start_time[position] - start_time),
+                     truck_start_time=truck_start_time, waiting_time=label.waiting_time + waiting_time,
+                     costs=label.costs + c.weight_empty_driving_time * driving_time - dual,
+                     relief_point=self.__get_relief_point(label.relief_point, position, start_time, end_time,
+                                                          truck_start_time, depot),
+                     visited=label.visited | self.visited_bits[position], parent=label, shift=shift)
+
+    def __get_relief_point(self, relief_point, position, start_time, end_time, truck_start_time, depot):
+        """
+        The relief point of a label after adding the shipment at position with the given start and end time
+        :return: float or None
+        """
+        if relief_point is not None:
+            return relief_point
+        shipment = self.shipments_tw[position]
+        if shipment.start_location == depot and start_time - truck_start_time > c.min_duration_split:
+            return start_time - truck_start_time
+        if shipment.end_location == depot and end_time - truck_start_time > c.min_duration_split:
+            return end_time - truck_start_time
+        return None
+
+    def __insert(self, labels_at, label):
+        """
+        Keep label at its shipment if no kept label dominates it, and drop the kept labels it dominates. The kept labels
+        are sorted by costs, so only the labels before label can dominate it and only the labels after it can be
+        dominated by it
+        :return: True if label is kept
+        """
+        labels = labels_at.setdefault(label.node, [])
+        if len(labels) >= self.max_labels_per_node and label.costs >= labels[-1].costs:
+            return False
+        i = bisect_right(labels, label.costs, key=attrgetter('costs'))
+        for other in labels[:i]:
+            if other.dominates(label):
+                return False
+        kept = labels[:i]
+        kept.append(label)
+        for other in labels[i:]:
+            if label.dominates(other):
+                other.is_dominated = True
+            else:
+                kept.append(other)
+        if len(kept) > self.max_labels_per_node:
+            kept.pop().is_dominated = True
+        labels_at[label.node] = kept
+        return True
+
+    def __get_completion_costs(self, label, depot_index):
+        """
+        Reduced costs of the truck day that drives back to the depot after the path of label, infinity if the truck day
+        is too long and cannot be split
+        :return: float
+        """
+        pull_in = c.time_diff_table[self.end_location_index[label.node]][depot_index]
+        duration = label.end_time - label.truck_start_time + pull_in
+        waiting_time = label.waiting_time + max(0, c.min_duration_split - duration)
+        truck_start_time = label.get_latest_truck_start_time()
+        if duration > get_max_duration(truck_start_time, 0) and \
+                (label.relief_point is None or duration - label.relief_point <= c.min_duration_split):
+            return float('inf')
+        return label.costs + c.weight_empty_driving_time * pull_in + c.weight_waiting_time * waiting_time**2
+
+    def __get_truck(self, label, depot):
+        """
+        The truck day of the path of label, with the start times of the shipments after all moves of the path
+        :return: Truck
+        """
+        shift = label.get_latest_truck_start_time() - label.truck_start_time
+        shipments = []
+        while label is not None:
+            shipments.append(Shipment(input_shipment=self.shipments_tw[label.node], start_time=label.start_time + shift))
+            shift += label.shift
+            label = label.parent
+        return Truck(start_depot=depot, shipments=shipments[::-1])
+
+    def __get_successors(self):
+        """
+        The shipments that can follow every shipment for some start times in the time windows, with a waiting time of
+        at most the maximum waiting time, and the empty driving time to them
+        :return: list of lists of (position, driving time)
+        """
+        earliest_start_time = np.array(self.earliest_start_time)
+        latest_start_time = np.array(self.latest_start_time)
+        length = np.array(self.length)
+        driving_time = c.time_diff_array[np.ix_(self.end_location_index, self.start_location_index)]
+        earliest_arrival_time = (earliest_start_time + length)[:, np.newaxis] + driving_time
+        latest_arrival_time = (latest_start_time + length)[:, np.newaxis] + driving_time
+        is_successor = (earliest_arrival_time <= latest_start_time[np.newaxis, :]) & \
+            (earliest_start_time[np.newaxis, :] - latest_arrival_time <= c.max_waiting_time)
+        np.fill_diagonal(is_successor, False)
+        return [list(zip(np.flatnonzero(row).tolist(), driving_time[position, row].tolist()))
+                for position, row in enumerate(is_successor)]
+
+    def __get_visited_bits(self):
+        """
+        A bit for every shipment that could be executed twice by one truck, one that ends before its latest start time,
+        so paths stay elementary. The other shipments get no bit, which keeps the dominance check cheap
+        :return: list of ints
+        """
+        can_repeat = np.array(self.earliest_start_time) + np.array(self.length) <= np.array(self.latest_start_time)
+        bits = [0] * len(self.shipments_tw)
+        for bit, position in enumerate(np.flatnonzero(can_repeat).tolist()):
+            bits[position] = 1 << bit
+        return bits
+
+    # ----- Master -----
+
+    def __get_master_matrices(self, depot_list):
+        """
+        The costs of the columns and the sparse constraint matrices of the shipments and the depots. Only the columns
+        added since the last call are converted, the matrices of the other columns are kept
+        :return: costs, shipment matrix, depot matrix
+        """
+        costs, shipment_matrix, depot_matrix = self.master_matrices
+        number_of_columns = shipment_matrix.shape[1]
+        if number_of_columns < len(self.columns):
+            depot_row = {depot: row for row, depot in enumerate(depot_list)}
+            shipment_rows, shipment_columns, depot_rows = [], [], []
+            for column, (depot, positions, _, _) in enumerate(self.columns[number_of_columns:]):
+                shipment_rows.extend(positions)
+                shipment_columns.extend([column] * len(positions))
+                depot_rows.append(depot_row[depot])
+            number_new_columns = len(self.columns) - number_of_columns
+            costs = np.concatenate([costs, [column[3] for column in self.columns[number_of_columns:]]])
+            shipment_matrix = hstack([shipment_matrix, csc_matrix(
+                (np.ones(len(shipment_rows)), (shipment_rows, shipment_columns)),
+                shape=(len(self.shipments_tw), number_new_columns))], format='csc')
+            depot_matrix = hstack([depot_matrix, csc_matrix(
+                (np.ones(number_new_columns), (depot_rows, range(number_new_columns))),
+                shape=(len(depot_list), number_new_columns))], format='csc')
+            self.master_matrices = (costs, shipment_matrix, depot_matrix)
+        return self.master_matrices
+
+    def __solve_lp_master(self, depot_list):
+        """
+        Solve the LP relaxation of the master with the fixed columns set to one, without the columns that cover a
+        shipment of a fixed column. One artificial column per shipment, with a cost no truck day has, keeps the LP
+        feasible
+        :return: duals of the shipments, duals of the depots
+        """
+        lp_tic = time.time()
+        costs, shipment_matrix, depot_matrix = self.__get_master_matrices(depot_list)
+        number_of_shipments = len(self.shipments_tw)
+        active = np.arange(len(costs))
+        if len(self.fixed_columns) > 0:
+            is_blocked = shipment_matrix.T @ np.array(self.is_covered, dtype=float) > 0
+            is_blocked[self.fixed_columns] = False
+            active = np.flatnonzero(~is_blocked)
+        lower = np.zeros(len(active) + number_of_shipments)
+        lower[np.searchsorted(active, self.fixed_columns)] = 1
+        result = linprog(np.concatenate([costs[active], np.full(number_of_shipments, 10 * c.fixed_cost_new_truck)]),
+                         A_ub=hstack([depot_matrix[:, active], csc_matrix((len(depot_list), number_of_shipments))]),
+                         b_ub=[self.depots[depot] for depot in depot_list],
+                         A_eq=hstack([shipment_matrix[:, active], identity(number_of_shipments, format='csc')]),
+                         b_eq=np.ones(number_of_shipments), bounds=np.column_stack([lower, np.full(len(lower), np.inf)]),
+                         method='highs')
+        self.lp_time += time.time() - lp_tic
+        if result.status != 0:
+            raise ValueError('LP master could not be solved: ' + result.message)
+        self.lp_value = result.fun
+        self.lp_solution = np.zeros(len(costs))
+        self.lp_solution[active] = result.x[:len(active)]
+        self.duals = (result.eqlin.marginals, result.ineqlin.marginals)
+        return self.duals
+
+    def __solve_integer_master(self, depot_list, duals, dive_columns, time_limit):
+        """
+        Solve the master with binary columns, restricted to the columns of the dive, the columns of the start and the
+        max_master_columns columns with the lowest reduced costs for duals
+        :return: list of columns or None
+        """
+        costs, shipment_matrix, depot_matrix = self.__get_master_matrices(depot_list)
+        shipment_duals, depot_duals = duals
+        reduced_costs = costs - shipment_matrix.T @ shipment_duals - depot_matrix.T @ depot_duals
+        selected = np.union1d(np.argsort(reduced_costs, kind='stable')[:self.max_master_columns],
+                              dive_columns + self.start_columns).astype(int)
+        constraints = [LinearConstraint(shipment_matrix[:, selected], 1, 1),
+                       LinearConstraint(depot_matrix[:, selected], -np.inf,
+                                        [self.depots[depot] for depot in depot_list])]
+        options = {'mip_rel_gap': self.config.gap_percentage / 100, 'disp': False, 'time_limit': time_limit}
+        result = milp(c=costs[selected], integrality=np.ones(len(selected)), bounds=Bounds(0, 1),
+                      constraints=constraints, options=options)
+        if result.status == 0:
+            self.status = 'OPTIMAL'
+        elif result.status == 1:
+            self.status = 'TIME LIMIT'
+        else:
+            self.status = 'NO SOLUTION'
+        print(self.status)
+        if result.x is None:
+            return None
+        return selected[result.x > 0.5].tolist()
+
+
+# ----------------------------------------------- Label Class --------------------------------------------------------
+
+class Label:
+    """
+    A path of shipments of one depot in the pricing problem, ending with the shipment node. The path can be moved later
+    by at most slack without changing its waiting time. start_time is the start time of the last shipment before later
+    moves of the path, shift how much the path was moved when the last shipment was added. relief_point is the first
+    relief point more than min_duration_split after the start of the truck, relative to the start of the truck, which
+    stays the same when the path is moved
+    """
+
+    __slots__ = ['node', 'start_time', 'end_time', 'slack', 'truck_start_time', 'waiting_time', 'costs',
+                 'relief_point', 'visited', 'parent', 'shift', 'is_dominated', 'duration', 'latest_end_time',
+                 'padded_waiting_time', 'is_late_start', 'split_margin']
+
+    def __init__(self, node, start_time, end_time, slack, truck_start_time, waiting_time, costs, relief_point, visited,
+                 parent, shift):
+        self.node = node
+        self.start_time = start_time
+        self.end_time = end_time
+        self.slack = slack
+        self.truck_start_time = truck_start_time
+        self.waiting_time = waiting_time
+        self.costs = costs
+        self.relief_point = relief_point
+        self.visited = visited
+        self.parent = parent
+        self.shift = shift
+        self.is_dominated = False
+
+        # Resources compared in dominates
+        self.duration = end_time - truck_start_time
+        self.latest_end_time = end_time + slack
+        self.padded_waiting_time = waiting_time + max(0, c.min_duration_split - self.duration)
+        self.is_late_start = self.get_latest_truck_start_time() >= 1.25
+        self.split_margin = float('-inf') if relief_point is None else self.duration - relief_point
+
+    def get_path(self):
+        path = []
+        label = self
+        while label is not None:
+            path.append(label.node)
+            label = label.parent
+        return tuple(path[::-1])
+
+    def get_latest_truck_start_time(self):
+        """
+        The start time of the truck after moving the path later, if that avoids the shorter maximum duration of an
+        early start
+        :return: float
+        """
+        if self.truck_start_time < 1.25 <= self.truck_start_time + self.slack:
+            return 1.25
+        return self.truck_start_time
+
+    def dominates(self, other):
+        """
+        True if every extension of other is at least as good an extension of this label: this label can be moved to
+        end when other ends, it is not longer, has no more costs and waiting time (including the waiting time that is
+        added to a truck day shorter than min_duration_split), has visited no shipment other has not visited and has a
+        split point at least as far from its end
+        :return: bool
+        """
+        return self.end_time <= other.end_time and self.latest_end_time >= other.latest_end_time and \
+            self.duration <= other.duration and self.costs <= other.costs and \
+            self.padded_waiting_time <= other.padded_waiting_time and not self.visited & ~other.visited and \
+            (self.is_late_start or not other.is_late_start) and self.split_margin >= other.split_margin and \
+            (self.duration > c.min_duration_split or self.duration == other.duration)
@@ -7,6 +7,7 @@ from heuristics.Config import Config
 from heuristics.InputFixed import InputFixed
 from heuristics.Schedule import Schedule
 from heuristics.Truck import Truck
+from heuristics.DepotPools import DepotPools
 from heuristics.Shipment import Shipment
 
 
@@ -29,15 +30,14 @@ class ConcurrentScheduler:
         :return: Schedule
         """
         # Initiate all trucks available
-        trucks = [Truck(depot) for depot, number_of_trucks in self.depots.items() for _ in range(number_of_trucks)]
+        pools = DepotPools(self.depots)
 
         # Sort the shipments by increasing start time
         sorted_shipments = sorted(self.shipments, key=lambda shipment: shipment.start_time)
 
         # Loop over all shipments in increasing start time order
         for shipment in sorted_shipments:
-            active_trucks = list(filter(lambda truck: truck.is_active(), trucks))
-            inactive_trucks = list(filter(lambda truck: not truck.is_active(), trucks))
+            active_trucks = pools.active_trucks
             placed = False
             active_trucks_with_space = []
             for truck in active_trucks:
@@ -52,16 +52,17 @@ class ConcurrentScheduler:
                     the_best_truck.add_shipment(shipment)
                     placed = True
                     # print('just placed on active truck: ', truck.get_id(), shipment)
-            if not placed and len(inactive_trucks) > 0:
-                the_best_truck = min(inactive_trucks, key=lambda truck: cost_inactive_truck(truck, shipment))
+            if not placed and pools.has_idle_trucks():
+                the_best_truck = min(pools.get_idle_trucks(), key=lambda truck: cost_inactive_truck(truck, shipment))
                 the_best_truck.add_shipment(shipment)
+                pools.activate(the_best_truck)
                 placed = True
                 # print('just placed on new truck: ', the_best_truck.get_id(), shipment)
             if not placed:
                 print("Shipment could not be placed")
                 pass
 
-        schedule = Schedule(config=self.config, trucks=[truck for truck in trucks if truck.is_active()])
+        schedule = Schedule(config=self.config, trucks=list(pools.active_trucks))
 
         return schedule
 
@@ -71,12 +72,12 @@ class ConcurrentScheduler:
 
 def are_compatible(ship1, ship2):
     compatibility = False
-    if ship1.end_time + c.time_diff_matrix.at[ship1.end_location, ship2.start_location] <= ship2.start_time:
+    if ship1.end_time + c.time_diff_table[ship1.end_location_index][ship2.start_location_index] <= ship2.start_time:
         compatibility = True
     return compatibility
 
 def driving_time_between_shipments(left_shipment, right_shipment):
-    return c.time_diff_matrix.at[left_shipment.end_location, right_shipment.start_location]
+    return c.time_diff_table[left_shipment.end_location_index][right_shipment.start_location_index]
 
 def cost_active_truck(truck: Truck, shipment: Shipment):
     last_shipment = truck.shipments[-1]
@@ -91,24 +92,24 @@ def cost_active_truck(truck: Truck, shipment: Shipment):
 
 def cost_inactive_truck(truck: Truck, shipment: Shipment):
     return truck.startup_cost + c.weight_empty_driving_time * (
-        c.time_diff_matrix.at[truck.start_depot, shipment.start_location])
+        c.time_diff_table[truck.start_depot_index][shipment.start_location_index])
 
 def duration_with_potential_shipment(truck: Truck, shipment: Shipment):
-    duration_with_shipment = c.time_diff_matrix.at[
-                                 truck.start_depot, truck.shipments[0].start_location] + \
+    duration_with_shipment = c.time_diff_table[
+                                 truck.start_depot_index][truck.shipments[0].start_location_index] + \
                              (shipment.end_time - truck.shipments[0].start_time) + \
-                             c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+                             c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     return duration_with_shipment
 
 def driving_time_with_potential_shipment(truck: Truck, shipment: Shipment):
-    driving_time_with_shipment = c.time_diff_matrix.at[
-        truck.start_depot, truck.shipments[0].start_location]
+    driving_time_with_shipment = c.time_diff_table[
+        truck.start_depot_index][truck.shipments[0].start_location_index]
     for ship in truck.shipments:
         ship_duration = ship.end_time - ship.start_time - c.loading_time
         driving_time_with_shipment += ship_duration
-    driving_time_with_shipment += c.time_diff_matrix.at[
-        truck.shipments[-1].end_location, shipment.start_location]
+    driving_time_with_shipment += c.time_diff_table[
+        truck.shipments[-1].end_location_index][shipment.start_location_index]
     driving_time_with_shipment += (shipment.end_time - shipment.start_time) - c.loading_time
-    driving_time_with_shipment += c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+    driving_time_with_shipment += c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     return driving_time_with_shipment
 
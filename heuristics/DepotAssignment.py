@@ -0,0 +1,99 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+import constants as c
+from heuristics.Truck import Truck
+
+
+# Costs of a truck at a depot at which it would be too long without a split, higher than any feasible assignment
+infeasible_costs = 1000000000
+
+
+# ----------------------------------------------- Depot Assignment ----------------------------------------------------
+
+def assign_depots(trucks: list, depots: dict, fixed_trucks: list = ()):
+    """
+    Give every truck the depot at which the total move costs of the trucks are lowest, see Truck.get_move_costs, with
+    at most the capacity of a depot of trucks at it. Every depot has a slot per truck it can take, and the trucks are
+    assigned to the slots with linear_sum_assignment. A truck keeps its depot if another one is not cheaper, and is only
+    moved to a depot at which it would be too long without a split if the capacities leave no other choice. The
+    fixed_trucks, for instance the input trucks of a construction, keep their depot and take up its capacity. If the
+    other trucks do not fit in the capacity that is left, they are left as they are too.
+    :return: number of trucks that changed depot
+    """
+    fixed_trucks = set(fixed_trucks)
+    free_trucks = [truck for truck in trucks if truck not in fixed_trucks]
+    if len(free_trucks) == 0:
+        return 0
+    depot_names = list(depots)
+    capacities = [depots[depot] - sum(truck.start_depot == depot for truck in trucks if truck in fixed_trucks)
+                  for depot in depot_names]
+    slots = np.repeat(np.arange(len(depot_names)), [min(max(capacity, 0), len(free_trucks)) for capacity in capacities])
+    if len(slots) < len(free_trucks):
+        return 0
+    costs = get_depot_costs(free_trucks, depot_names, infeasible_costs=infeasible_costs)
+    is_current = np.array([[truck.start_depot == depot for depot in depot_names] for truck in free_trucks])
+    costs = costs - 1e-6 * is_current
+    rows, columns = linear_sum_assignment(costs[:, slots])
+    number_changed = 0
+    for row, column in zip(rows.tolist(), columns.tolist()):
+        depot = depot_names[slots[column]]
+        if depot != free_trucks[row].start_depot:
+            free_trucks[row].change_depot_to(depot)
+            number_changed += 1
+    return number_changed
+
+
+def get_depot_costs(trucks: list, depots: list, infeasible_costs: float = None):
+    """
+    The move costs of every truck if it would start at every depot. Only the pull out and pull in change, and with them
+    the duration, the waiting time of a short day and the maximum duration. Whether a truck that becomes too long can
+    be split is checked for those trucks only. With infeasible_costs a truck that would be too long without a split at
+    a depot other than its own gets these costs there instead of the penalty.
+    :return: array of shape (number of trucks, number of depots)
+    """
+    table = c.time_diff_array
+    depot_index = np.array([c.location_index[depot] for depot in depots], dtype=np.intp)
+    first_location_index = np.array([truck.get_first_shipment().start_location_index for truck in trucks], dtype=np.intp)
+    last_location_index = np.array([truck.get_last_shipment().end_location_index for truck in trucks], dtype=np.intp)
+    first_start_time = np.array([truck.get_first_shipment().start_time for truck in trucks])
+    last_end_time = np.array([truck.get_last_shipment().end_time for truck in trucks])
+    current_depot_index = np.array([truck.start_depot_index for truck in trucks], dtype=np.intp)
+    duration = np.array([truck.get_duration() for truck in trucks])
+    # Waiting and empty driving between the shipments, without the short day waiting and the pull out and pull in
+    waiting_between = np.array([truck.get_waiting_time() for truck in trucks]) - np.maximum(7 - duration, 0)
+    driving_between = np.array([truck.get_empty_driving_time() for truck in trucks]) - \
+        table[current_depot_index, first_location_index] - table[last_location_index, current_depot_index]
+
+    pull_out = table[depot_index[np.newaxis, :], first_location_index[:, np.newaxis]]
+    pull_in = table[last_location_index[:, np.newaxis], depot_index[np.newaxis, :]]
+    duration = np.round(pull_out + (last_end_time - first_start_time)[:, np.newaxis] + pull_in, 2)
+    waiting_time = waiting_between[:, np.newaxis] + np.maximum(7 - duration, 0)
+    startup_cost = np.array([truck.startup_cost for truck in trucks], dtype=float)
+    costs = np.floor(startup_cost[:, np.newaxis] + c.weight_empty_driving_time *
+                     (driving_between[:, np.newaxis] + pull_out + pull_in) + c.weight_waiting_time * waiting_time**2)
+
+    start_time = first_start_time[:, np.newaxis] - pull_out
+    max_duration = np.where(start_time < 1.25, np.where(waiting_time < 1, 11, 11.25),
+                            np.where(waiting_time < 1, 13.5, 14))
+    for row, column in zip(*[array.tolist() for array in np.nonzero(duration > max_duration)]):
+        if not is_splittable_at(trucks[row], depots[column], start_time[row, column],
+                                last_end_time[row] + pull_in[row, column]):
+            if infeasible_costs is not None and depots[column] != trucks[row].start_depot:
+                costs[row, column] = infeasible_costs
+            else:
+                costs[row, column] += c.penalty_too_long_without_split
+    return costs
+
+
+def is_splittable_at(truck: Truck, depot, start_time, end_time):
+    """
+    True if truck would have a relief point at depot to split it, see Truck.get_split_relief_points
+    :return: bool
+    """
+    for shipment in truck.get_shipments():
+        for location, relief_point in [(shipment.start_location, shipment.start_time),
+                                       (shipment.end_location, shipment.end_time)]:
+            if location == depot and relief_point - start_time > c.min_duration_split and \
+                    end_time - relief_point > c.min_duration_split:
+                return True
+    return False
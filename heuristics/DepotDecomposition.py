@@ -0,0 +1,331 @@
+import multiprocessing
+import time
+import numpy as np
+import constants as c
+from heuristics.Config import Config
+from heuristics.FlowNetwork import FlowNetwork
+from heuristics.FlowSolvers import NetworkSimplexSolver, solve_flow_network
+from heuristics.InputTW import InputTW
+from heuristics.Schedule import Schedule
+from ilp_models.MDVSPTW_TSN_model import MDVSPTWTSNModel
+from ilp_models.NetworkModel import get_input_id
+
+
+# Weight of the earlier relaxations in how often a depot executed a shipment, which is decreased by this factor every
+# iteration so that the first relaxations with multipliers far from optimal are forgotten
+coverage_decay = 0.8
+
+
+# ----------------------------------------- DepotDecomposition Class -------------------------------------------------
+
+class DepotDecomposition:
+    """
+    Lagrangian decomposition of the multi depot model over its depots. The depot layers of the model are only tied
+    together by the constraints that every shipment is executed exactly once; these are relaxed with a multiplier per
+    shipment, which is subtracted from the costs of executing the shipment in every layer. What is left is a min cost
+    flow problem per depot, with the capacity of the depot, that is solved exactly by the network simplex. Their total
+    value plus the sum of the multipliers is a lower bound on the costs of the model, and the multipliers are updated by
+    subgradient steps towards shipments that are executed once, starting from zero. Every primal_interval iterations a
+    schedule is made from how often the depots executed every shipment in the relaxations so far: a shipment may only
+    be executed by the depots that executed it often, and the network restricted to these is solved with solver. The
+    depots that share no shipments are solved separately, so with core_threshold = 1 and no ties every depot is solved
+    on its own with the shipments assigned to it. The iterations stop when time_limit seconds have passed, and the
+    restricted solves only get the time that is left of it.
+    The layers are time space networks of the formulation of MDVSPTWILP (a depot executes the inbound shipments and the
+    outbound shipments that start at the depot) without the maximum waiting time, so the lower bound is also a lower
+    bound for MDVSPTWILP. The depots are solved by a pool of number_of_workers processes, every process builds the
+    layers once.
+    """
+
+    def __init__(self, input: InputTW, config: Config, number_of_workers: int = 1, max_iterations: int = 50,
+                 primal_interval: int = 10, step_size: float = 2.0, core_threshold: float = 0.5,
+                 solver: str = 'auto', time_limit: float = c.ilp_time_limit):
+        self.input = input
+        self.shipments_tw = input.shipments_tw
+        self.depots = input.depots
+        self.config = config
+        self.number_of_workers = number_of_workers
+        self.max_iterations = max_iterations
+        self.primal_interval = primal_interval
+        self.step_size = step_size
+        self.core_threshold = core_threshold
+        self.solver = solver
+        self.time_limit = time_limit
+        self.depot_list = list(self.depots.keys())
+        self.multipliers = None
+        self.lower_bound = None
+        self.upper_bound = None
+        self.lower_bounds = []
+        self.number_of_iterations = 0
+        self.solve_time = None
+
+    def get_solution(self):
+        """
+        Run the subgradient method until max_iterations, the time limit or a gap below the gap of config
+        :return: Schedule with the lowest costs in the network model, or None if no depot assignment was feasible
+        """
+        tic = time.time()
+        deadline = tic + self.time_limit
+        self.multipliers = np.zeros(len(self.shipments_tw))
+        self.lower_bound = -np.inf
+        self.upper_bound = np.inf
+        self.lower_bounds = []
+        best_schedule = None
+        step_size = self.step_size
+        iterations_without_improvement = 0
+        coverage = np.zeros((len(self.shipments_tw), len(self.depot_list)))
+        with get_pool(self.number_of_workers, self.input, self.config) as pool:
+            for iteration in range(self.max_iterations):
+                self.number_of_iterations = iteration + 1
+                results = pool.starmap(solve_relaxed_layer, [(depot, self.multipliers) for depot in self.depot_list])
+                lower_bound = float(np.sum(self.multipliers)) + sum(value for value, _ in results)
+                covered_by = [covered for _, covered in results]
+                coverage *= coverage_decay
+                for depot_index, covered in enumerate(covered_by):
+                    np.add.at(coverage[:, depot_index], covered, 1)
+                self.lower_bounds.append(lower_bound)
+                if lower_bound > self.lower_bound + 1e-6:
+                    self.lower_bound = lower_bound
+                    iterations_without_improvement = 0
+                else:
+                    iterations_without_improvement += 1
+                    if iterations_without_improvement >= 5:
+                        step_size /= 2
+                        iterations_without_improvement = 0
+
+                if iteration % self.primal_interval == 0 or iteration + 1 == self.max_iterations:
+                    schedule, value = self.__get_primal_solution(pool, coverage, deadline)
+                    if schedule is not None and value < self.upper_bound:
+                        best_schedule, self.upper_bound = schedule, value
+                if self.__is_converged() or time.time() > deadline:
+                    break
+
+                # Subgradient step
+                subgradient = 1 - np.bincount(np.concatenate([np.array(covered, dtype=np.intp) for covered in covered_by]),
+                                              minlength=len(self.shipments_tw))
+                norm = float(subgradient @ subgradient)
+                if norm == 0:
+                    break
+                target = self.upper_bound if self.upper_bound < np.inf else self.__get_single_trucks_costs()
+                self.multipliers = self.multipliers + step_size * max(target - lower_bound, 1) / norm * subgradient
+
+        self.solve_time = time.time() - tic
+        print('LOWER BOUND: ', self.lower_bound)
+        print('UPPER BOUND: ', self.upper_bound)
+        print('ITERATIONS: ', self.number_of_iterations)
+        return best_schedule
+
+    def get_gap(self):
+        """
+        The relative gap between the network costs of the schedule and the lower bound
+        :return: float
+        """
+        return (self.upper_bound - self.lower_bound) / self.upper_bound
+
+    def __is_converged(self):
+        return self.upper_bound < np.inf and self.get_gap() <= self.config.gap_percentage / 100
+
+    def __get_single_trucks_costs(self):
+        """
+        The costs of executing every shipment on its own truck from the nearest depot that can execute it, an upper bound
+        for the step size as long as no schedule is found
+        :return: float
+        """
+        return sum(min(get_single_truck_costs(shipment_tw, c.location_index[depot]) for depot in self.depot_list
+                       if is_executed_by(shipment_tw, depot)) for shipment_tw in self.shipments_tw)
+
+    def __get_primal_solution(self, pool, coverage, deadline):
+        """
+        Let every shipment be executed by the depots that executed it at least core_threshold times as often as the
+        depot that executed it most often in the relaxations so far, or if no depot executed it by the depot that can
+        execute it with the shortest pull out and pull in. The depots that share shipments are solved together, the
+        groups of depots in parallel, each until deadline, in seconds like time.time().
+        :return: Schedule and its costs in the network model, or None and np.inf if a group has no feasible solution
+        """
+        is_allowed = (coverage > 0) & (coverage >= self.core_threshold * coverage.max(axis=1, keepdims=True))
+        for position, shipment_tw in enumerate(self.shipments_tw):
+            if not is_allowed[position].any():
+                nearest_depot = min((depot for depot in self.depot_list if is_executed_by(shipment_tw, depot)),
+                                    key=lambda depot: get_single_truck_costs(shipment_tw, c.location_index[depot]))
+                is_allowed[position, self.depot_list.index(nearest_depot)] = True
+
+        # Groups of depots that share shipments, by union find
+        group_of = list(range(len(self.depot_list)))
+
+        def find(depot_index):
+            while group_of[depot_index] != depot_index:
+                depot_index = group_of[depot_index]
+            return depot_index
+
+        for depot_indices in map(np.flatnonzero, is_allowed):
+            for depot_index in depot_indices[1:].tolist():
+                group_of[find(depot_index)] = find(depot_indices[0])
+        groups = {}
+        for depot_index, depot in enumerate(self.depot_list):
+            positions = np.flatnonzero(is_allowed[:, depot_index]).tolist()
+            if len(positions) > 0:
+                groups.setdefault(find(depot_index), {})[depot] = positions
+
+        results = pool.starmap(solve_restricted_layers, [(allowed_positions, self.config.gap_percentage, self.solver,
+                                                          deadline) for allowed_positions in groups.values()])
+        if any(trucks is None for trucks, _ in results):
+            return None, np.inf
+        trucks = [truck for group_trucks, _ in results for truck in group_trucks]
+        return Schedule(config=self.config, trucks=trucks), sum(value for _, value in results)
+
+
+# -------------------------------------------- DepotLayer Class ------------------------------------------------------
+
+class DepotLayerModel(MDVSPTWTSNModel):
+    """
+    The time space network of one depot, with the shipments that the depot executes in MDVSPTWILP
+    """
+
+    def get_depot_positions(self, depot):
+        return self.shipment_arcs.get_depot_positions(depot)
+
+
+class DepotLayer:
+    """
+    The network of one depot with the capacity of the depot. Executing a discretized shipment is the arc from its node
+    to its end node in the time space network; these execution arcs are kept with the position of their shipment in
+    shipments_tw, so the costs of a relaxation are the costs of the network with the multipliers subtracted from them.
+    """
+
+    def __init__(self, input: InputTW, config: Config, depot: str, positions: dict):
+        self.depot = depot
+        self.model = DepotLayerModel(input=input, config=config, depot=depot)
+        network = self.model.build()
+        self.flow_upper = network.flow_upper
+        self.costs = network.costs
+        self.nodes = network.nodes
+        self.exactly_one = network.exactly_one
+        self.max_outflow = {depot + '_s': input.depots[depot]}
+        self.execution_arcs = [(node, node + '_e') for node in self.model.shipment_nodes]
+        self.execution_positions = np.array([positions[get_input_id(shipment)]
+                                             for shipment in self.model.shipment_nodes.values()], dtype=np.intp)
+        self.execution_costs = np.array([self.costs[arc] for arc in self.execution_arcs])
+        self.node_positions = dict(zip(self.model.shipment_nodes, self.execution_positions.tolist()))
+
+    def solve_relaxation(self, multipliers):
+        """
+        Solve the network without exactly one constraints and with the multipliers subtracted from the costs of the
+        execution arcs
+        :return: optimal value, positions of the executed shipments
+        """
+        costs = dict(self.costs)
+        costs.update(zip(self.execution_arcs, (self.execution_costs - multipliers[self.execution_positions]).tolist()))
+        network = FlowNetwork(flow_upper=self.flow_upper, costs=costs, nodes=self.nodes, exactly_one={},
+                              max_outflow=self.max_outflow)
+        flows = NetworkSimplexSolver().solve(network)
+        covered = [position for arc, position in zip(self.execution_arcs, self.execution_positions.tolist())
+                   if flows.get(arc, 0) > 0]
+        return network.get_objective(flows), covered
+
+    def get_restricted_parts(self, positions: set):
+        """
+        The arcs and exactly one groups of the network in which the depot can only execute the shipments in positions
+        :return: flow upper bounds, exactly one groups
+        """
+        flow_upper = dict(self.flow_upper)
+        for arc, position in zip(self.execution_arcs, self.execution_positions.tolist()):
+            if position not in positions:
+                flow_upper[arc] = 0
+        exactly_one = {name: [node for node in nodes if self.node_positions[node] in positions]
+                       for name, nodes in self.exactly_one.items()}
+        return flow_upper, {name: nodes for name, nodes in exactly_one.items() if len(nodes) > 0}
+
+
+# ---------------------------------------------- Help Functions ----------------------------------------------------
+
+def is_executed_by(shipment_tw, depot):
+    """
+    True if a truck of depot can execute shipment_tw in MDVSPTWILP: it is inbound or it starts at the depot
+    :return: bool
+    """
+    return 'IB' in shipment_tw.type or \
+        c.time_diff_table[shipment_tw.start_location_index][c.location_index[depot]] < 1
+
+
+def get_single_truck_costs(shipment_tw, depot_index):
+    return c.fixed_cost_new_truck + c.weight_empty_driving_time * (
+        c.time_diff_table[depot_index][shipment_tw.start_location_index] +
+        c.time_diff_table[shipment_tw.end_location_index][depot_index])
+
+
+class SerialPool:
+    """
+    The part of multiprocessing.Pool that DepotDecomposition uses, run in the current process
+    """
+
+    def __init__(self, input: InputTW, config: Config):
+        init_worker(input, config)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    @staticmethod
+    def starmap(function, tasks):
+        return [function(*task) for task in tasks]
+
+
+def get_pool(number_of_workers, input: InputTW, config: Config):
+    if number_of_workers <= 1:
+        return SerialPool(input, config)
+    return multiprocessing.Pool(processes=number_of_workers, initializer=init_worker, initargs=(input, config))
+
+
+# ----- Workers of DepotDecomposition -----
+
+worker_layers = None
+
+
+def init_worker(input: InputTW, config: Config):
+    global worker_layers
+    positions = {shipment_tw.id: position for position, shipment_tw in enumerate(input.shipments_tw)}
+    worker_layers = {depot: DepotLayer(input, config, depot, positions) for depot in input.depots}
+
+
+def solve_relaxed_layer(depot, multipliers):
+    return worker_layers[depot].solve_relaxation(multipliers)
+
+
+def solve_restricted_layers(allowed_positions: dict, gap_percentage, solver, deadline=None):
+    """
+    Solve the network of the depots in allowed_positions together, in which every depot can only execute the shipments
+    of its allowed positions and every shipment is executed exactly once, with the time left until deadline, in
+    seconds like time.time(). The groups of a pool without workers are solved one after the other, so the time left
+    is taken when the solve starts.
+    :return: trucks and the costs of the solution, or None and np.inf if there is no feasible solution
+    """
+    flow_upper, costs, nodes, exactly_one, max_outflow = {}, {}, [], {}, {}
+    for depot, positions in allowed_positions.items():
+        layer = worker_layers[depot]
+        layer_flow_upper, layer_exactly_one = layer.get_restricted_parts(set(positions))
+        flow_upper.update(layer_flow_upper)
+        costs.update(layer.costs)
+        nodes += layer.nodes
+        for name, group in layer_exactly_one.items():
+            exactly_one.setdefault(name, []).extend(group)
+        max_outflow.update(layer.max_outflow)
+    if len(exactly_one) == 0:
+        return [], 0
+    network = FlowNetwork(flow_upper=flow_upper, costs=costs, nodes=nodes, exactly_one=exactly_one,
+                          max_outflow=max_outflow)
+    time_limit = None
+    if deadline is not None:
+        time_limit = deadline - time.time()
+        if time_limit <= 0:
+            return None, np.inf
+    flows, _ = solve_flow_network(network, gap_percentage, time_limit=time_limit, solver=solver)
+    if flows is None:
+        return None, np.inf
+    trucks = []
+    for depot in allowed_positions:
+        model = worker_layers[depot].model
+        model.solution_flows = flows
+        trucks += model.extract().get_trucks()
+    return trucks, network.get_objective(flows)
@@ -0,0 +1,88 @@
+from bisect import bisect_left
+
+# Files
+from heuristics.Truck import Truck
+
+
+# ---------------------------------------------- DepotPools Class -----------------------------------------------------
+
+class DepotPools:
+    """
+    The trucks of a concurrent scheduler, per depot. Instead of creating a Truck for all the capacity of a depot, only
+    the next truck of each depot is kept as an idle truck, so opening a new truck is evaluated once per depot. The
+    remaining capacity of a depot is a counter. Every truck has a rank, its position in the list of all trucks the
+    schedulers used to build (input trucks first, then the depots in order), and the active trucks are kept in that
+    order so the schedulers break ties as before.
+    """
+
+    def __init__(self, depots: dict, trucks: list = None):
+        if trucks is None:
+            trucks = []
+        self.active_trucks = []
+        self.active_ranks = []
+        self.__idle_trucks = {depot: [] for depot in depots}
+        self.__number_to_open = {}
+        self.__next_rank = {}
+        rank = 0
+        for truck in trucks:
+            if truck.is_active():
+                self.__add_active_truck(truck, rank)
+            else:
+                self.__idle_trucks.setdefault(truck.start_depot, []).append((rank, truck))
+            rank += 1
+        for depot, number_of_trucks in depots.items():
+            number_used = len([truck for truck in trucks if truck.start_depot == depot])
+            self.__number_to_open[depot] = max(number_of_trucks - number_used, 0)
+            self.__next_rank[depot] = rank
+            rank += number_of_trucks
+            self.__replenish(depot)
+
+    def get_idle_trucks(self):
+        """
+        The next truck to open of every depot with capacity left, in rank order
+        :return: list of Truck
+        """
+        return [truck for rank, truck in sorted(idle_trucks[0] for idle_trucks in self.__idle_trucks.values()
+                                                if len(idle_trucks) > 0)]
+
+    def has_idle_trucks(self):
+        return any(len(idle_trucks) > 0 for idle_trucks in self.__idle_trucks.values())
+
+    def get_remaining_capacity(self, depot):
+        return len(self.__idle_trucks.get(depot, [])) + self.__number_to_open.get(depot, 0)
+
+    def activate(self, truck: Truck):
+        """
+        Move an idle truck that just got its first shipment to the active trucks
+        :return: rank of the truck
+        """
+        idle_trucks = self.__idle_trucks[truck.start_depot]
+        rank, idle_truck = idle_trucks[0]
+        if idle_truck is not truck:
+            raise ValueError('Truck is not the next idle truck of its depot')
+        del idle_trucks[0]
+        self.__add_active_truck(truck, rank)
+        self.__replenish(truck.start_depot)
+        return rank
+
+    def deactivate(self, truck: Truck):
+        """
+        Undo the activation of a truck that has no shipments left, it becomes the next idle truck of its depot again
+        """
+        i = next(i for i in range(len(self.active_trucks)) if self.active_trucks[i] is truck)
+        rank = self.active_ranks[i]
+        del self.active_trucks[i]
+        del self.active_ranks[i]
+        self.__idle_trucks.setdefault(truck.start_depot, []).insert(0, (rank, truck))
+
+    def __add_active_truck(self, truck: Truck, rank):
+        i = bisect_left(self.active_ranks, rank)
+        self.active_trucks.insert(i, truck)
+        self.active_ranks.insert(i, rank)
+
+    def __replenish(self, depot):
+        idle_trucks = self.__idle_trucks[depot]
+        if len(idle_trucks) == 0 and self.__number_to_open.get(depot, 0) > 0:
+            idle_trucks.append((self.__next_rank[depot], Truck(depot)))
+            self.__next_rank[depot] += 1
+            self.__number_to_open[depot] -= 1
@@ -9,7 +9,9 @@ from heuristics.Config import Config
 from heuristics.InputTW import InputTW
 from heuristics.Schedule import Schedule
 from heuristics.Truck import Truck
+from heuristics.DepotPools import DepotPools
 from heuristics.Shipment import Shipment, ShipmentTW
+from heuristics.TruckTiming import TruckTiming
 
 
 # ---------------------------------------------- ConcurrentScheduler Class -----------------------------------------
@@ -32,21 +34,10 @@ class DeterministicCSwithswap:
         :return: Schedule
         """
         # Initiate all trucks available
-        if self.trucks is None:
-            trucks = [Truck(depot) for depot, number_of_trucks in self.depots.items() for _ in range(number_of_trucks)]
-        else:
-            trucks = self.trucks
-            for depot in self.depots:
-                number_still_open = self.depots[depot]
-                for truck in trucks:
-                    if truck.start_depot == depot:
-                        number_still_open -= 1
-            trucks += [Truck(depot) for depot, number_still_open in self.depots.items() for _ in
-                       range(number_still_open)]
+        pools = DepotPools(self.depots, self.trucks)
 
         for shipment_tw in self.sorted_shipments_tw:
-            active_trucks = list(filter(lambda truck: truck.is_active(), trucks))
-            inactive_trucks = list(filter(lambda truck: not truck.is_active(), trucks))
+            active_trucks = pools.active_trucks
             active_trucks_with_space = list(filter(lambda truck: are_compatible_tw_truck(truck, shipment_tw) and
                                                                  duration_with_potential_shipment(truck,
                                                                                                   cheapest_compatible_shipment_truck(
@@ -60,23 +51,23 @@ class DeterministicCSwithswap:
                     the_best_truck = min(active_trucks_with_space, key=lambda truck: cost_active_truck(truck, shipment))
                     the_best_truck.add_shipment(shipment)
                     placed = True
-            if not placed and len(inactive_trucks) > 0:
+            if not placed and pools.has_idle_trucks():
                 if shipment_tw.latest_end_time < 12:
                     shipment = Shipment(start_time=shipment_tw.earliest_start_time, input_shipment=shipment_tw)
                 else:
                     shipment = Shipment(start_time=shipment_tw.latest_start_time, input_shipment=shipment_tw)
-                the_best_truck = min(inactive_trucks, key=lambda truck: cost_inactive_truck(truck, shipment))
+                the_best_truck = min(pools.get_idle_trucks(), key=lambda truck: cost_inactive_truck(truck, shipment))
                 the_best_truck.add_shipment(shipment)
+                pools.activate(the_best_truck)
                 placed = True
             if not placed:
                 print("Shipment could not be placed")
                 pass
 
-        schedule = Schedule(config=self.config, trucks=[truck for truck in trucks if truck.is_active()])
+        schedule = Schedule(config=self.config, trucks=list(pools.active_trucks))
 
         for truck in schedule.trucks:
-            shift_shipments_backward(truck)
-            shift_shipments_forward(truck)
+            TruckTiming(truck).place()
 
         return schedule
 
@@ -84,7 +75,7 @@ class DeterministicCSwithswap:
 # ----------------------------------------------- Help Functions ------------------------------------------------------
 
 def driving_time_between_shipments(left_shipment, right_shipment):
-    return c.time_diff_matrix.at[left_shipment.end_location, right_shipment.start_location]
+    return c.time_diff_table[left_shipment.end_location_index][right_shipment.start_location_index]
 
 
 def fits_before(truck: Truck, shipment: Shipment):
@@ -165,7 +156,7 @@ def cost_active_truck_after(truck: Truck, shipment: Shipment):
                c.weight_empty_driving_time * driving_time_between_shipments(last_shipment, shipment)
         if shipment.start_time > c.start_time_last_shipment + 8 or \
                 duration_with_potential_shipment(truck, shipment) > c.day_duration_last_shipment:
-            cost += c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+            cost += c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
         return cost
     else:
         return float('inf')
@@ -180,7 +171,7 @@ def cost_active_truck_before(truck: Truck, shipment: Shipment):
                c.weight_empty_driving_time * driving_time_between_shipments(shipment, first_shipment)
         if shipment.start_time < c.start_time_first_shipment - 4 or \
                 duration_with_potential_shipment(truck, shipment) > c.day_duration_last_shipment:
-            cost += c.time_diff_matrix.at[truck.start_depot, shipment.start_location]
+            cost += c.time_diff_table[truck.start_depot_index][shipment.start_location_index]
         return cost
     else:
         return float('inf')
@@ -199,11 +190,11 @@ def cost_active_truck(truck: Truck, shipment: Shipment):
 def cost_inactive_truck(truck: Truck, shipment: Shipment):
     if shipment.end_time < 12:
         cost = truck.startup_cost + c.weight_empty_driving_time * (
-            c.time_diff_matrix.at[truck.start_depot, shipment.start_location]
+            c.time_diff_table[truck.start_depot_index][shipment.start_location_index]
         )
     else:
         cost = truck.startup_cost + c.weight_empty_driving_time * (
-            c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+            c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
         )
     return cost
 
@@ -211,57 +202,31 @@ def cost_inactive_truck(truck: Truck, shipment: Shipment):
 def duration_with_potential_shipment(truck: Truck, shipment: Shipment):
     duration_with_shipment = float('inf')
     if fits_after(truck, shipment):
-        duration_with_shipment = c.time_diff_matrix.at[
-                                     truck.start_depot, truck.shipments[0].start_location] + \
+        duration_with_shipment = c.time_diff_table[
+                                     truck.start_depot_index][truck.shipments[0].start_location_index] + \
                                  (shipment.end_time - truck.shipments[0].start_time) + \
-                                 c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+                                 c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     elif fits_before(truck, shipment):
-        duration_with_shipment = c.time_diff_matrix.at[
-                                     truck.start_depot, shipment.start_location] + \
+        duration_with_shipment = c.time_diff_table[
+                                     truck.start_depot_index][shipment.start_location_index] + \
                                  (truck.shipments[-1].end_time - shipment.start_time) + \
-                                 c.time_diff_matrix.at[truck.shipments[-1].end_location, truck.start_depot]
+                                 c.time_diff_table[truck.shipments[-1].end_location_index][truck.start_depot_index]
     return duration_with_shipment
 
 
 def driving_time_with_potential_shipment(truck: Truck, shipment: Shipment):
-    driving_time_with_shipment = c.time_diff_matrix.at[
-        truck.start_depot, truck.shipments[0].start_location]
+    driving_time_with_shipment = c.time_diff_table[
+        truck.start_depot_index][truck.shipments[0].start_location_index]
     for ship in truck.shipments:
         ship_duration = ship.end_time - ship.start_time - c.loading_time
         driving_time_with_shipment += ship_duration
-    driving_time_with_shipment += c.time_diff_matrix.at[
-        truck.shipments[-1].end_location, shipment.start_location]
+    driving_time_with_shipment += c.time_diff_table[
+        truck.shipments[-1].end_location_index][shipment.start_location_index]
     driving_time_with_shipment += (shipment.end_time - shipment.start_time) - c.loading_time
-    driving_time_with_shipment += c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+    driving_time_with_shipment += c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     return driving_time_with_shipment
 
 
-def shift_shipments_forward(truck: Truck):
-    if len(truck.shipments) > 1:
-        for i in range(len(truck.shipments)):
-            left_shipment: Shipment = truck.shipments[-(i + 1)]
-            right_shipment: Shipment = truck.shipments[-i]
-            start_waiting = left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment)
-            end_waiting = right_shipment.start_time
-            if end_waiting - start_waiting > 0:
-                potential_latest_start_waiting = left_shipment.input_shipment.latest_end_time + \
-                                                 driving_time_between_shipments(left_shipment, right_shipment)
-                new_start_waiting = min(right_shipment.start_time, potential_latest_start_waiting)
-                new_start_time = new_start_waiting - driving_time_between_shipments(left_shipment,
-                                                                                    right_shipment) - left_shipment.get_length()
-                left_shipment.set_start_time(new_start_time)
-
-def shift_shipments_backward(truck: Truck):
-    if len(truck.shipments) > 1:
-        for i in range(len(truck.shipments)-1):
-            left_shipment: Shipment = truck.shipments[i]
-            right_shipment: Shipment = truck.shipments[i+1]
-            start_waiting = left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment)
-            end_waiting = right_shipment.start_time
-            if end_waiting - start_waiting > 0:
-                new_start_time = max(left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment), right_shipment.input_shipment.earliest_start_time)
-                right_shipment.set_start_time(new_start_time)
-
 # ------------------------------------------- Old help functions ------------------------------------------------
 
 
@@ -284,25 +249,25 @@ def shift_shipments_backward(truck: Truck):
 #     shipment = cheapest_compatible_shipment_truck(truck, shipment_tw)
 #     duration_with_shipment = float('inf')
 #     if fits_after(truck, shipment):
-#         duration_with_shipment = c.time_diff_matrix.at[
-#                                      truck.start_depot, truck.shipments[0].start_location] + \
+#         duration_with_shipment = c.time_diff_table[
+#                                      truck.start_depot_index][truck.shipments[0].start_location_index] + \
 #                                  (shipment.end_time - truck.shipments[0].start_time) + \
-#                                  c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+#                                  c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
 #     elif fits_before(truck, shipment):
-#         duration_with_shipment = c.time_diff_matrix.at[
-#                                      truck.start_depot, shipment.start_location] + \
+#         duration_with_shipment = c.time_diff_table[
+#                                      truck.start_depot_index][shipment.start_location_index] + \
 #                                  (truck.shipments[-1].end_time - shipment.start_time) + \
-#                                  c.time_diff_matrix.at[truck.shipments[-1].end_location, truck.start_depot]
+#                                  c.time_diff_table[truck.shipments[-1].end_location_index][truck.start_depot_index]
 #     return duration_with_shipment
 #
 #
 # def duration_with_potential_shipment_tw_after(truck: Truck, shipment_tw: ShipmentTW):
 #     if are_compatible_tw_truck(truck, shipment_tw) and fits_after_tw(truck, shipment_tw):
 #         shipment = cheapest_compatible_shipment_truck(truck, shipment_tw)
-#         duration_with_shipment = c.time_diff_matrix.at[
-#                                      truck.start_depot, truck.shipments[0].start_location] + \
+#         duration_with_shipment = c.time_diff_table[
+#                                      truck.start_depot_index][truck.shipments[0].start_location_index] + \
 #                                  (shipment.end_time - truck.shipments[0].start_time) + \
-#                                  c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+#                                  c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
 #     else:
 #         duration_with_shipment = float('inf')
 #     return duration_with_shipment
@@ -311,10 +276,10 @@ def shift_shipments_backward(truck: Truck):
 # def duration_with_potential_shipment_tw_before(truck: Truck, shipment_tw: ShipmentTW):
 #     if are_compatible_tw_truck(truck, shipment_tw) and fits_before_tw(truck, shipment_tw):
 #         shipment = cheapest_compatible_shipment_truck(truck, shipment_tw)
-#         duration_with_shipment = c.time_diff_matrix.at[
-#                                      truck.start_depot, shipment.start_location] + \
+#         duration_with_shipment = c.time_diff_table[
+#                                      truck.start_depot_index][shipment.start_location_index] + \
 #                                  (truck.shipments[-1].end_time - shipment.start_time) + \
-#                                  c.time_diff_matrix.at[truck.shipments[-1].end_location, truck.start_depot]
+#                                  c.time_diff_table[truck.shipments[-1].end_location_index][truck.start_depot_index]
 #     else:
 #         duration_with_shipment = float('inf')
 #     return duration_with_shipment
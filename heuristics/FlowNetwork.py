@@ -0,0 +1,105 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+# ---------------------------------------------- FlowNetwork Class ----------------------------------------------------
+
+class FlowNetwork:
+    """
+    An integer min cost circulation with side constraints, the model behind the multi depot ILPs: every arc has a flow
+    upper bound and a cost, flow is conserved in every node, the nodes of every group in exactly_one have a total
+    outflow of exactly one (the discretized copies of a shipment in all depots), some nodes have a maximum outflow
+    (the start nodes of the depots) and the total flow on some sets of arcs is at most a bound (max_total_flow, a list
+    of pairs of a list of arcs and a bound). The network does not depend on a solver, see FlowSolvers.
+    """
+
+    def __init__(self, flow_upper: dict, costs: dict, nodes: list, exactly_one: dict, max_outflow: dict,
+                 max_total_flow: list = None):
+        self.arcs = list(flow_upper.keys())
+        self.flow_upper = flow_upper
+        self.costs = costs
+        self.nodes = nodes
+        self.exactly_one = exactly_one
+        self.max_outflow = max_outflow
+        self.max_total_flow = max_total_flow if max_total_flow is not None else []
+
+    def get_number_of_arcs(self):
+        return len(self.arcs)
+
+    def is_pure_network(self):
+        """
+        True if every group in exactly_one is a single node, no node is in two groups and there is no max_total_flow,
+        so the side constraints are bounds on the flow through a node and the model is a plain min cost flow problem
+        :return: bool
+        """
+        grouped_nodes = [node for nodes in self.exactly_one.values() for node in nodes]
+        return all(len(nodes) == 1 for nodes in self.exactly_one.values()) and \
+            len(grouped_nodes) == len(set(grouped_nodes)) and len(self.max_total_flow) == 0
+
+    def get_objective(self, flows: dict):
+        return sum(self.costs[arc] * flow for arc, flow in flows.items())
+
+    def is_complete(self, flows: dict):
+        """
+        True if the total outflow of the nodes of every group in exactly_one is one
+        :return: bool
+        """
+        outflow = {}
+        for (from_node, _), flow in flows.items():
+            outflow[from_node] = outflow.get(from_node, 0) + flow
+        return all(sum(outflow.get(node, 0) for node in nodes) == 1 for nodes in self.exactly_one.values())
+
+    # ----- Matrices -----
+
+    def get_cost_array(self):
+        return np.array([self.costs[arc] for arc in self.arcs], dtype=float)
+
+    def get_flow_upper_array(self):
+        return np.array([self.flow_upper[arc] for arc in self.arcs], dtype=float)
+
+    def get_conservation_matrix(self):
+        """
+        One row per node, +1 for the arcs leaving the node and -1 for the arcs entering it
+        :return: sparse matrix of shape (number of nodes, number of arcs)
+        """
+        node_index = {node: index for index, node in enumerate(self.nodes)}
+        rows, columns, values = [], [], []
+        for column, (from_node, to_node) in enumerate(self.arcs):
+            if from_node in node_index:
+                rows.append(node_index[from_node])
+                columns.append(column)
+                values.append(1)
+            if to_node in node_index:
+                rows.append(node_index[to_node])
+                columns.append(column)
+                values.append(-1)
+        return csr_matrix((values, (rows, columns)), shape=(len(self.nodes), len(self.arcs)))
+
+    def get_outflow_matrix(self, groups: list):
+        """
+        One row per group of nodes, 1 for the arcs leaving a node of the group
+        :return: sparse matrix of shape (number of groups, number of arcs)
+        """
+        group_index = {}
+        for index, nodes in enumerate(groups):
+            for node in nodes:
+                group_index.setdefault(node, []).append(index)
+        rows, columns = [], []
+        for column, (from_node, _) in enumerate(self.arcs):
+            for row in group_index.get(from_node, []):
+                rows.append(row)
+                columns.append(column)
+        return csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(groups), len(self.arcs)))
+
+    def get_arc_set_matrix(self, arc_sets: list):
+        """
+        One row per set of arcs, 1 for the arcs in the set
+        :return: sparse matrix of shape (number of sets, number of arcs)
+        """
+        arc_index = {arc: index for index, arc in enumerate(self.arcs)}
+        rows, columns = [], []
+        for row, arcs in enumerate(arc_sets):
+            for arc in arcs:
+                rows.append(row)
+                columns.append(arc_index[arc])
+        return csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(arc_sets), len(self.arcs)))
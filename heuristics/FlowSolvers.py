@@ -0,0 +1,255 @@
+import time
+import networkx as nx
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+# Files
+from heuristics.FlowNetwork import FlowNetwork
+
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+except ImportError:
+    gp = None
+
+
+# ---------------------------------------------- Flow Solvers ---------------------------------------------------------
+
+# Every solver has solve(network, gap_percentage, time_limit, start), which returns the flow on the arcs with positive
+# flow as a dict, or None when no feasible solution is found. start is a dict with the flow on some arcs, for instance
+# a heuristic schedule mapped onto the network, that solvers with a MIP start use as first incumbent. The status, the
+# relative gap and the time until the first incumbent of the last solve are kept in status, gap and
+# time_to_first_incumbent, the latter is None when the solver does not report it.
+
+class GurobiSolver:
+    """
+    The integer program of the network solved by Gurobi
+    """
+
+    name = 'gurobi'
+
+    def __init__(self):
+        if gp is None:
+            raise ImportError('gurobipy is not installed')
+        self.status = None
+        self.gap = None
+        self.time_to_first_incumbent = None
+        self.model = None
+        self.flow = None
+
+    def build(self, network: FlowNetwork, gap_percentage, time_limit=None):
+        arcs, flow_upper = gp.multidict(network.flow_upper)
+
+        # Model
+        model = gp.Model('min-cost-flow')
+
+        # Decision variables
+        flow = model.addVars(arcs, obj=network.costs, vtype=GRB.INTEGER, name="flow")
+
+        # Constraints
+        # Flow upper bound for every arc: For every arc the flow is bounded by an upperbound.
+        model.addConstrs((flow[i, j] <= flow_upper[i, j] for i, j in arcs), "upper")
+
+        # Flow conservation for every node: For every node the incoming flow is exactly the same as the outgoing flow.
+        model.addConstrs((flow.sum(node, '*') == flow.sum('*', node) for node in network.nodes), "c")
+
+        # Flow requirement: exactly one of the nodes of every group is visited
+        for name, nodes in network.exactly_one.items():
+            acc = 0
+            for node in nodes:
+                acc += flow.sum(node, '*')
+            model.addConstr(acc == 1, name="exactly_one_" + name)
+
+        # Capacity cap depots: the outflow of a depot is at most its capacity
+        model.addConstrs((flow.sum(node, '*') <= capacity for node, capacity in network.max_outflow.items()),
+                         "depot_cap")
+
+        # Maximum total flow on sets of arcs
+        for i, (arcs, bound) in enumerate(network.max_total_flow):
+            model.addConstr(gp.quicksum(flow[arc] for arc in arcs) <= bound, "max_total_flow_" + str(i))
+
+        # Termination Parameters
+        model.Params.MIPGap = gap_percentage / 100
+        if time_limit is not None:
+            model.Params.timeLimit = time_limit
+        self.model = model
+        self.flow = flow
+        return model
+
+    def set_start(self, network: FlowNetwork, start: dict):
+        """
+        Set start as MIP start. A start that covers every group in exactly_one is completed with zero flow on the other
+        arcs, otherwise Gurobi completes it
+        """
+        if network.is_complete(start):
+            for arc in network.arcs:
+                self.flow[arc].Start = start.get(arc, 0)
+        else:
+            for arc, flow in start.items():
+                self.flow[arc].Start = flow
+
+    def solve(self, network: FlowNetwork, gap_percentage, time_limit=None, start=None):
+        model = self.build(network, gap_percentage, time_limit)
+        if start is not None:
+            self.set_start(network, start)
+
+        def callback(callback_model, where):
+            if where == GRB.Callback.MIPSOL and self.time_to_first_incumbent is None:
+                self.time_to_first_incumbent = callback_model.cbGet(GRB.Callback.RUNTIME)
+
+        self.time_to_first_incumbent = None
+        model.optimize(callback)
+
+        solution_flows = None
+        if model.status == GRB.OPTIMAL:
+            self.status = 'OPTIMAL'
+        elif model.status == GRB.TIME_LIMIT:
+            self.status = 'TIME LIMIT'
+        else:
+            self.status = 'NO SOLUTION'
+        if model.SolCount > 0:
+            self.gap = model.MIPGap
+            solution = model.getAttr('x', self.flow)
+            solution_flows = {arc: round(solution[arc]) for arc in network.arcs if round(solution[arc]) > 0}
+        return solution_flows
+
+
+class NetworkSimplexSolver:
+    """
+    A pure network solved exactly by the network simplex of networkx, in polynomial time and without an integer
+    program. Every node with a required outflow or a maximum outflow is split in an in and an out node, so the side
+    constraints become a demand and an arc capacity. Costs are scaled to integers because the network simplex is only
+    exact on integer weights.
+    """
+
+    name = 'network_simplex'
+    cost_scale = 1000
+
+    def __init__(self):
+        self.status = None
+        self.gap = None
+        self.time_to_first_incumbent = None
+
+    def solve(self, network: FlowNetwork, gap_percentage=0, time_limit=None, start=None):
+        tic = time.time()
+        if not network.is_pure_network():
+            raise ValueError('The network has a group of more than one node in exactly_one or a max_total_flow')
+        required_nodes = {nodes[0] for nodes in network.exactly_one.values()}
+        split_nodes = required_nodes | set(network.max_outflow.keys())
+
+        def tail(node):
+            return (node, 'out') if node in split_nodes else node
+
+        def head(node):
+            return (node, 'in') if node in split_nodes else node
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(head(node) for node in network.nodes)
+        graph.add_nodes_from(tail(node) for node in network.nodes)
+        for node in required_nodes:
+            graph.nodes[head(node)]['demand'] = 1
+            graph.nodes[tail(node)]['demand'] = -1
+        for node, capacity in network.max_outflow.items():
+            graph.add_edge(head(node), tail(node), capacity=capacity, weight=0)
+        for (from_node, to_node) in network.arcs:
+            graph.add_edge(tail(from_node), head(to_node), capacity=network.flow_upper[from_node, to_node],
+                           weight=int(round(network.costs[from_node, to_node] * self.cost_scale)))
+
+        try:
+            _, flow_dict = nx.network_simplex(graph)
+        except nx.NetworkXUnfeasible:
+            self.status = 'NO SOLUTION'
+            return None
+        self.status = 'OPTIMAL'
+        self.gap = 0
+        self.time_to_first_incumbent = time.time() - tic
+        solution_flows = {}
+        for (from_node, to_node) in network.arcs:
+            flow = flow_dict[tail(from_node)][head(to_node)]
+            if flow > 0:
+                solution_flows[from_node, to_node] = flow
+        return solution_flows
+
+
+class HighsSolver:
+    """
+    The integer program of the network solved by HiGHS through scipy.optimize.milp, with the flow upper bounds as
+    variable bounds and sparse constraint matrices. scipy.optimize.milp takes no MIP start, so start is ignored
+    """
+
+    name = 'highs'
+
+    def __init__(self):
+        self.status = None
+        self.gap = None
+        self.time_to_first_incumbent = None
+
+    def solve(self, network: FlowNetwork, gap_percentage, time_limit=None, start=None):
+        groups = list(network.exactly_one.values())
+        capacity_nodes = list(network.max_outflow.keys())
+        constraints = [
+            LinearConstraint(network.get_conservation_matrix(), 0, 0),
+            LinearConstraint(network.get_outflow_matrix(groups), 1, 1),
+            LinearConstraint(network.get_outflow_matrix([[node] for node in capacity_nodes]), -np.inf,
+                             [network.max_outflow[node] for node in capacity_nodes])
+        ]
+        if len(network.max_total_flow) > 0:
+            constraints.append(LinearConstraint(
+                network.get_arc_set_matrix([arcs for arcs, _ in network.max_total_flow]), -np.inf,
+                [bound for _, bound in network.max_total_flow]))
+        options = {'mip_rel_gap': gap_percentage / 100, 'disp': False}
+        if time_limit is not None:
+            options['time_limit'] = time_limit
+        result = milp(c=network.get_cost_array(), integrality=np.ones(network.get_number_of_arcs()),
+                      bounds=Bounds(0, network.get_flow_upper_array()), constraints=constraints, options=options)
+
+        if result.status == 0:
+            self.status = 'OPTIMAL'
+        elif result.status == 1:
+            self.status = 'TIME LIMIT'
+        else:
+            self.status = 'NO SOLUTION'
+        if result.x is None:
+            return None
+        self.gap = result.mip_gap
+        return {arc: int(round(flow)) for arc, flow in zip(network.arcs, result.x.tolist()) if round(flow) > 0}
+
+
+solvers = {solver.name: solver for solver in [GurobiSolver, NetworkSimplexSolver, HighsSolver]}
+
+
+def get_solver_names(network: FlowNetwork, solver='auto'):
+    """
+    The solvers to try in order. For 'auto' this is the network simplex for a pure network, otherwise Gurobi when it is
+    installed, with HiGHS as fallback for when the license does not allow the size of the model. A network is only pure
+    if every shipment has a single node. For MDVSPTWILP the copies of a shipment at its start times and in the layers of
+    its depots form one exactly one group, so for that model 'auto' falls back to Gurobi or HiGHS, unless it has a
+    single depot and no time window copies.
+    :return: list of solver names
+    """
+    if solver != 'auto':
+        return [solver]
+    if network.is_pure_network():
+        return [NetworkSimplexSolver.name]
+    if gp is not None:
+        return [GurobiSolver.name, HighsSolver.name]
+    return [HighsSolver.name]
+
+
+def solve_flow_network(network: FlowNetwork, gap_percentage, time_limit=None, solver='auto', start=None):
+    """
+    Solve the network with the given solver, or pick one automatically, optionally from a start
+    :return: dict with the flow on the arcs with positive flow or None, the solver that was used
+    """
+    solver_names = get_solver_names(network, solver)
+    for solver_name in solver_names:
+        flow_solver = solvers[solver_name]()
+        try:
+            solution_flows = flow_solver.solve(network, gap_percentage, time_limit, start)
+        except Exception as error:
+            if gp is not None and isinstance(error, gp.GurobiError) and solver_name != solver_names[-1]:
+                print('Gurobi failed (' + str(error) + '), trying ' + solver_names[-1])
+                continue
+            raise
+        print(flow_solver.status)
+        return solution_flows, flow_solver
@@ -50,9 +50,9 @@ class ListSearch:
         start_time = time.time()
         initial_order = sorted(self.shipments_tw, key=lambda shipment_tw: (shipment_tw.latest_start_time, shipment_tw.latest_start_time - shipment_tw.earliest_start_time))
         #initial_order = sorted(self.shipments_tw, key=lambda shipment_tw: shipment_tw.latest_start_time)
-        dcs = RandomizedtiesCS(input=self.input, config=self.config, sorted_shipments_tw=initial_order)
+        dcs = RandomizedtiesCS(input=self.input, config=self.config, sorted_shipments_tw=initial_order, checkpoints=True)
         schedule = dcs.get_solution()
-        best_schedule = schedule
+        best_schedule = schedule.snapshot()
         best_costs = best_schedule.get_total_costs()
         #print(best_costs)
         best_order = initial_order
@@ -66,15 +66,14 @@ class ListSearch:
                 old_i = best_order[r1]
                 old_i1 = best_order[r2]
                 best_order[r1], best_order[r2] = best_order[r2], best_order[r1]
-                dcs = RandomizedtiesCS(input=self.input, config=self.config,
-                                                 sorted_shipments_tw=best_order)
+                # Resumes from the checkpoint before the first position that differs from the last construction
                 schedule = dcs.get_solution()
                 new_costs = schedule.get_total_costs()
                 scores.append(new_costs)
                 if new_costs - best_costs < 0:
                     count_no_new_solution = 0
                 if new_costs - best_costs <= 0:
-                    best_schedule = schedule
+                    best_schedule = schedule.snapshot()
                     best_costs = best_schedule.get_total_costs()
                     #print(best_costs)
                 else:
@@ -0,0 +1,215 @@
+import copy
+import time
+import numpy as np
+import constants as c
+from heuristics.Shipment import Shipment
+from heuristics.TruckTiming import get_time_window
+
+
+# ---------------------------------------------- LocalSearch Class ----------------------------------------------------
+
+class LocalSearch:
+    """
+    Local search between the trucks of a schedule with three moves that all put a shipment s right after a shipment u
+    of another truck:
+    - relocate: move s behind u
+    - exchange: swap s with the shipment behind u
+    - tail exchange (2-opt*): swap the shipments from s on with the shipments behind u
+    The moves are granular: u is one of the number_of_neighbours shipments that can be followed by s at the lowest
+    costs of waiting and empty driving, over their time windows, computed once. A shipment that changes truck gets the
+    earliest start time in its time window that fits between its new neighbours, or the latest if it becomes the first
+    shipment of the truck; shipments without a time window keep their start time. The moves are evaluated on the move
+    costs of the trucks, see Truck.get_move_costs. With policy 'first' the first improving move is made, with 'best'
+    the best move for a shipment. The rounds over all shipments stop when a round makes no move.
+    """
+
+    def __init__(self, number_of_neighbours: int = 10, policy: str = 'first', max_rounds: int = None):
+        if policy not in ['first', 'best']:
+            raise ValueError('Unknown policy ' + policy)
+        self.number_of_neighbours = number_of_neighbours
+        self.policy = policy
+        self.max_rounds = max_rounds
+        self.moves = {'relocate': self.__get_relocate, 'exchange': self.__get_exchange,
+                      'tail_exchange': self.__get_tail_exchange}
+        self.number_of_moves = {}
+        self.number_of_rounds = 0
+        self.solve_time = None
+
+    def improve(self, schedule, moves: list = None):
+        """
+        Improve schedule in place with the given moves, by default all
+        :return: schedule
+        """
+        tic = time.time()
+        moves = [self.moves[move] for move in (self.moves if moves is None else moves)]
+        self.number_of_moves = {move: 0 for move in self.moves}
+        shipments = [shipment for truck in schedule.get_trucks() for shipment in truck.shipments]
+        neighbours = get_neighbours(shipments, self.number_of_neighbours)
+        self.number_of_rounds = 0
+        is_improved = True
+        while is_improved and (self.max_rounds is None or self.number_of_rounds < self.max_rounds):
+            is_improved = False
+            self.number_of_rounds += 1
+            for position, shipment in enumerate(shipments):
+                best_move = None
+                for neighbour in neighbours[position].tolist():
+                    if shipments[neighbour].truck is shipment.truck:
+                        continue
+                    for get_move in moves:
+                        move = get_move(shipment, shipments[neighbour])
+                        if move is not None and move[0] < 0 and (best_move is None or move[0] < best_move[0]):
+                            best_move = move
+                    if best_move is not None and self.policy == 'first':
+                        break
+                if best_move is not None:
+                    self.__make(schedule, best_move)
+                    is_improved = True
+        self.solve_time = time.time() - tic
+        return schedule
+
+    def __make(self, schedule, move):
+        costs, name, truck_1, tail_1, truck_2, tail_2 = move
+        # The tails are the new shipments from position on, the old shipments from there are taken off first
+        for truck, (position, tail) in [(truck_1, tail_1), (truck_2, tail_2)]:
+            while len(truck.shipments) > position:
+                truck.remove_ith_shipment(-1)
+        for truck, (position, tail) in [(truck_1, tail_1), (truck_2, tail_2)]:
+            for shipment, start_time in tail:
+                if shipment.start_time != start_time:
+                    shipment.set_start_time(start_time)
+                truck.add_shipment(shipment)
+        for truck in [truck_1, truck_2]:
+            if not truck.is_active():
+                schedule.remove_truck(truck)
+        self.number_of_moves[name] += 1
+
+    # ----- Moves -----
+    # A move is (change in costs, name, truck of s, new tail of the truck of s, truck of u, new tail of the truck of u),
+    # or None if s cannot follow u. A new tail is the position it starts at and the shipments from there with their
+    # start times.
+
+    def __get_relocate(self, shipment: Shipment, neighbour: Shipment):
+        truck_1, truck_2 = shipment.truck, neighbour.truck
+        i, j = index_of(truck_1.shipments, shipment), index_of(truck_2.shipments, neighbour)
+        next_shipment = truck_2.shipments[j + 1] if j + 1 < len(truck_2.shipments) else None
+        start_time = get_start_time(shipment, neighbour, next_shipment)
+        if start_time is None:
+            return None
+        costs = truck_1.get_removal_costs(i) + truck_2.get_insertion_costs(retimed(shipment, start_time))
+        tail_1 = (i, [(ship, ship.start_time) for ship in truck_1.shipments[i + 1:]])
+        tail_2 = (j + 1, [(shipment, start_time)] + [(ship, ship.start_time) for ship in truck_2.shipments[j + 1:]])
+        return costs, 'relocate', truck_1, tail_1, truck_2, tail_2
+
+    def __get_exchange(self, shipment: Shipment, neighbour: Shipment):
+        truck_1, truck_2 = shipment.truck, neighbour.truck
+        i, j = index_of(truck_1.shipments, shipment), index_of(truck_2.shipments, neighbour)
+        if j + 1 == len(truck_2.shipments):
+            return None
+        other_shipment = truck_2.shipments[j + 1]
+        start_time = get_start_time(shipment, neighbour, truck_2.shipments[j + 2] if j + 2 < len(truck_2.shipments)
+                                    else None)
+        other_start_time = get_start_time(other_shipment, truck_1.shipments[i - 1] if i > 0 else None,
+                                          truck_1.shipments[i + 1] if i + 1 < len(truck_1.shipments) else None)
+        if start_time is None or other_start_time is None:
+            return None
+        costs = truck_1.get_exchange_costs(i, retimed(other_shipment, other_start_time)) + \
+            truck_2.get_exchange_costs(j + 1, retimed(shipment, start_time))
+        tail_1 = (i, [(other_shipment, other_start_time)] +
+                  [(ship, ship.start_time) for ship in truck_1.shipments[i + 1:]])
+        tail_2 = (j + 1, [(shipment, start_time)] + [(ship, ship.start_time) for ship in truck_2.shipments[j + 2:]])
+        return costs, 'exchange', truck_1, tail_1, truck_2, tail_2
+
+    def __get_tail_exchange(self, shipment: Shipment, neighbour: Shipment):
+        truck_1, truck_2 = shipment.truck, neighbour.truck
+        i, j = index_of(truck_1.shipments, shipment), index_of(truck_2.shipments, neighbour)
+        shipments_1, shipments_2 = truck_1.shipments, truck_2.shipments
+        start_time = get_start_time(shipment, neighbour, shipments_1[i + 1] if i + 1 < len(shipments_1) else None)
+        if start_time is None:
+            return None
+        new_tail_2 = [(shipment, start_time)] + [(ship, ship.start_time) for ship in shipments_1[i + 1:]]
+        new_tail_1 = [(ship, ship.start_time) for ship in shipments_2[j + 1:]]
+        if len(new_tail_1) > 0:
+            other_start_time = get_start_time(shipments_2[j + 1], shipments_1[i - 1] if i > 0 else None,
+                                              shipments_2[j + 2] if j + 2 < len(shipments_2) else None)
+            if other_start_time is None:
+                return None
+            new_tail_1[0] = (shipments_2[j + 1], other_start_time)
+        costs = truck_1.get_tail_exchange_costs(i, [retimed(ship, start) for ship, start in new_tail_1]) + \
+            truck_2.get_tail_exchange_costs(j + 1, [retimed(ship, start) for ship, start in new_tail_2])
+        return costs, 'tail_exchange', truck_1, (i, new_tail_1), truck_2, (j + 1, new_tail_2)
+
+
+# ----------------------------------------------- Help Functions ------------------------------------------------------
+
+def get_neighbours(shipments: list, number_of_neighbours: int, block_size: int = 512):
+    """
+    For every shipment, the positions of the number_of_neighbours shipments that it can follow over their time windows
+    at the lowest costs: empty driving between them and the least waiting, computed in blocks of shipments
+    :return: list of arrays of positions, cheapest first
+    """
+    earliest_start, latest_start = np.array([get_time_window(shipment) for shipment in shipments], dtype=float).T \
+        if len(shipments) > 0 else (np.zeros(0), np.zeros(0))
+    length = np.array([shipment.end_time - shipment.start_time for shipment in shipments], dtype=float)
+    start_location_index = np.array([shipment.start_location_index for shipment in shipments], dtype=np.intp)
+    end_location_index = np.array([shipment.end_location_index for shipment in shipments], dtype=np.intp)
+    neighbours = []
+    for block_start in range(0, len(shipments), block_size):
+        block = np.arange(block_start, min(block_start + block_size, len(shipments)))
+        # Rows are the shipments of the block, columns the shipments they can follow
+        empty_driving_time = c.time_diff_array[end_location_index[np.newaxis, :], start_location_index[block, np.newaxis]]
+        earliest_arrival = earliest_start[np.newaxis, :] + length[np.newaxis, :] + empty_driving_time
+        latest_arrival = latest_start[np.newaxis, :] + length[np.newaxis, :] + empty_driving_time
+        costs = c.weight_empty_driving_time * empty_driving_time + \
+            c.weight_waiting_time * np.maximum(earliest_start[block, np.newaxis] - latest_arrival, 0)
+        costs[earliest_arrival > latest_start[block, np.newaxis]] = np.inf
+        costs[np.arange(len(block)), block] = np.inf
+        number = min(number_of_neighbours, len(shipments) - 1)
+        if number <= 0:
+            neighbours += [np.zeros(0, dtype=np.intp) for _ in block]
+            continue
+        candidates = np.argpartition(costs, number - 1, axis=1)[:, :number]
+        candidate_costs = np.take_along_axis(costs, candidates, axis=1)
+        order = np.argsort(candidate_costs, axis=1, kind='stable')
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_costs = np.take_along_axis(candidate_costs, order, axis=1)
+        neighbours += [row[row_costs < np.inf] for row, row_costs in zip(candidates, candidate_costs)]
+    return neighbours
+
+
+def get_start_time(shipment: Shipment, previous_shipment: Shipment, next_shipment: Shipment):
+    """
+    The start time of shipment in its time window between previous_shipment and next_shipment, which may be None: as
+    early as possible, or as late as possible if there is no previous shipment
+    :return: float, or None if it does not fit
+    """
+    earliest_start, latest_start = get_time_window(shipment)
+    length = shipment.end_time - shipment.start_time
+    if previous_shipment is not None:
+        earliest_start = max(earliest_start, previous_shipment.end_time +
+                             c.time_diff_table[previous_shipment.end_location_index][shipment.start_location_index])
+    if next_shipment is not None:
+        latest_start = min(latest_start, next_shipment.start_time - length -
+                           c.time_diff_table[shipment.end_location_index][next_shipment.start_location_index])
+    if earliest_start > latest_start + 1e-6:
+        return None
+    return round(earliest_start if previous_shipment is not None else latest_start, 3)
+
+
+def retimed(shipment: Shipment, start_time):
+    """
+    shipment, or a copy of it that is on no truck with start_time if that differs
+    :return: Shipment
+    """
+    if shipment.start_time == start_time:
+        return shipment
+    shipment = copy.copy(shipment)
+    shipment.truck = None
+    shipment.set_start_time(start_time)
+    return shipment
+
+
+def index_of(shipments, shipment):
+    for i in range(len(shipments)):
+        if shipments[i] is shipment:
+            return i
+    raise ValueError('Shipment is not on the truck')
@@ -1,11 +1,9 @@
 import csv
 import time
-import gurobipy as gp
 import matplotlib.pyplot as plt
 import networkx as nx
 import pandas as pd
 import numpy as np
-from gurobipy import GRB
 from matplotlib.lines import Line2D
 from matplotlib.patches import Patch
 from operator import itemgetter
@@ -16,13 +14,18 @@ from heuristics.Config import Config
 from heuristics.Schedule import Schedule
 from heuristics.Truck import Truck
 import constants as c
+import util
 from heuristics.InputTW import InputTW
 from heuristics.Shipment import Shipment, ShipmentTW
+from heuristics.ShipmentArcs import ShipmentArcs
+from heuristics.FlowNetwork import FlowNetwork
+from heuristics.NetworkCache import NetworkCache, get_cache_key
+from heuristics.FlowSolvers import solve_flow_network
 
 
 class MDVSPTWILP:
 
-    def __init__(self, input: InputTW, config: Config):
+    def __init__(self, input: InputTW, config: Config, solver: str = 'auto', cache: NetworkCache = None):
         self.input = input
         self.shipments_tw = input.shipments_tw
         self.depots = input.depots
@@ -30,8 +33,20 @@ class MDVSPTWILP:
         self.discretized_shipments = list(
             map(lambda shipment_tw: shipment_tw.discretize_time_windows(config), self.shipments_tw))
         self.flat_discretized_shipments = [shipment for lst in self.discretized_shipments for shipment in lst]
-
-    def get_solution(self):
+        self.solver = solver
+        self.cache = cache
+        self.is_cache_hit = False
+        self.solver_used = None
+        self.build_time = None
+        self.solve_time = None
+        self.number_start_trucks_not_mapped = None
+
+    def get_solution(self, start: Schedule = None):
+        """
+        Solve the model, optionally with the trucks of start, for instance a schedule of RandomizedSearch, as MIP start
+        :return: Schedule
+        """
+        tic = time.time()
         # Import Shipments from csv to dictionary
 
         base_shipments_data = {shipment_tw.id: {'earliest_start_time': shipment_tw.earliest_start_time,
@@ -54,6 +69,8 @@ class MDVSPTWILP:
                     'end_time': shipment.end_time,
                     'start_location': shipment.start_location,
                     'end_location': shipment.end_location,
+                    'start_location_index': shipment.start_location_index,
+                    'end_location_index': shipment.end_location_index,
                     'type': shipment.type,
                     'input_shipment': shipment.input_shipment
                 }
@@ -67,206 +84,129 @@ class MDVSPTWILP:
         # Determine startup costs: take the average cost of driving from Ermelo to the start location
         total_fixed_cost = 0
         for depot in depot_list:
-            fixed_cost = c.weight_empty_driving_time * 2 * c.time_diff_matrix.at['Ermelo', depot]
+            fixed_cost = c.weight_empty_driving_time * 2 * c.time_diff_table[c.location_index['Ermelo']][c.location_index[depot]]
             total_fixed_cost += fixed_cost
         fixed_cost_new_truck = total_fixed_cost / len(depot_list)
         fixed_cost_new_truck = constants.fixed_cost_new_truck
 
         # Construct depot nodes
-        depot_to_nodes_map = {}
-        depot_to_nodes_without_depot_map = {}
+        shipment_arcs = ShipmentArcs(self.flat_discretized_shipments)
+        depot_to_positions_map = {}
         shipments_per_depot = []
         for depot in depot_list:
-            nodes = []
-            nodes_without_depot = []
-            for ship_id, ship_data in shipments_data.items():
-                if 'IB' in ship_data['type']:
-                    nodes.append(depot + '_' + ship_id)
-                    nodes_without_depot.append(ship_id)
-                elif c.time_diff_matrix.at[ship_data['start_location'], depot] < 1:
-                    nodes.append(depot + '_' + ship_id)
-                    nodes_without_depot.append(ship_id)
-            shipments_per_depot.append(nodes)
-            depot_to_nodes_map[depot] = nodes
-            depot_to_nodes_without_depot_map[depot] = nodes_without_depot
-            nodes_no_time_windows = list({depot + "_" + ship_id[:ship_id.rfind('.')] for ship_id in nodes})
+            positions = shipment_arcs.get_depot_positions(depot)
+            depot_to_positions_map[depot] = positions
+            shipments_per_depot.append([depot + '_' + shipment_arcs.ids[position] for position in positions])
 
         depot_nodes_start = [depot + '_s' for depot in depot_list]
         depot_nodes_end = [depot + '_t' for depot in depot_list]
 
-        # Construct compatibility arcs with flow upper bound and cost
-
-        # The compatibility arcs are the arcs that connect shipment 1 to shipment 2 iff it is feasible to execute shipment 1,
-        # drive to the start location of shipment 2, and start shipment 2.
-        # Initiate the arcs and give them flow upper bound 1
-
-        arcs_dict = {}
-        for depot in depot_list:
-            for (first_ship_id, first_ship_data) in filter(
-                    lambda item: item[0] in depot_to_nodes_without_depot_map[depot],
-                    shipments_data.items()):
-                for (second_ship_id, second_ship_data) in filter(
-                        lambda item: item[0] in depot_to_nodes_without_depot_map[depot],
-                        shipments_data.items()):
-                    waiting_time = second_ship_data['start_time'] - first_ship_data['end_time'] - \
-                                   c.time_diff_matrix.at[
-                                       first_ship_data['end_location'], second_ship_data['start_location']]
-                    if 0 <= waiting_time <= c.max_waiting_time:
-                        arcs_dict[(depot + "_" + first_ship_id, depot + "_" + second_ship_id)] = 1
-
-        # Determine the cost for the compatibility arcs
-        # Determine the empty driving time between the execution of shipment 1 and shipment 2
-        def empty_driving_time(ship_1_data, ship_2_data):
-            return c.time_diff_matrix.at[ship_1_data['end_location'], ship_2_data['start_location']]
-
-        # Determine the waiting time between the execution of shipment 1 and shipment 2
-        def waiting_time(ship_1_data, ship_2_data):
-            return ship_2_data['start_time'] - ship_1_data['end_time'] - empty_driving_time(ship_1_data, ship_2_data)
-
-        def operational_cost(end_ship_id, start_ship_id):
-            end_ship_data = shipments_data[end_ship_id[end_ship_id.index('_') + 1:]]
-            start_ship_data = shipments_data[start_ship_id[start_ship_id.index('_') + 1:]]
-            operational_cost = c.weight_waiting_time * waiting_time(end_ship_data, start_ship_data) + \
-                               c.weight_empty_driving_time * empty_driving_time(end_ship_data, start_ship_data)
-            return operational_cost
-
-
-        # Assign the costs to the compatibility arcs
-        cost = {
-            arc: operational_cost(arc[0], arc[1]) for (arc, _) in arcs_dict.items()
-        }
-
-        # Construct pull out / pull in arcs with flow upper bound and cost
-        # The cost of the pull out arcs is a fixed cost for adding a new truck to the planning plus the operational costs
-
-        # pull out arcs
-        for depot in depot_list:
-            for (ship_id, ship_data) in filter(lambda item: item[0] in depot_to_nodes_without_depot_map[depot],
-                                               shipments_data.items()):
-                time_diff_from_depot = c.weight_empty_driving_time * c.time_diff_matrix.at[
-                    depot, ship_data['start_location']]
-                pull_out_arc = (depot + "_s", depot + "_" + ship_id)
-                arcs_dict[pull_out_arc] = 1
-                cost[pull_out_arc] = fixed_cost_new_truck + time_diff_from_depot
-
-        # pull in arcs
-        for depot in depot_list:
-            for (ship_id, ship_data) in filter(lambda item: item[0] in depot_to_nodes_without_depot_map[depot],
-                                               shipments_data.items()):
-                time_diff_to_depot = c.weight_empty_driving_time * c.time_diff_matrix.at[ship_data['end_location'], depot]
-                pull_in_arc = (depot + "_" + ship_id, depot + "_t")
-                arcs_dict[pull_in_arc] = 1
-                cost[pull_in_arc] = time_diff_to_depot
-
-        # Construct circulation arcs with flow upper bound and cost
-        for depot in depot_list:
-            circulation_arc = (depot + "_t", depot + "_s")
-            arcs_dict[circulation_arc] = len(self.shipments_tw)
-            cost[circulation_arc] = 0
-
-        arcs, flow_upper = gp.multidict(arcs_dict)
-
-        # -------------------------------------- Optimization model -----------------------------------------------------------
-
-        # Model
-        model = gp.Model('min-cost-flow')
-
-        # Decision variables
-        # flow = model.addVars(arcs, obj=cost, name="flow")
-        flow = model.addVars(arcs, obj=cost, vtype=GRB.INTEGER, name="flow")
-
-        # Constraints
-        # Flow upper bound for every arc: For every arc the flow is bounded by an upperbound.
-        model.addConstrs((flow[i, j] <= flow_upper[i, j] for i, j in arcs), "upper")
-
-        # Flow conservation for every node: For every node the incoming flow is exactly the same as the outgoing flow.
-        flat_nodes = [node for nodes in shipments_per_depot for node in nodes]
-        all_nodes = flat_nodes + depot_nodes_start + depot_nodes_end
-        model.addConstrs(
-            (flow.sum(node, '*') == flow.sum('*', node)
-             for node in all_nodes), "c")
-
-        # Flow requirement in every shipment node: every shipment node has an inflow of exactly one in total in all layers.
-        # Only visit one of the nodes for the same time window.
-
-        # for i in range(len(shipments_per_depot[0])):
-        #     acc = 0
-        #     nodes = []
-        #     for j in range(len(shipments_per_depot)):
-        #         key = shipments_per_depot[j][i]
-        #         time_window_nodes = base_to_windowed_map[key[(key.find('_') + 1):key.rfind('.')]]
-        #         for k in range(len(time_window_nodes)):
-        #             nodes.append(key[:(key.find('_') + 1)] + time_window_nodes[k])
-        #             acc += flow.sum(key[:(key.find('_') + 1)] + time_window_nodes[k], '*')
-        #     model.addConstr(acc == 1, "exactly_one_" + shipments_per_depot[0][i])
-        for ship_id, ship_data in base_shipments_data.items():
-            acc = 0
-            nodes = []
-            for potential_ship_id in flat_nodes:
-                if ship_id in potential_ship_id:
-                    nodes.append(potential_ship_id)
-                    acc += flow.sum(potential_ship_id, '*')
-            model.addConstr(acc == 1, name="exactly_one_" + ship_id)
-
-        # Capacity cap depots: every layer has a maximum flow equal to the maximum depot capacity.
-        for i in range(len(depot_nodes_start)):
-            model.addConstrs(
-                (flow.sum(start_node, '*') <= self.depots[start_node[:-2]]
-                 for start_node in depot_nodes_start), "depot_cap"
-            )
-
-        # Parameters
-        # Termination Parameters
-        model.Params.MIPGap = self.config.gap_percentage / 100
-        model.Params.timeLimit = c.ilp_time_limit
+        def build_network():
+            # Construct compatibility arcs with flow upper bound and cost
+
+            # The compatibility arcs are the arcs that connect shipment 1 to shipment 2 iff it is feasible to execute shipment 1,
+            # drive to the start location of shipment 2, and start shipment 2.
+            # Initiate the arcs and give them flow upper bound 1
+            # The cost of an arc is the weighted waiting time plus the weighted empty driving time between the shipments
+
+            arcs_dict = {}
+            cost = {}
+            for depot in depot_list:
+                first_positions, second_positions, costs = \
+                    shipment_arcs.get_compatibility_arcs(depot_to_positions_map[depot])
+                for first, second, arc_cost in zip(first_positions.tolist(), second_positions.tolist(), costs.tolist()):
+                    arc = (depot + "_" + shipment_arcs.ids[first], depot + "_" + shipment_arcs.ids[second])
+                    arcs_dict[arc] = 1
+                    cost[arc] = arc_cost
+
+            # Construct pull out / pull in arcs with flow upper bound and cost
+            # The cost of the pull out arcs is a fixed cost for adding a new truck to the planning plus the operational costs
+
+            # pull out arcs
+            for depot in depot_list:
+                positions = depot_to_positions_map[depot]
+                costs = shipment_arcs.get_pull_out_costs(depot, positions, fixed_cost_new_truck)
+                for position, arc_cost in zip(positions.tolist(), costs.tolist()):
+                    pull_out_arc = (depot + "_s", depot + "_" + shipment_arcs.ids[position])
+                    arcs_dict[pull_out_arc] = 1
+                    cost[pull_out_arc] = arc_cost
+
+            # pull in arcs
+            for depot in depot_list:
+                positions = depot_to_positions_map[depot]
+                costs = shipment_arcs.get_pull_in_costs(depot, positions)
+                for position, arc_cost in zip(positions.tolist(), costs.tolist()):
+                    pull_in_arc = (depot + "_" + shipment_arcs.ids[position], depot + "_t")
+                    arcs_dict[pull_in_arc] = 1
+                    cost[pull_in_arc] = arc_cost
+
+            # Construct circulation arcs with flow upper bound and cost
+            for depot in depot_list:
+                circulation_arc = (depot + "_t", depot + "_s")
+                arcs_dict[circulation_arc] = len(self.shipments_tw)
+                cost[circulation_arc] = 0
+
+            # -------------------------------------- Optimization model -----------------------------------------------------------
+
+            # Flow conservation for every node: For every node the incoming flow is exactly the same as the outgoing flow.
+            flat_nodes = [node for nodes in shipments_per_depot for node in nodes]
+            all_nodes = flat_nodes + depot_nodes_start + depot_nodes_end
+
+            # Flow requirement in every shipment node: every shipment node has an inflow of exactly one in total in all layers.
+            # Only visit one of the nodes for the same time window.
+            base_to_nodes_map = {ship_id: [] for ship_id in base_shipments_data}
+            for depot, positions in depot_to_positions_map.items():
+                for position in positions.tolist():
+                    base_to_nodes_map[self.flat_discretized_shipments[position].input_shipment.id].append(
+                        depot + '_' + shipment_arcs.ids[position])
+
+            # Capacity cap depots: every layer has a maximum flow equal to the maximum depot capacity.
+            depot_capacities = {depot + '_s': self.depots[depot] for depot in depot_list}
+
+            network = FlowNetwork(flow_upper=arcs_dict, costs=cost, nodes=all_nodes, exactly_one=base_to_nodes_map,
+                                  max_outflow=depot_capacities)
+            return network
+
+        # The network is loaded from the cache when it was built before from the same input and config
+        if self.cache is not None:
+            network, self.is_cache_hit = self.cache.get_network(
+                get_cache_key('MDVSPTWILP', self.input, self.config), build_network)
+        else:
+            network = build_network()
+
+        # MIP start: the trucks of start mapped onto the depot layers
+        start_flows = None
+        if start is not None:
+            start_flows, self.number_start_trucks_not_mapped = get_start_flows(
+                start, self.flat_discretized_shipments, depot_to_positions_map, network)
+            print('TRUCKS OF START NOT MAPPED: ', self.number_start_trucks_not_mapped)
 
         # Optimize the model
-        model.optimize()
-
-        print(model.numVars)
-        print(model.numConstrs)
-
-        # ---------------------------------------- Print the solution ----------------------------------------------------------
-
-        solution_arcs = []
-        if model.status == GRB.OPTIMAL:
-            print('OPTIMAL')
-            solution = model.getAttr('x', flow)
-            for i, j in arcs:
-                if int(solution[i, j]) > 0:
-                    #print('%s -> %s: %g' % (i, j, solution[i, j]))
-                    solution_arcs += [(i, j)]
-        elif model.status == GRB.TIME_LIMIT:
-            print('TIME LIMIT')
-            if model.SolCount > 0:
-                solution = model.getAttr('x', flow)
-                for i, j in arcs:
-                    #print('%s -> %s: %g' % (i, j, solution[i, j]))
-                    if int(solution[i, j]) > 0:
-                        #print('%s -> %s: %g' % (i, j, solution[i, j]))
-                        solution_arcs += [(i, j)]
-            else:
-                print('No feasbile solution found')
-
+        self.build_time = time.time() - tic
+        tic = time.time()
+        solution_flows, self.solver_used = solve_flow_network(network, self.config.gap_percentage,
+                                                              time_limit=c.ilp_time_limit, solver=self.solver,
+                                                              start=start_flows)
+        self.solve_time = time.time() - tic
+
+        print('SOLVER: ', self.solver_used.name)
+        print('BUILD TIME: ', self.build_time)
+        print('NETWORK FROM CACHE: ', self.is_cache_hit)
+        print('SOLVE TIME: ', self.solve_time)
+        print('TIME TO FIRST INCUMBENT: ', self.solver_used.time_to_first_incumbent)
+        print('GAP: ', self.solver_used.gap)
+
+        if solution_flows is None:
+            print('No feasbile solution found')
+            solution_flows = {}
 
         # ---------------------------------------- Visualize solution as graph ------------------------------------------------
 
-        # Directed graph generating different truck trips from cycles in the graph
-        g = nx.DiGraph(solution_arcs)
-
-        # Making sure that every cycle goes from 's', to the shipments, to 't'
-        cycles = []
-        for cycle in nx.simple_cycles(g):
-            number = 1
-            cycle_s_to_t = []
-            for node in cycle:
-                if node in depot_nodes_start:
-                    for i in range(len(cycle)):
-                        cycle_s_to_t.append(cycle[(cycle.index(node) + i) % len(cycle)])
-            cycles.append(cycle_s_to_t)
+        # Truck trips from 's', to the shipments, to 't' by decomposing the flow
+        cycles = util.decompose_flow(solution_flows, depot_nodes_start, depot_nodes_end)
         cycles = sorted(cycles, key=lambda cycle: (
-                shipments_data[cycle[1][(cycle[1].find('_') + 1):]]['start_time'] - c.time_diff_matrix.at[
-            cycle[0][:cycle[0].find('_')], shipments_data[cycle[1][(cycle[1].find('_') + 1):]]['start_location']]))
+                shipments_data[cycle[1][(cycle[1].find('_') + 1):]]['start_time'] - c.time_diff_table[
+            c.location_index[cycle[0][:cycle[0].find('_')]]][shipments_data[cycle[1][(cycle[1].find('_') + 1):]]['start_location_index']]))
 
         # Print the different truck trips
         number = 1
@@ -286,16 +226,53 @@ class MDVSPTWILP:
             depot = cycle[0][:cycle[0].index('_')]
             return depot
 
+        shipments_by_id = {shipment.id: shipment for shipment in self.flat_discretized_shipments}
         trucks = []
         for cycle in cycles:
             truck = Truck(start_depot=get_depot_from_cycle(cycle))
             for i in range(len(cycle) - 2):
-                for shipment_object in self.flat_discretized_shipments:
-                    if shipment_object.id == cycle[i+1][cycle[0].index('_') + 1:]:
-                        truck.add_shipment(shipment_object)
+                truck.add_shipment(shipments_by_id[cycle[i+1][cycle[0].index('_') + 1:]])
             trucks.append(truck)
 
         schedule = Schedule(config=self.config, trucks=trucks)
 
         return schedule
 # ---------------------------------------------- Help Functions ----------------------------------------------------
+
+def get_start_flows(schedule: Schedule, shipments: list, depot_to_positions_map: dict, network: FlowNetwork):
+    """
+    Map the trucks of schedule onto the depot layers of network, as a start for the solver. Every shipment of a truck
+    is snapped to the discretized shipment of its time window in the layer of the depot of the truck with the closest
+    start time that can follow the previous shipment of the truck. A truck is left out when one of its shipments has no
+    such discretized shipment.
+    :return: dict with the flow on the arcs of the mapped trucks, number of trucks that were left out
+    """
+    copies = {}
+    for depot, positions in depot_to_positions_map.items():
+        for position in positions.tolist():
+            shipment = shipments[position]
+            copies.setdefault((depot, shipment.input_shipment.id), []).append(shipment)
+
+    start_flows = {}
+    number_not_mapped = 0
+    for truck in schedule.get_trucks():
+        if not truck.is_active():
+            continue
+        depot = truck.start_depot
+        nodes = [depot + '_s']
+        for shipment in truck.shipments:
+            candidates = sorted(copies.get((depot, shipment.input_shipment.id), []),
+                                key=lambda candidate: abs(candidate.start_time - shipment.start_time))
+            node = next((depot + '_' + candidate.id for candidate in candidates
+                         if (nodes[-1], depot + '_' + candidate.id) in network.flow_upper), None)
+            if node is None:
+                break
+            nodes.append(node)
+        nodes.append(depot + '_t')
+        arcs = list(zip(nodes[:-1], nodes[1:])) + [(depot + '_t', depot + '_s')]
+        if len(nodes) != len(truck.shipments) + 2 or (nodes[-2], nodes[-1]) not in network.flow_upper:
+            number_not_mapped += 1
+            continue
+        for arc in arcs:
+            start_flows[arc] = start_flows.get(arc, 0) + 1
+    return start_flows, number_not_mapped
@@ -54,6 +54,8 @@ class MDVSPTWILP:
                     'end_time': shipment.end_time,
                     'start_location': shipment.start_location,
                     'end_location': shipment.end_location,
+                    'start_location_index': shipment.start_location_index,
+                    'end_location_index': shipment.end_location_index,
                     'type': shipment.type,
                     'input_shipment': shipment.input_shipment
                 }
@@ -67,7 +69,7 @@ class MDVSPTWILP:
         # Determine startup costs: take the average cost of driving from Ermelo to the start location
         total_fixed_cost = 0
         for depot in depot_list:
-            fixed_cost = c.weight_empty_driving_time * 2 * c.time_diff_matrix.at['Ermelo', depot]
+            fixed_cost = c.weight_empty_driving_time * 2 * c.time_diff_table[c.location_index['Ermelo']][c.location_index[depot]]
             total_fixed_cost += fixed_cost
         fixed_cost_new_truck = total_fixed_cost / len(depot_list)
         fixed_cost_new_truck = constants.fixed_cost_new_truck
@@ -81,10 +83,10 @@ class MDVSPTWILP:
             nodes_without_depot = []
             for ship_id, ship_data in shipments_data.items():
                 if 'IB' in ship_data['type']:
-                    #if c.time_diff_matrix.at[ship_data['start_location'], depot] <= 2:
+                    #if c.time_diff_table[ship_data['start_location_index']][c.location_index[depot]] <= 2:
                     nodes.append(depot + '_' + ship_id)
                     nodes_without_depot.append(ship_id)
-                elif c.time_diff_matrix.at[ship_data['start_location'], depot] <= 1:
+                elif c.time_diff_table[ship_data['start_location_index']][c.location_index[depot]] <= 1:
                     nodes.append(depot + '_' + ship_id)
                     nodes_without_depot.append(ship_id)
             shipments_per_depot.append(nodes)
@@ -110,15 +112,15 @@ class MDVSPTWILP:
                         lambda item: item[0] in depot_to_nodes_without_depot_map[depot],
                         shipments_data.items()):
                     waiting_time = second_ship_data['start_time'] - first_ship_data['end_time'] - \
-                                   c.time_diff_matrix.at[
-                                       first_ship_data['end_location'], second_ship_data['start_location']]
+                                   c.time_diff_table[
+                                       first_ship_data['end_location_index']][second_ship_data['start_location_index']]
                     if 0 <= waiting_time <= c.max_waiting_time:
                         arcs_dict[(depot + "_" + first_ship_id, depot + "_" + second_ship_id)] = 1
 
         # Determine the cost for the compatibility arcs
         # Determine the empty driving time between the execution of shipment 1 and shipment 2
         def empty_driving_time(ship_1_data, ship_2_data):
-            return c.time_diff_matrix.at[ship_1_data['end_location'], ship_2_data['start_location']]
+            return c.time_diff_table[ship_1_data['end_location_index']][ship_2_data['start_location_index']]
 
         # Determine the waiting time between the execution of shipment 1 and shipment 2
         def waiting_time(ship_1_data, ship_2_data):
@@ -142,19 +144,21 @@ class MDVSPTWILP:
 
         # pull out arcs
         for depot in depot_list:
+            depot_index = c.location_index[depot]
             for (ship_id, ship_data) in filter(lambda item: item[0] in depot_to_nodes_without_depot_map[depot],
                                                shipments_data.items()):
-                time_diff_from_depot = c.weight_empty_driving_time * c.time_diff_matrix.at[
-                    depot, ship_data['start_location']]
+                time_diff_from_depot = c.weight_empty_driving_time * c.time_diff_table[
+                    depot_index][ship_data['start_location_index']]
                 pull_out_arc = (depot + "_s", depot + "_" + ship_id)
                 arcs_dict[pull_out_arc] = 1
                 cost[pull_out_arc] = fixed_cost_new_truck + time_diff_from_depot
 
         # pull in arcs
         for depot in depot_list:
+            depot_index = c.location_index[depot]
             for (ship_id, ship_data) in filter(lambda item: item[0] in depot_to_nodes_without_depot_map[depot],
                                                shipments_data.items()):
-                time_diff_to_depot = c.weight_empty_driving_time * c.time_diff_matrix.at[ship_data['end_location'], depot]
+                time_diff_to_depot = c.weight_empty_driving_time * c.time_diff_table[ship_data['end_location_index']][depot_index]
                 pull_in_arc = (depot + "_" + ship_id, depot + "_t")
                 arcs_dict[pull_in_arc] = 1
                 cost[pull_in_arc] = time_diff_to_depot
@@ -266,8 +270,8 @@ class MDVSPTWILP:
                         cycle_s_to_t.append(cycle[(cycle.index(node) + i) % len(cycle)])
             cycles.append(cycle_s_to_t)
         cycles = sorted(cycles, key=lambda cycle: (
-                shipments_data[cycle[1][(cycle[1].find('_') + 1):]]['start_time'] - c.time_diff_matrix.at[
-            cycle[0][:cycle[0].find('_')], shipments_data[cycle[1][(cycle[1].find('_') + 1):]]['start_location']]))
+                shipments_data[cycle[1][(cycle[1].find('_') + 1):]]['start_time'] - c.time_diff_table[
+            c.location_index[cycle[0][:cycle[0].find('_')]]][shipments_data[cycle[1][(cycle[1].find('_') + 1):]]['start_location_index']]))
 
         # Print the different truck trips
         number = 1
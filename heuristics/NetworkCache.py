@@ -0,0 +1,149 @@
+import hashlib
+import os
+import numpy as np
+import constants as c
+from heuristics.Config import Config
+from heuristics.FlowNetwork import FlowNetwork
+
+# Version of the file format and of the way networks are built, part of every key so that old files are not used
+# after either changes
+cache_version = 1
+
+
+# ---------------------------------------------- NetworkCache Class ---------------------------------------------------
+
+class NetworkCache:
+    """
+    Built FlowNetworks on disk, one npz file per network named by a content hash of everything the network is built
+    from, see get_cache_key. A changed input gives another key, so a stale network is never loaded. The arcs are kept
+    as indices into one array of node names with arrays of flow upper bounds and costs, and loading a network only
+    turns these back into the dicts of FlowNetwork.
+    """
+
+    def __init__(self, directory=c.network_cache_directory):
+        self.directory = directory
+        self.number_of_hits = 0
+        self.number_of_misses = 0
+
+    def get_path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def load(self, key):
+        """
+        The network stored under key
+        :return: FlowNetwork or None if there is none
+        """
+        path = self.get_path(key)
+        if not os.path.exists(path):
+            self.number_of_misses += 1
+            return None
+        self.number_of_hits += 1
+        return load_network(path)
+
+    def save(self, key, network: FlowNetwork):
+        os.makedirs(self.directory, exist_ok=True)
+        save_network(self.get_path(key), network)
+
+    def get_network(self, key, build):
+        """
+        The network stored under key, or the network returned by build, which is then stored under key
+        :return: FlowNetwork, True if it was loaded from the cache
+        """
+        network = self.load(key)
+        if network is not None:
+            return network, True
+        network = build()
+        self.save(key, network)
+        return network, False
+
+
+# ---------------------------------------------- Help Functions ----------------------------------------------------
+
+def get_cache_key(name: str, input, config: Config, **parameters):
+    """
+    Hash of the name of the model, its parameters, the shipments and depots of input, the distance matrix, the
+    discretization of config and the constants the arcs and costs are built from. The gap of config does not change
+    the network and is left out.
+    :return: str
+    """
+    hasher = hashlib.sha256()
+
+    def update(value):
+        hasher.update(repr(value).encode())
+        hasher.update(b'\0')
+
+    update((cache_version, name, sorted(parameters.items())))
+    if hasattr(input, 'shipments_tw'):
+        for shipment_tw in input.shipments_tw:
+            update((shipment_tw.id, shipment_tw.earliest_start_time, shipment_tw.latest_start_time,
+                    shipment_tw.earliest_end_time, shipment_tw.start_location, shipment_tw.end_location,
+                    shipment_tw.type))
+    else:
+        for shipment in input.shipments:
+            update((shipment.id, shipment.start_time, shipment.end_time, shipment.start_location,
+                    shipment.end_location, shipment.type))
+    update(sorted(input.depots.items()))
+    update(c.locations)
+    hasher.update(c.time_diff_array.tobytes())
+    update((config.time_window_interval_in_minutes, config.max_number_shipment_multiplication))
+    update((c.max_waiting_time, c.max_duration, c.weight_waiting_time, c.weight_empty_driving_time,
+            c.fixed_cost_new_truck))
+    return hasher.hexdigest()
+
+
+def save_network(path, network: FlowNetwork):
+    """
+    Write network to path as npz, via a temporary file so that an interrupted write leaves no broken file behind
+    """
+    names = list(dict.fromkeys(network.nodes + [node for arc in network.arcs for node in arc] +
+                               [node for nodes in network.exactly_one.values() for node in nodes] +
+                               list(network.max_outflow.keys())))
+    name_index = {name: index for index, name in enumerate(names)}
+    arc_index = {arc: index for index, arc in enumerate(network.arcs)}
+    groups = list(network.exactly_one.items())
+    temporary_path = path[:-len('.npz')] + '.tmp.npz'
+    np.savez(
+        temporary_path,
+        names=np.array(names, dtype=str),
+        nodes=np.array([name_index[node] for node in network.nodes], dtype=np.int64),
+        from_nodes=np.array([name_index[from_node] for from_node, _ in network.arcs], dtype=np.int64),
+        to_nodes=np.array([name_index[to_node] for _, to_node in network.arcs], dtype=np.int64),
+        flow_upper=np.array([network.flow_upper[arc] for arc in network.arcs], dtype=np.int64),
+        costs=np.array([network.costs[arc] for arc in network.arcs], dtype=np.float64),
+        group_names=np.array([name for name, _ in groups], dtype=str),
+        group_sizes=np.array([len(nodes) for _, nodes in groups], dtype=np.int64),
+        group_nodes=np.array([name_index[node] for _, nodes in groups for node in nodes], dtype=np.int64),
+        max_outflow_nodes=np.array([name_index[node] for node in network.max_outflow], dtype=np.int64),
+        max_outflow=np.array(list(network.max_outflow.values()), dtype=np.int64),
+        max_total_flow_sizes=np.array([len(arcs) for arcs, _ in network.max_total_flow], dtype=np.int64),
+        max_total_flow_arcs=np.array([arc_index[arc] for arcs, _ in network.max_total_flow for arc in arcs],
+                                     dtype=np.int64),
+        max_total_flow=np.array([bound for _, bound in network.max_total_flow], dtype=np.int64))
+    os.replace(temporary_path, path)
+
+
+def load_network(path):
+    """
+    Read a network written by save_network
+    :return: FlowNetwork
+    """
+    with np.load(path, allow_pickle=False) as data:
+        names = data['names'].tolist()
+        arcs = list(zip([names[index] for index in data['from_nodes'].tolist()],
+                        [names[index] for index in data['to_nodes'].tolist()]))
+        group_ends = np.cumsum(data['group_sizes']).tolist()
+        group_nodes = [names[index] for index in data['group_nodes'].tolist()]
+        exactly_one = {name: group_nodes[end - size:end] for name, size, end in
+                       zip(data['group_names'].tolist(), data['group_sizes'].tolist(), group_ends)}
+        max_total_flow_ends = np.cumsum(data['max_total_flow_sizes']).tolist()
+        max_total_flow_arcs = [arcs[index] for index in data['max_total_flow_arcs'].tolist()]
+        max_total_flow = [(max_total_flow_arcs[end - size:end], bound) for size, end, bound in
+                          zip(data['max_total_flow_sizes'].tolist(), max_total_flow_ends,
+                              data['max_total_flow'].tolist())]
+        return FlowNetwork(flow_upper=dict(zip(arcs, data['flow_upper'].tolist())),
+                           costs=dict(zip(arcs, data['costs'].tolist())),
+                           nodes=[names[index] for index in data['nodes'].tolist()],
+                           exactly_one=exactly_one,
+                           max_outflow=dict(zip([names[index] for index in data['max_outflow_nodes'].tolist()],
+                                                data['max_outflow'].tolist())),
+                           max_total_flow=max_total_flow)
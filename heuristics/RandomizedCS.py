@@ -3,14 +3,16 @@ import constants as c
 import util
 import random
 import heapq
-import copy
 
 # Files
 from heuristics.Config import Config
 from heuristics.InputTW import InputTW
 from heuristics.Schedule import Schedule
-from heuristics.Truck import Truck
+from heuristics.Truck import Truck, snapshot_trucks
+from heuristics.DepotPools import DepotPools
 from heuristics.Shipment import Shipment, ShipmentTW
+from heuristics.ActiveTrucks import ActiveTrucks
+from heuristics.TruckTiming import shift_shipments_forward
 
 
 
@@ -22,7 +24,7 @@ class RandomizedCS:
         self.shipments_tw = input.shipments_tw
         self.depots = input.depots
         self.config = config
-        self.trucks = copy.deepcopy(input_trucks)
+        self.trucks = snapshot_trucks(input_trucks)
         if sorted_shipments_tw is not None:
             self.sorted_shipments_tw = sorted_shipments_tw
         else:
@@ -34,45 +36,37 @@ class RandomizedCS:
         :return: Schedule
         """
         # Initiate all trucks available
-        if self.trucks is None:
-            trucks = [Truck(depot) for depot, number_of_trucks in self.depots.items() for _ in range(number_of_trucks)]
-        else:
-            trucks = self.trucks
-            for depot in self.depots:
-                number_still_open = self.depots[depot]
-                for truck in trucks:
-                    if truck.start_depot == depot:
-                        number_still_open -= 1
-            trucks += [Truck(depot) for depot, number_still_open in self.depots.items() for _ in range(number_still_open)]
+        pools = DepotPools(self.depots, self.trucks)
 
         # Sort the shipments by increasing start time
         # self.sorted_shipments_tw = sorted(self.shipments_tw, key=lambda shipment_tw: shipment_tw.latest_start_time)
 
+        active_trucks = ActiveTrucks(pools.active_trucks, pools.active_ranks)
+
         # Loop over all shipments in increasing earliest start time order
         for shipment_tw in self.sorted_shipments_tw:
-            active_trucks = list(filter(lambda truck: truck.is_active(), trucks))
-            inactive_trucks = list(filter(lambda truck: not truck.is_active(), trucks))
-            active_trucks_with_space = get_active_trucks_with_space(shipment_tw, active_trucks)
+            positions, start_times, costs = active_trucks.score(shipment_tw, before=True, max_duration=c.max_duration)
             placed = False
-            if not placed and len(active_trucks_with_space) > 0:
-                number_of_trucks_with_space = len(active_trucks_with_space)
-                the_best_trucks = heapq.nsmallest(min(number_of_trucks_with_space, 3),
-                                                  active_trucks_with_space,
-                                                  key=lambda truck: cost_active_truck(truck, cheapest_compatible_shipment_truck(truck, shipment_tw)))
-                random_best_truck = the_best_trucks[min(util.random_0_or_1_or_2(), number_of_trucks_with_space - 1)] #IMPROVE
-                random_best_truck.add_shipment(cheapest_compatible_shipment_truck(random_best_truck, shipment_tw))
+            if not placed and len(positions) > 0:
+                number_of_trucks_with_space = len(positions)
+                the_best = costs.argsort(kind='stable')[:min(number_of_trucks_with_space, 3)]
+                random_best = the_best[min(util.random_0_or_1_or_2(), number_of_trucks_with_space - 1)] #IMPROVE
+                random_best_truck = active_trucks.trucks[positions[random_best]]
+                random_best_truck.add_shipment(Shipment(input_shipment=shipment_tw, start_time=float(start_times[random_best])))
+                active_trucks.update(positions[random_best])
                 # shift_shipments_forward(random_best_truck)
                 placed = True
-            if not placed and len(inactive_trucks) > 0:
+            if not placed and pools.has_idle_trucks():
                 shipment = Shipment(start_time=shipment_tw.earliest_start_time, input_shipment=shipment_tw)
-                the_best_truck = min(inactive_trucks, key=lambda truck: cost_inactive_truck(truck, shipment))
+                the_best_truck = min(pools.get_idle_trucks(), key=lambda truck: cost_inactive_truck(truck, shipment))
                 the_best_truck.add_shipment(shipment)
+                active_trucks.add_truck(the_best_truck, pools.activate(the_best_truck))
                 placed = True
             if not placed:
                 print("Shipment could not be placed")
                 pass
 
-        schedule = Schedule(config=self.config, trucks=[truck for truck in trucks if truck.is_active()])
+        schedule = Schedule(config=self.config, trucks=list(pools.active_trucks))
 
         for truck in schedule.trucks:
             shift_shipments_forward(truck)
@@ -94,7 +88,7 @@ def get_active_trucks_with_space(shipment_tw, active_trucks):
                        active_trucks))
 
 def driving_time_between_shipments(left_shipment, right_shipment):
-    return c.time_diff_matrix.at[left_shipment.end_location, right_shipment.start_location]
+    return c.time_diff_table[left_shipment.end_location_index][right_shipment.start_location_index]
 
 
 def are_compatible(ship1, ship2):
@@ -174,7 +168,7 @@ def cost_active_truck(truck: Truck, shipment: Shipment):
                c.weight_empty_driving_time * driving_time_between_shipments(last_shipment, shipment)
         if shipment.start_time > c.start_time_last_shipment + 8 or \
                 duration_with_potential_shipment(truck, shipment) > c.day_duration_last_shipment:
-            cost += c.weight_empty_driving_time * c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+            cost += c.weight_empty_driving_time * c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
         return cost
     else:
         return 1000000000
@@ -182,14 +176,10 @@ def cost_active_truck(truck: Truck, shipment: Shipment):
 def smarter_cost_active_truck(truck: Truck, shipment: Shipment):
     last_shipment = truck.shipments[-1]
     if are_compatible(last_shipment, shipment):
-        truck_copy = copy.copy(truck)
-        truck_with_shipment = truck_copy.add_shipment(shipment)
-        cost_without_shipment = truck.get_total_costs()
-        cost_with_shipment = truck_with_shipment.get_total_costs()
-        cost_increase = cost_with_shipment - cost_without_shipment
+        cost_increase = truck.get_insertion_costs(shipment)
         if shipment.start_time > c.start_time_last_shipment + 8 or \
                 duration_with_potential_shipment(truck, shipment) > c.day_duration_last_shipment:
-            cost_increase += c.weight_empty_driving_time * c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+            cost_increase += c.weight_empty_driving_time * c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
         return cost_increase
     else:
         return 1000000000
@@ -197,14 +187,14 @@ def smarter_cost_active_truck(truck: Truck, shipment: Shipment):
 
 def cost_inactive_truck(truck: Truck, shipment: Shipment):
     return truck.startup_cost + c.weight_empty_driving_time * (
-        c.time_diff_matrix.at[truck.start_depot, shipment.start_location])
+        c.time_diff_table[truck.start_depot_index][shipment.start_location_index])
 
 
 def duration_with_potential_shipment(truck: Truck, shipment: Shipment):
-    duration_with_shipment = c.time_diff_matrix.at[
-                                 truck.start_depot, truck.shipments[0].start_location] + \
+    duration_with_shipment = c.time_diff_table[
+                                 truck.start_depot_index][truck.shipments[0].start_location_index] + \
                              (shipment.end_time - truck.shipments[0].start_time) + \
-                             c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+                             c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     return duration_with_shipment
 
 
@@ -212,25 +202,25 @@ def duration_with_potential_shipment_tw(truck: Truck, shipment_tw: ShipmentTW):
     last_shipment = truck.shipments[-1]
     if are_compatible_tw(last_shipment, shipment_tw):
         shipment = cheapest_compatible_shipment(truck.shipments[-1], shipment_tw)
-        duration_with_shipment = c.time_diff_matrix.at[
-                                     truck.start_depot, truck.shipments[0].start_location] + \
+        duration_with_shipment = c.time_diff_table[
+                                     truck.start_depot_index][truck.shipments[0].start_location_index] + \
                                  (shipment.end_time - truck.shipments[0].start_time) + \
-                                 c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+                                 c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     else:
         duration_with_shipment = 10000
     return duration_with_shipment
 
 
 def driving_time_with_potential_shipment(truck: Truck, shipment: Shipment):
-    driving_time_with_shipment = c.time_diff_matrix.at[
-        truck.start_depot, truck.shipments[0].start_location]
+    driving_time_with_shipment = c.time_diff_table[
+        truck.start_depot_index][truck.shipments[0].start_location_index]
     for ship in truck.shipments:
         ship_duration = ship.end_time - ship.start_time - c.loading_time
         driving_time_with_shipment += ship_duration
-    driving_time_with_shipment += c.time_diff_matrix.at[
-        truck.shipments[-1].end_location, shipment.start_location]
+    driving_time_with_shipment += c.time_diff_table[
+        truck.shipments[-1].end_location_index][shipment.start_location_index]
     driving_time_with_shipment += (shipment.end_time - shipment.start_time) - c.loading_time
-    driving_time_with_shipment += c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+    driving_time_with_shipment += c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     return driving_time_with_shipment
 
 def shift_first_shipment(truck: Truck):
@@ -245,29 +235,3 @@ def shift_first_shipment(truck: Truck):
             new_start_waiting = min(second_shipment.start_time, potential_latest_start_waiting)
             new_start_time = new_start_waiting - driving_time_between_shipments(first_shipment, second_shipment) - first_shipment.get_length()
             first_shipment.set_start_time(new_start_time)
-
-def shift_shipments_forward(truck: Truck):
-    if len(truck.shipments) > 1:
-        last_shipment = truck.shipments[-1]
-        for i in range(len(truck.shipments)):
-            left_shipment: Shipment = truck.shipments[-(i+1)]
-            right_shipment: Shipment = truck.shipments[-i]
-            start_waiting = left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment)
-            end_waiting = right_shipment.start_time
-            if end_waiting - start_waiting > 0:
-                potential_latest_start_waiting = left_shipment.input_shipment.latest_end_time + \
-                                                 driving_time_between_shipments(left_shipment, right_shipment)
-                new_start_waiting = min(right_shipment.start_time, potential_latest_start_waiting)
-                new_start_time = new_start_waiting - driving_time_between_shipments(left_shipment, right_shipment) - left_shipment.get_length()
-                left_shipment.set_start_time(new_start_time)
-
-def shift_shipments_backward(truck: Truck):
-    if len(truck.shipments) > 1:
-        for i in range(len(truck.shipments)-1):
-            left_shipment: Shipment = truck.shipments[i]
-            right_shipment: Shipment = truck.shipments[i+1]
-            start_waiting = left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment)
-            end_waiting = right_shipment.start_time
-            if end_waiting - start_waiting > 0:
-                new_start_time = max(left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment), right_shipment.input_shipment.earliest_start_time)
-                right_shipment.set_start_time(new_start_time)
\ No newline at end of file
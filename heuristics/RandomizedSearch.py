@@ -1,9 +1,12 @@
 from heuristics.Config import Config
 from heuristics.InputTW import InputTW
-import copy
 import util
 import numpy as np
+import multiprocessing
+import os
+import random
 from heuristics.Schedule import Schedule
+from heuristics.Truck import snapshot_trucks
 from heuristics.RandomizedCS import RandomizedCS
 from heuristics.RandomizedtiesCS import RandomizedtiesCS
 from heuristics.RandomizedtiesCSnomaxduration import RandomizedtiesCSnomaxduration
@@ -15,52 +18,168 @@ class RandomizedSearch:
     def __init__(self, input: InputTW, config: Config, input_trucks=None, sorted_shipments_tw=None):
         self.input = input
         self.config = config
-        self.input_trucks = copy.deepcopy(input_trucks)
+        self.input_trucks = snapshot_trucks(input_trucks)
         self.sorted_shipments_tw = sorted_shipments_tw
 
-    def get_solution(self, number_iterations):
+    def get_construction(self, cost_bound=None):
+        """
+        One randomized construction. It runs on its own random stream, seeded from the global one, so the constructions
+        after it do not depend on whether it stopped early because of cost_bound. The timing of every truck is optimized
+        afterwards.
+        :return: Schedule, or None if its costs cannot get below cost_bound
+        """
+        solution = run_construction(RandomizedtiesCS(input=self.input, config=self.config, input_trucks=self.input_trucks,
+                                                     sorted_shipments_tw=self.sorted_shipments_tw, cost_bound=cost_bound))
+        if solution is not None:
+            solution.post_optimize_timing()
+        return solution
+
+    def get_solution(self, number_iterations, with_cost_bound=True):
         total_score = 0
-        cs = RandomizedtiesCS(input=self.input, config=self.config, input_trucks=self.input_trucks, sorted_shipments_tw=self.sorted_shipments_tw)
-        initial_solution: Schedule = cs.get_solution()
-        best_solution_1 = initial_solution
-        best_number_of_trucks = initial_solution.get_total_number_of_trucks()
-        best_solution_2 = initial_solution
-        best_solution_3 = initial_solution
-        best_score_1 = initial_solution.get_total_costs()
-        #print('NEW best score: ', best_score_1)
-        best_score_2 = best_score_1
-        best_score_3 = best_score_1
-        total_score += best_score_1
+        number_of_solutions = 1
+        initial_solution: Schedule = self.get_construction()
+        best_solutions = BestSolutions(initial_solution)
+        total_score += best_solutions.scores[0]
         for i in range(number_iterations):
             #if i % 10 == 0:
                 #print(i)
-            new_cs = RandomizedtiesCS(input=self.input, config=self.config, input_trucks=self.input_trucks, sorted_shipments_tw=self.sorted_shipments_tw)
-            solution: Schedule = new_cs.get_solution()
-            # fixed_shipments = []
-            # for truck in self.input_trucks:
-            #     for ship in truck.shipments:
-            #         fixed_shipments.append(ship)
-            # print('number of input shipments: ', len(fixed_shipments))
+            solution: Schedule = self.get_construction(best_solutions.get_cost_bound() if with_cost_bound else None)
+            if solution is None:
+                continue
             #solution.post_optimize_depots()
-            new_score = solution.get_total_costs()
-            #print(new_score)
-            number_of_trucks = solution.get_total_number_of_trucks()
-            total_score += new_score
-            if new_score < best_score_1:
-                best_solution_1 = solution
-                best_score_1 = new_score
-                best_number_of_trucks = number_of_trucks
-                #print('NEW best score: ', best_score_1)
-            elif new_score < best_score_2 and number_of_trucks == best_number_of_trucks + 1:
-                best_solution_2 = solution
-                best_score_2 = new_score
-                #print('NEW second best score: ', best_score_2)
-            elif new_score < best_score_3 and number_of_trucks == best_number_of_trucks + 2:
-                best_solution_3 = solution
-                best_score_3 = new_score
-                #print('NEW third best score: ', best_score_3)
-        average_score = total_score / (number_iterations + 1)
+            total_score += best_solutions.add(solution)
+            number_of_solutions += 1
+        average_score = total_score / number_of_solutions
         # print('average: ', average_score)
-        return best_solution_1, best_solution_2, best_solution_3
+        return tuple(best_solutions.solutions)
+
+    def get_solution_parallel(self, number_iterations, number_of_workers=None, seed=0):
+        """
+        Spread the number_iterations + 1 constructions of get_solution over a pool of processes. The instance is sent to
+        every worker once, when the pool starts, and every worker seeds its own random stream from seed, so the result
+        is the same for the same seed and number of workers. Every worker returns its best solution per number of
+        trucks, so a solution with one or two trucks more than the best of another worker is not lost, and these are
+        merged by number of trucks, in worker order.
+        :return: best solution, best solution with one truck more, best solution with two trucks more
+        """
+        if number_of_workers is None:
+            number_of_workers = os.cpu_count()
+        number_of_constructions = number_iterations + 1
+        number_of_workers = max(1, min(number_of_workers, number_of_constructions))
+        worker_seeds = [int(seed_sequence.generate_state(1)[0])
+                        for seed_sequence in np.random.SeedSequence(seed).spawn(number_of_workers)]
+        tasks = [(worker_seeds[w], number_of_constructions // number_of_workers + (w < number_of_constructions % number_of_workers))
+                 for w in range(number_of_workers)]
+        with multiprocessing.Pool(processes=number_of_workers, initializer=init_worker,
+                                  initargs=(self.input, self.config, self.input_trucks, self.sorted_shipments_tw)) as pool:
+            best_per_number_of_trucks_per_worker = pool.starmap(run_worker, tasks)
+        best_per_number_of_trucks = {}
+        for worker_best_per_number_of_trucks in best_per_number_of_trucks_per_worker:
+            for number_of_trucks, solution in worker_best_per_number_of_trucks.items():
+                add_if_better(best_per_number_of_trucks, number_of_trucks, solution)
+        return get_solutions_by_number_of_trucks(best_per_number_of_trucks)
+
+
+# ---------------------------------------------- BestSolutions Class --------------------------------------------------
+
+class BestSolutions:
+    """
+    The best solution of a randomized search, and the best solutions with one and two trucks more.
+    best_per_number_of_trucks holds the best solution of every number of trucks that was added, also of the numbers of
+    trucks that are not taken in.
+    """
+
+    def __init__(self, initial_solution: Schedule):
+        score = initial_solution.get_total_costs()
+        self.solutions = [initial_solution, initial_solution, initial_solution]
+        self.scores = [score, score, score]
+        self.number_of_trucks = initial_solution.get_total_number_of_trucks()
+        self.best_per_number_of_trucks = {self.number_of_trucks: initial_solution}
+
+    def get_cost_bound(self):
+        """
+        Solutions with these costs or more are never taken in
+        :return: float
+        """
+        return max(self.scores)
+
+    def add(self, solution: Schedule):
+        """
+        Take in solution if it is better than one of the best solutions
+        :return: total costs of solution
+        """
+        new_score = solution.get_total_costs()
+        number_of_trucks = solution.get_total_number_of_trucks()
+        add_if_better(self.best_per_number_of_trucks, number_of_trucks, solution)
+        if new_score < self.scores[0]:
+            self.solutions[0] = solution
+            self.scores[0] = new_score
+            self.number_of_trucks = number_of_trucks
+        elif new_score < self.scores[1] and number_of_trucks == self.number_of_trucks + 1:
+            self.solutions[1] = solution
+            self.scores[1] = new_score
+        elif new_score < self.scores[2] and number_of_trucks == self.number_of_trucks + 2:
+            self.solutions[2] = solution
+            self.scores[2] = new_score
+        return new_score
+
+
+# ----- Workers of get_solution_parallel -----
+
+worker_search = None
+
+
+def init_worker(input: InputTW, config: Config, input_trucks, sorted_shipments_tw):
+    global worker_search
+    worker_search = RandomizedSearch(input=input, config=config, input_trucks=input_trucks,
+                                     sorted_shipments_tw=sorted_shipments_tw)
+
+
+def run_worker(seed, number_of_constructions):
+    """
+    Run number_of_constructions constructions on the random stream of seed
+    :return: dict from number of trucks to the best solution of this worker with that number of trucks
+    """
+    random.seed(seed)
+    best_solutions = BestSolutions(worker_search.get_construction())
+    for i in range(number_of_constructions - 1):
+        solution = worker_search.get_construction(best_solutions.get_cost_bound())
+        if solution is not None:
+            best_solutions.add(solution)
+    return best_solutions.best_per_number_of_trucks
+
+
+# ----- Help Functions -----
+
+def add_if_better(best_per_number_of_trucks: dict, number_of_trucks, solution: Schedule):
+    """
+    Keep solution as the best solution with number_of_trucks if it is cheaper than the one there, or there is none
+    """
+    best = best_per_number_of_trucks.get(number_of_trucks)
+    if best is None or solution.get_total_costs() < best.get_total_costs():
+        best_per_number_of_trucks[number_of_trucks] = solution
+
+
+def get_solutions_by_number_of_trucks(best_per_number_of_trucks: dict):
+    """
+    The best solution of all, and the best solutions with one and two trucks more than it. If there is no solution with
+    that many trucks, the best solution takes its place.
+    :return: best solution, best solution with one truck more, best solution with two trucks more
+    """
+    best_solution = min(best_per_number_of_trucks.values(), key=lambda solution: solution.get_total_costs())
+    number_of_trucks = best_solution.get_total_number_of_trucks()
+    return tuple([best_solution] + [best_per_number_of_trucks.get(number_of_trucks + k, best_solution) for k in [1, 2]])
 
 
+def run_construction(cs):
+    """
+    Run the construction of a randomized concurrent scheduler on a random stream seeded from the global one, and put the
+    global stream back afterwards, so it advances by the same amount whatever the construction does
+    :return: Schedule, or None
+    """
+    construction_seed = random.getrandbits(64)
+    state = random.getstate()
+    random.seed(construction_seed)
+    solution = cs.get_solution()
+    random.setstate(state)
+    return solution
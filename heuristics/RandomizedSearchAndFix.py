@@ -1,12 +1,12 @@
 from heuristics.Config import Config
 from heuristics.InputTW import InputTW
 from heuristics.Schedule import Schedule
-import copy
 from heuristics.RandomizedCS import RandomizedCS
 from heuristics.RandomizedCSbeforeafter import RandomizedCSbeforeafter
 from heuristics.RandomizedtiesCSnomaxduration import RandomizedtiesCSnomaxduration
 from heuristics.RandomizedCSnomaxduration import RandomizedCSnomaxduration
 from heuristics.RandomizedtiesCS import RandomizedtiesCS
+from heuristics.ShipmentRegistry import ShipmentRegistry
 import constants as c
 
 
@@ -29,7 +29,9 @@ class RandomizedSearchAndFix:
         splittable_trucks = best_solution.get_splittable_trucks()
         efficient_trucks = best_solution.get_efficient_trucks()
         fixed_trucks = splittable_trucks + efficient_trucks
-        shipments_tbd = exclude_truck_shipments_from_list(fixed_trucks, self.shipments_tw)
+        registry = ShipmentRegistry(self.shipments_tw)
+        registry.fix(fixed_trucks)
+        shipments_tbd = registry.get_remaining_shipments_tw()
         # print(len(shipments_tbd))
         for i in range(number_of_iterations):
             number_of_fixed_trucks = len(fixed_trucks)
@@ -45,8 +47,8 @@ class RandomizedSearchAndFix:
                 # print([truck.id for truck in efficient_trucks])
                 # print('shipments to plan: ', len(shipments_tbd))
             fixed_trucks += splittable_trucks + efficient_trucks
-            shipments_tbd = exclude_truck_shipments_from_list(new_solution.get_splittable_trucks() + new_solution.get_efficient_trucks(),
-                                                                        shipments_tbd)
+            registry.fix(new_solution.get_splittable_trucks() + new_solution.get_efficient_trucks())
+            shipments_tbd = registry.get_remaining_shipments_tw()
             # print(new_solution.get_total_costs())
             if len(new_solution.get_splittable_trucks() + new_solution.get_efficient_trucks()) >= len(fixed_trucks):
                 if len(new_solution.get_splittable_trucks() + new_solution.get_efficient_trucks()) > number_of_fixed_trucks:
@@ -67,7 +69,9 @@ class RandomizedSearchAndFix:
                                        sorted_shipments_tw=self.shipments_tw)
         initial_solution: Schedule = cs.get_solution()
         splittable_trucks = initial_solution.get_splittable_trucks()
-        shipments_tbd = exclude_truck_shipments_from_list(splittable_trucks, self.shipments_tw)
+        registry = ShipmentRegistry(self.shipments_tw)
+        registry.fix(splittable_trucks)
+        shipments_tbd = registry.get_remaining_shipments_tw()
         # print(len(shipments_tbd))
         unfixed_ratio = len(shipments_tbd)/len(self.shipments_tw)
         for i in range(number_of_iterations):
@@ -82,7 +86,8 @@ class RandomizedSearchAndFix:
                 number_of_splittable_trucks = len(splittable_trucks)
                 # print(number_of_splittable_trucks, ' fixed trucks: ')
                 # print([truck.id for truck in splittable_trucks])
-                shipments_tbd = exclude_truck_shipments_from_list(new_splittable_trucks, shipments_tbd)
+                registry.fix(new_splittable_trucks)
+                shipments_tbd = registry.get_remaining_shipments_tw()
                 unfixed_ratio = len(shipments_tbd) / len(self.shipments_tw)
                 # print('shipments to plan: ', len(shipments_tbd))
 
@@ -94,7 +99,9 @@ class RandomizedSearchAndFix:
                                        sorted_shipments_tw=self.shipments_tw)
         initial_solution: Schedule = cs.get_solution()
         efficient_trucks = initial_solution.get_efficient_trucks()
-        shipments_tbd = exclude_truck_shipments_from_list(efficient_trucks, self.shipments_tw)
+        registry = ShipmentRegistry(self.shipments_tw)
+        registry.fix(efficient_trucks)
+        shipments_tbd = registry.get_remaining_shipments_tw()
         # print(len(shipments_tbd))
         unfixed_ratio = len(shipments_tbd) / len(self.shipments_tw)
         for i in range(number_of_iterations):
@@ -109,7 +116,8 @@ class RandomizedSearchAndFix:
                 number_of_splittable_trucks = len(efficient_trucks)
                 # print(number_of_splittable_trucks, ' fixed trucks: ')
                 # print([truck.id for truck in efficient_trucks])
-                shipments_tbd = exclude_truck_shipments_from_list(new_efficient_trucks, shipments_tbd)
+                registry.fix(new_efficient_trucks)
+                shipments_tbd = registry.get_remaining_shipments_tw()
                 unfixed_ratio = len(shipments_tbd) / len(self.shipments_tw)
                 # print('shipments to plan: ', len(shipments_tbd))
 
@@ -123,7 +131,9 @@ class RandomizedSearchAndFix:
         splittable_trucks = list(initial_solution.get_splittable_trucks())
         efficient_trucks = list(initial_solution.get_efficient_trucks())
         fixed_trucks = splittable_trucks + efficient_trucks
-        shipments_tbd = exclude_truck_shipments_from_list(fixed_trucks, self.shipments_tw)
+        registry = ShipmentRegistry(self.shipments_tw)
+        registry.fix(fixed_trucks)
+        shipments_tbd = registry.get_remaining_shipments_tw()
         # print(len(shipments_tbd))
         unfixed_ratio = len(shipments_tbd) / len(self.shipments_tw)
         for i in range(number_of_iterations):
@@ -143,27 +153,13 @@ class RandomizedSearchAndFix:
                 fixed_trucks += new_fixed_trucks
                 number_of_fixed_trucks = len(fixed_trucks)
                 # print(number_of_fixed_trucks, ' fixed trucks: ')
-                shipments_tbd = exclude_truck_shipments_from_list(new_fixed_trucks, shipments_tbd)
+                registry.fix(new_fixed_trucks)
+                shipments_tbd = registry.get_remaining_shipments_tw()
                 unfixed_ratio = len(shipments_tbd) / len(self.shipments_tw)
                 # print('shipments to plan: ', len(shipments_tbd), '\n')
 
         return fixed_trucks
 
 
-def exclude_truck_shipments_from_list(trucks, shipments):
-    return copy.deepcopy(list(filter(
-        lambda shipment_tw: shipment_tw.id not in flatten(list(
-            map(lambda truck: list(map(lambda shipment: shipment.id, truck.shipments)),
-                trucks))),
-        shipments)))
-
-
-def flatten(list_of_lists):
-    if len(list_of_lists) == 0:
-        return list_of_lists
-    if isinstance(list_of_lists[0], list):
-        return flatten(list_of_lists[0]) + flatten(list_of_lists[1:])
-    return list_of_lists[:1] + flatten(list_of_lists[1:])
-
 def get_shipments_from_trucks(trucks):
-    return list(flatten(list(map(lambda truck: list(map(lambda shipment: shipment.id, truck.shipments)), trucks))))
+    return [shipment.id for truck in trucks for shipment in truck.shipments]
@@ -11,6 +11,7 @@ from heuristics.RandomizedtiesCS import RandomizedtiesCS
 from heuristics.RandomizedSearch import RandomizedSearch
 from heuristics.RandomizedtiesCSnomaxduration import RandomizedtiesCSnomaxduration
 from heuristics.RandomizedCSnomaxduration import RandomizedCSnomaxduration
+from heuristics.ShipmentRegistry import ShipmentRegistry
 
 
 class RandomizedSearchAndFixContinuous:
@@ -32,7 +33,9 @@ class RandomizedSearchAndFixContinuous:
         splittable_trucks = best_solution.get_splittable_trucks()
         efficient_trucks = best_solution.get_efficient_trucks()
         fixed_trucks = splittable_trucks + efficient_trucks
-        shipments_tbd = exclude_truck_shipments_from_list(fixed_trucks, self.shipments_tw)
+        registry = ShipmentRegistry(self.shipments_tw)
+        registry.fix(fixed_trucks)
+        shipments_tbd = registry.get_remaining_shipments_tw()
         print(len(shipments_tbd))
         for i in range(number_of_iterations):
             number_of_fixed_trucks = len(fixed_trucks)
@@ -48,8 +51,8 @@ class RandomizedSearchAndFixContinuous:
                 print([truck.id for truck in efficient_trucks])
                 print('shipments to plan: ', len(shipments_tbd))
             fixed_trucks += splittable_trucks + efficient_trucks
-            shipments_tbd = exclude_truck_shipments_from_list(new_solution.get_splittable_trucks() + new_solution.get_efficient_trucks(),
-                                                                        shipments_tbd)
+            registry.fix(new_solution.get_splittable_trucks() + new_solution.get_efficient_trucks())
+            shipments_tbd = registry.get_remaining_shipments_tw()
             print(new_solution.get_total_costs())
             if len(new_solution.get_splittable_trucks() + new_solution.get_efficient_trucks()) >= len(fixed_trucks):
                 if len(new_solution.get_splittable_trucks() + new_solution.get_efficient_trucks()) > number_of_fixed_trucks:
@@ -69,7 +72,9 @@ class RandomizedSearchAndFixContinuous:
                                        sorted_shipments_tw=self.shipments_tw)
         initial_solution: Schedule = cs.get_solution()
         splittable_trucks = initial_solution.get_splittable_trucks()
-        shipments_tbd = exclude_truck_shipments_from_list(splittable_trucks, self.shipments_tw)
+        registry = ShipmentRegistry(self.shipments_tw)
+        registry.fix(splittable_trucks)
+        shipments_tbd = registry.get_remaining_shipments_tw()
         print(len(shipments_tbd))
         for i in range(number_of_iterations):
             new_cs = RandomizedCSnomaxduration(input=self.input, config=self.config, input_trucks=None,
@@ -81,14 +86,16 @@ class RandomizedSearchAndFixContinuous:
                 number_of_splittable_trucks = len(splittable_trucks)
                 print(number_of_splittable_trucks, ' fixed trucks: ')
                 print([truck.id for truck in splittable_trucks])
-                shipments_tbd = exclude_truck_shipments_from_list(new_splittable_trucks, shipments_tbd)
+                registry.fix(new_splittable_trucks)
+                shipments_tbd = registry.get_remaining_shipments_tw()
                 print('shipments to plan: ', len(shipments_tbd))
 
         return splittable_trucks
 
     def get_solution(self, max_number_of_iterations):
         self.shipments_tw = sorted(self.shipments_tw, key=lambda shipment_tw: (shipment_tw.latest_start_time, shipment_tw.latest_start_time - shipment_tw.earliest_start_time))
-        shipments_tbd = self.shipments_tw
+        registry = ShipmentRegistry(self.shipments_tw)
+        shipments_tbd = registry.get_remaining_shipments_tw()
         print(len(shipments_tbd))
         trucks = []
         i = 0
@@ -110,28 +117,14 @@ class RandomizedSearchAndFixContinuous:
                 print('for truck cost ', truck.get_total_costs(), ' we have prob: ', accept_probability, 'is accepted: ', accept)
             if len(new_trucks) > 0:
                 trucks += new_trucks
-                shipments_tbd = exclude_truck_shipments_from_list(new_trucks, shipments_tbd)
+                registry.fix(new_trucks)
+                shipments_tbd = registry.get_remaining_shipments_tw()
                 print('shipments to plan: ', len(shipments_tbd))
             i += 1
 
         return trucks
 
 
-def exclude_truck_shipments_from_list(trucks, shipments):
-    return list(filter(
-        lambda shipment_tw: shipment_tw.id not in flatten(list(
-            map(lambda truck: list(map(lambda shipment: shipment.id, truck.shipments)),
-                trucks))),
-        shipments))
-
-
-def flatten(list_of_lists):
-    if len(list_of_lists) == 0:
-        return list_of_lists
-    if isinstance(list_of_lists[0], list):
-        return flatten(list_of_lists[0]) + flatten(list_of_lists[1:])
-    return list_of_lists[:1] + flatten(list_of_lists[1:])
-
 def accept_probability_generator(iteration, cost_truck):
     if cost_truck == c.fixed_cost_new_truck:
         probability = 1
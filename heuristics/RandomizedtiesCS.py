@@ -3,14 +3,18 @@ import constants as c
 import util
 import random
 import heapq
-import copy
+from bisect import bisect_left
+import numpy as np
 
 # Files
 from heuristics.Config import Config
 from heuristics.InputTW import InputTW
 from heuristics.Schedule import Schedule
-from heuristics.Truck import Truck
+from heuristics.Truck import Truck, snapshot_trucks
+from heuristics.DepotPools import DepotPools
 from heuristics.Shipment import Shipment, ShipmentTW
+from heuristics.ActiveTrucks import ActiveTrucks
+from heuristics.TruckTiming import TruckTiming
 
 c.max_waiting_time = 100
 
@@ -18,85 +22,180 @@ c.max_waiting_time = 100
 
 class RandomizedtiesCS:
 
-    def __init__(self, input: InputTW, config: Config, input_trucks=None, sorted_shipments_tw=None):
+    def __init__(self, input: InputTW, config: Config, input_trucks=None, sorted_shipments_tw=None, cost_bound=None,
+                 checkpoints=False):
         self.shipments_tw = input.shipments_tw
         self.depots = input.depots
         self.config = config
-        self.trucks = copy.deepcopy(input_trucks)
+        self.trucks = snapshot_trucks(input_trucks)
         if sorted_shipments_tw is None:
             self.sorted_shipments_tw = sorted(self.shipments_tw, key=lambda shipment_tw: (shipment_tw.latest_start_time, shipment_tw.latest_start_time - shipment_tw.earliest_start_time))
         else:
             self.sorted_shipments_tw = sorted_shipments_tw
+        self.cost_bound = cost_bound
+        self.checkpoints = checkpoints
+        self.__pools = None
+        self.__active_trucks = None
+        self.__placed_shipments_tw = []
+        self.__undo_log = []
+        self.__post_processing_log = []
+        self.placed_trucks = []
+        self.unplaced_shipments_tw = []
 
     def get_solution(self):
         """
-        Solve and return
-        :return: Schedule
+        Solve and return. With a cost bound the construction stops as soon as the fixed costs of the trucks it has opened,
+        or of the trucks the shipments need at least, reach the bound. Waiting and empty driving are left out of this
+        lower bound since shifting the shipments and improving the depots afterwards can lower them.
+        With checkpoints the state after every placed shipment can be restored from an undo log. Calling get_solution
+        again after changing sorted_shipments_tw then undoes the placements from the first shipment whose position
+        changed and resumes from there. The schedule then holds the trucks of the construction itself, whose shifted
+        shipments and depots are put back at the next call, so take a snapshot of it to keep it.
+        Only the trucks that got a shipment are shifted and moved to another depot afterwards, the input trucks without
+        a new shipment are left as they are. Those trucks are placed_trucks afterwards, and the shipments for which
+        there was no truck left are unplaced_shipments_tw.
+        :return: Schedule, or None if its costs cannot get below the cost bound
         """
         # Initiate all trucks available
-        if self.trucks is None:
-            trucks = [Truck(depot) for depot, number_of_trucks in self.depots.items() for _ in range(number_of_trucks)]
+        if not self.checkpoints or self.__pools is None:
+            self.__pools = DepotPools(self.depots, self.trucks)
+            self.__active_trucks = ActiveTrucks(self.__pools.active_trucks, self.__pools.active_ranks)
+            self.__placed_shipments_tw = []
+            self.__undo_log = []
         else:
-            #trucks = [truck for truck in self.trucks]
-            trucks = self.trucks
-            for depot in self.depots:
-                number_still_open = self.depots[depot]
-                for truck in trucks:
-                    if truck.start_depot == depot:
-                        number_still_open -= 1
-            trucks += [Truck(depot) for depot, number_still_open in self.depots.items() for _ in range(number_still_open)]
+            self.__undo_post_processing()
+            self.__roll_back_to(self.__get_first_changed_position())
+        pools = self.__pools
+        active_trucks = self.__active_trucks
+        if self.cost_bound is not None:
+            max_number_of_trucks = len(pools.active_trucks) + sum(pools.get_remaining_capacity(depot) for depot in self.depots)
+            min_number_of_trucks = min(util.get_min_number_of_trucks(self.sorted_shipments_tw), max_number_of_trucks)
+            if c.fixed_cost_new_truck * max(len(pools.active_trucks), min_number_of_trucks) >= self.cost_bound:
+                return None
 
         # Sort the shipments by increasing start time
         # self.sorted_shipments_tw = sorted(self.shipments_tw, key=lambda shipment_tw: shipment_tw.latest_start_time)
         counter = 0
+        placed_trucks = set()
+        unplaced_shipments_tw = []
+
         # Loop over all shipments in increasing earliest start time order
-        for shipment_tw in self.sorted_shipments_tw:
-            active_trucks = list(filter(lambda truck: truck.is_active(), trucks))
-            inactive_trucks = list(filter(lambda truck: not truck.is_active(), trucks))
-            active_trucks_with_space = get_active_trucks_with_space(shipment_tw, active_trucks)
+        for shipment_tw in self.sorted_shipments_tw[len(self.__placed_shipments_tw):]:
+            positions, start_times, costs = active_trucks.score(shipment_tw)
             placed = False
-            if not placed and len(active_trucks_with_space) > 0:
-                the_best_truck = min(active_trucks_with_space,
-                                                  key=lambda truck: cost_active_truck(truck, cheapest_compatible_shipment_truck(truck, shipment_tw)))
-                cost_of_best_truck = cost_active_truck(the_best_truck, cheapest_compatible_shipment_truck(the_best_truck, shipment_tw))
-                trucks_with_equal_costs = list(filter(lambda truck: cost_active_truck(truck, cheapest_compatible_shipment_truck(truck, shipment_tw)) == cost_of_best_truck, active_trucks_with_space))
-                truck_with_minimum_distance = min(trucks_with_equal_costs, key=lambda truck: c.time_diff_matrix.at[truck.start_depot, shipment_tw.end_location])
-                minimum_distance = c.time_diff_matrix.at[truck_with_minimum_distance.start_depot, shipment_tw.end_location]
-                trucks_with_equal_costs_and_equal_distance = list(filter(lambda truck: c.time_diff_matrix.at[truck.start_depot, shipment_tw.end_location] == minimum_distance, trucks_with_equal_costs))
-                number_of_ties = len(trucks_with_equal_costs_and_equal_distance)
+            undo = None
+            if not placed and len(positions) > 0:
+                with_equal_costs = np.flatnonzero(costs == costs.min())
+                distances = c.time_diff_array[active_trucks.depot_index[positions[with_equal_costs]], shipment_tw.end_location_index]
+                with_equal_costs_and_equal_distance = with_equal_costs[distances == distances.min()]
+                number_of_ties = len(with_equal_costs_and_equal_distance)
                 # if number_of_ties > 1:
                 #     counter += 1
-                random_best_truck = trucks_with_equal_costs_and_equal_distance[random.randint(0, number_of_ties-1)]
-                random_best_truck.add_shipment(cheapest_compatible_shipment_truck(random_best_truck, shipment_tw))
+                random_best = with_equal_costs_and_equal_distance[random.randint(0, number_of_ties-1)]
+                random_best_truck = active_trucks.trucks[positions[random_best]]
+                shipment = Shipment(input_shipment=shipment_tw, start_time=float(start_times[random_best]))
+                random_best_truck.add_shipment(shipment)
+                active_trucks.update(positions[random_best])
+                undo = (random_best_truck, index_of(random_best_truck.shipments, shipment), active_trucks.ranks[positions[random_best]], False)
                 # shift_shipments_forward(random_best_truck)
                 placed = True
-            if not placed and len(inactive_trucks) > 0:
+            if not placed and pools.has_idle_trucks():
                 shipment = Shipment(start_time=shipment_tw.earliest_start_time, input_shipment=shipment_tw)
-                the_best_truck = min(inactive_trucks, key=lambda truck: cost_inactive_truck(truck, shipment))
+                the_best_truck = min(pools.get_idle_trucks(), key=lambda truck: cost_inactive_truck(truck, shipment))
                 the_best_truck.add_shipment(shipment)
+                rank = pools.activate(the_best_truck)
+                active_trucks.add_truck(the_best_truck, rank)
+                undo = (the_best_truck, 0, rank, True)
                 placed = True
             if not placed:
                 print("Shipment could not be placed")
-                pass
+                unplaced_shipments_tw.append(shipment_tw)
+            else:
+                placed_trucks.add(undo[0])
+            if self.checkpoints:
+                self.__placed_shipments_tw.append(shipment_tw)
+                self.__undo_log.append(undo)
+            if undo is not None and undo[3] and self.cost_bound is not None and \
+                    c.fixed_cost_new_truck * max(len(pools.active_trucks), min_number_of_trucks) >= self.cost_bound:
+                return None
 
             # not_finished_schedule = Schedule(config=self.config, trucks=[truck for truck in trucks if truck.is_active()])
             # not_finished_schedule.metrics()
             # not_finished_schedule.visualize()
-        schedule = Schedule(config=self.config, trucks=[truck for truck in trucks if truck.is_active()])
-
-
-        for truck in schedule.trucks:
+        schedule = Schedule(config=self.config, trucks=list(pools.active_trucks))
+        if self.checkpoints:
+            # The placements before the resumed position are in the undo log only
+            placed_trucks = {undo[0] for undo in self.__undo_log if undo is not None}
+            unplaced_shipments_tw = [shipment_tw for shipment_tw, undo in zip(self.__placed_shipments_tw, self.__undo_log)
+                                     if undo is None]
+        self.placed_trucks = [truck for truck in schedule.trucks if truck in placed_trucks]
+        self.unplaced_shipments_tw = unplaced_shipments_tw
+        if self.checkpoints:
+            self.__post_processing_log = [(truck, [shipment.start_time for shipment in truck.shipments], truck.start_depot)
+                                          for truck in self.placed_trucks]
+
+        for truck in self.placed_trucks:
             if not truck.is_splittable():
-                shift_shipments_forward(truck)
-                shift_shipments_backward(truck)
+                TruckTiming(truck).place()
         # print(counter)
-        schedule.post_improve_depots()
+        # The input trucks were fixed before the construction and keep their depot
+        schedule.post_optimize_depots(self.depots, self.trucks or ())
 
         return schedule
 
+    def __undo_post_processing(self):
+        """
+        Put back the start times and depots of the trucks from before the shipments were shifted and the depots improved
+        """
+        for truck, start_times, depot in self.__post_processing_log:
+            if truck.start_depot != depot:
+                truck.change_depot_to(depot)
+            truck.set_start_times(start_times)
+        self.__post_processing_log = []
+
+    def __get_first_changed_position(self):
+        position = 0
+        for placed_shipment_tw, shipment_tw in zip(self.__placed_shipments_tw, self.sorted_shipments_tw):
+            if placed_shipment_tw is not shipment_tw:
+                break
+            position += 1
+        return position
+
+    def __roll_back_to(self, position):
+        """
+        Undo the placements of the shipments from position on, last placement first. The state of the active trucks is
+        refreshed once per truck at the end.
+        """
+        changed_ranks = set()
+        while len(self.__undo_log) > position:
+            undo = self.__undo_log.pop()
+            self.__placed_shipments_tw.pop()
+            if undo is None:
+                continue
+            truck, shipment_index, rank, activated = undo
+            truck.remove_ith_shipment(shipment_index)
+            if activated:
+                self.__active_trucks.remove_truck(bisect_left(self.__active_trucks.ranks, rank))
+                self.__pools.deactivate(truck)
+                changed_ranks.discard(rank)
+            else:
+                changed_ranks.add(rank)
+        self.__update_active_trucks(changed_ranks)
+
+    def __update_active_trucks(self, ranks):
+        for rank in ranks:
+            self.__active_trucks.update(bisect_left(self.__active_trucks.ranks, rank))
+
 
 # ----------------------------------------------- Help Functions ------------------------------------------------------
 
+def index_of(shipments, shipment):
+    for i in range(len(shipments) - 1, -1, -1):
+        if shipments[i] is shipment:
+            return i
+    raise ValueError('Shipment is not on the truck')
+
+
 
 # def get_active_trucks_with_space(shipment_tw, active_trucks):
 #     return list(filter(lambda truck: are_compatible_tw_truck(truck, shipment_tw) and
@@ -112,7 +211,7 @@ def get_active_trucks_with_space(shipment_tw, active_trucks):
                        active_trucks))
 
 def driving_time_between_shipments(left_shipment, right_shipment):
-    return c.time_diff_matrix.at[left_shipment.end_location, right_shipment.start_location]
+    return c.time_diff_table[left_shipment.end_location_index][right_shipment.start_location_index]
 
 
 def are_compatible(ship1, ship2):
@@ -192,7 +291,7 @@ def cost_active_truck(truck: Truck, shipment: Shipment):
                c.weight_empty_driving_time * driving_time_between_shipments(last_shipment, shipment)
         if shipment.start_time > c.start_time_last_shipment + 8 or \
                 duration_with_potential_shipment(truck, shipment) > c.day_duration_last_shipment:
-            cost += c.weight_empty_driving_time * c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+            cost += c.weight_empty_driving_time * c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
         return cost
     else:
         return 1000000000
@@ -200,14 +299,10 @@ def cost_active_truck(truck: Truck, shipment: Shipment):
 def smarter_cost_active_truck(truck: Truck, shipment: Shipment):
     last_shipment = truck.shipments[-1]
     if are_compatible(last_shipment, shipment):
-        truck_copy = copy.copy(truck)
-        truck_with_shipment = truck_copy.add_shipment(shipment)
-        cost_without_shipment = truck.get_total_costs()
-        cost_with_shipment = truck_with_shipment.get_total_costs()
-        cost_increase = cost_with_shipment - cost_without_shipment
+        cost_increase = truck.get_insertion_costs(shipment)
         if shipment.start_time > c.start_time_last_shipment + 8 or \
                 duration_with_potential_shipment(truck, shipment) > c.day_duration_last_shipment:
-            cost_increase += c.weight_empty_driving_time * c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+            cost_increase += c.weight_empty_driving_time * c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
         return cost_increase
     else:
         return 1000000000
@@ -215,14 +310,14 @@ def smarter_cost_active_truck(truck: Truck, shipment: Shipment):
 
 def cost_inactive_truck(truck: Truck, shipment: Shipment):
     return truck.startup_cost + c.weight_empty_driving_time * (
-        c.time_diff_matrix.at[truck.start_depot, shipment.start_location])
+        c.time_diff_table[truck.start_depot_index][shipment.start_location_index])
 
 
 def duration_with_potential_shipment(truck: Truck, shipment: Shipment):
-    duration_with_shipment = c.time_diff_matrix.at[
-                                 truck.start_depot, truck.shipments[0].start_location] + \
+    duration_with_shipment = c.time_diff_table[
+                                 truck.start_depot_index][truck.shipments[0].start_location_index] + \
                              (shipment.end_time - truck.shipments[0].start_time) + \
-                             c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+                             c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     return duration_with_shipment
 
 
@@ -230,25 +325,25 @@ def duration_with_potential_shipment_tw(truck: Truck, shipment_tw: ShipmentTW):
     last_shipment = truck.shipments[-1]
     if are_compatible_tw(last_shipment, shipment_tw):
         shipment = cheapest_compatible_shipment(truck.shipments[-1], shipment_tw)
-        duration_with_shipment = c.time_diff_matrix.at[
-                                     truck.start_depot, truck.shipments[0].start_location] + \
+        duration_with_shipment = c.time_diff_table[
+                                     truck.start_depot_index][truck.shipments[0].start_location_index] + \
                                  (shipment.end_time - truck.shipments[0].start_time) + \
-                                 c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+                                 c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     else:
         duration_with_shipment = 10000
     return duration_with_shipment
 
 
 def driving_time_with_potential_shipment(truck: Truck, shipment: Shipment):
-    driving_time_with_shipment = c.time_diff_matrix.at[
-        truck.start_depot, truck.shipments[0].start_location]
+    driving_time_with_shipment = c.time_diff_table[
+        truck.start_depot_index][truck.shipments[0].start_location_index]
     for ship in truck.shipments:
         ship_duration = ship.end_time - ship.start_time - c.loading_time
         driving_time_with_shipment += ship_duration
-    driving_time_with_shipment += c.time_diff_matrix.at[
-        truck.shipments[-1].end_location, shipment.start_location]
+    driving_time_with_shipment += c.time_diff_table[
+        truck.shipments[-1].end_location_index][shipment.start_location_index]
     driving_time_with_shipment += (shipment.end_time - shipment.start_time) - c.loading_time
-    driving_time_with_shipment += c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+    driving_time_with_shipment += c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     return driving_time_with_shipment
 
 def shift_first_shipment(truck: Truck):
@@ -263,29 +358,3 @@ def shift_first_shipment(truck: Truck):
             new_start_waiting = min(second_shipment.start_time, potential_latest_start_waiting)
             new_start_time = new_start_waiting - driving_time_between_shipments(first_shipment, second_shipment) - first_shipment.get_length()
             first_shipment.set_start_time(new_start_time)
-
-def shift_shipments_forward(truck: Truck):
-    if len(truck.shipments) > 1:
-        last_shipment = truck.shipments[-1]
-        for i in range(len(truck.shipments)):
-            left_shipment: Shipment = truck.shipments[-(i+1)]
-            right_shipment: Shipment = truck.shipments[-i]
-            start_waiting = left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment)
-            end_waiting = right_shipment.start_time
-            if end_waiting - start_waiting > 0:
-                potential_latest_start_waiting = left_shipment.input_shipment.latest_end_time + \
-                                                 driving_time_between_shipments(left_shipment, right_shipment)
-                new_start_waiting = min(right_shipment.start_time, potential_latest_start_waiting)
-                new_start_time = new_start_waiting - driving_time_between_shipments(left_shipment, right_shipment) - left_shipment.get_length()
-                left_shipment.set_start_time(new_start_time)
-
-def shift_shipments_backward(truck: Truck):
-    if len(truck.shipments) > 1:
-        for i in range(len(truck.shipments)-1):
-            left_shipment: Shipment = truck.shipments[i]
-            right_shipment: Shipment = truck.shipments[i+1]
-            start_waiting = left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment)
-            end_waiting = right_shipment.start_time
-            if end_waiting - start_waiting > 0:
-                new_start_time = max(left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment), right_shipment.input_shipment.earliest_start_time)
-                right_shipment.set_start_time(new_start_time)
\ No newline at end of file
@@ -3,14 +3,15 @@ import constants as c
 import util
 import random
 import heapq
-import copy
 
 # Files
 from heuristics.Config import Config
 from heuristics.InputTW import InputTW
 from heuristics.Schedule import Schedule
-from heuristics.Truck import Truck
+from heuristics.Truck import Truck, snapshot_trucks
+from heuristics.DepotPools import DepotPools
 from heuristics.Shipment import Shipment, ShipmentTW
+from heuristics.TruckTiming import TruckTiming
 
 
 c.max_waiting_time = 100
@@ -18,41 +19,38 @@ c.max_waiting_time = 100
 
 class RandomizedtiesCSbeforeafter:
 
-    def __init__(self, input: InputTW, config: Config, input_trucks=None, sorted_shipments_tw=None):
+    def __init__(self, input: InputTW, config: Config, input_trucks=None, sorted_shipments_tw=None, cost_bound=None):
         self.shipments_tw = input.shipments_tw
         self.depots = input.depots
         self.config = config
-        self.trucks = copy.deepcopy(input_trucks)
+        self.trucks = snapshot_trucks(input_trucks)
         if sorted_shipments_tw is None:
             self.sorted_shipments_tw = sorted(self.shipments_tw, key=lambda shipment_tw: (shipment_tw.latest_start_time, shipment_tw.latest_start_time - shipment_tw.earliest_start_time))
         else:
             self.sorted_shipments_tw = sorted_shipments_tw
+        self.cost_bound = cost_bound
 
     def get_solution(self):
         """
-        Solve and return
-        :return: Schedule
+        Solve and return. With a cost bound the construction stops as soon as the fixed costs of the trucks it has opened,
+        or of the trucks the shipments need at least, reach the bound. Waiting and empty driving are left out of this
+        lower bound since shifting the shipments and improving the depots afterwards can lower them.
+        :return: Schedule, or None if its costs cannot get below the cost bound
         """
         # Initiate all trucks available
-        if self.trucks is None:
-            trucks = [Truck(depot) for depot, number_of_trucks in self.depots.items() for _ in range(number_of_trucks)]
-        else:
-            #trucks = [truck for truck in self.trucks]
-            trucks = self.trucks
-            for depot in self.depots:
-                number_still_open = self.depots[depot]
-                for truck in trucks:
-                    if truck.start_depot == depot:
-                        number_still_open -= 1
-            trucks += [Truck(depot) for depot, number_still_open in self.depots.items() for _ in range(number_still_open)]
+        pools = DepotPools(self.depots, self.trucks)
+        if self.cost_bound is not None:
+            max_number_of_trucks = len(pools.active_trucks) + sum(pools.get_remaining_capacity(depot) for depot in self.depots)
+            min_number_of_trucks = min(util.get_min_number_of_trucks(self.sorted_shipments_tw), max_number_of_trucks)
+            if c.fixed_cost_new_truck * max(len(pools.active_trucks), min_number_of_trucks) >= self.cost_bound:
+                return None
 
         # Sort the shipments by increasing start time
         # self.sorted_shipments_tw = sorted(self.shipments_tw, key=lambda shipment_tw: shipment_tw.latest_start_time)
         counter = 0
         # Loop over all shipments in increasing earliest start time order
         for shipment_tw in self.sorted_shipments_tw:
-            active_trucks = list(filter(lambda truck: truck.is_active(), trucks))
-            inactive_trucks = list(filter(lambda truck: not truck.is_active(), trucks))
+            active_trucks = pools.active_trucks
             active_trucks_with_space = get_active_trucks_with_space(shipment_tw, active_trucks)
             placed = False
             if not placed and len(active_trucks_with_space) > 0:
@@ -61,9 +59,9 @@ class RandomizedtiesCSbeforeafter:
                                                   key=lambda truck: cost_active_truck(truck, cheapest_compatible_shipment_truck(truck, shipment_tw)))
                 cost_of_best_truck = cost_active_truck(the_best_truck, cheapest_compatible_shipment_truck(the_best_truck, shipment_tw))
                 trucks_with_equal_costs = list(filter(lambda truck: cost_active_truck(truck, cheapest_compatible_shipment_truck(truck, shipment_tw)) == cost_of_best_truck, active_trucks_with_space))
-                truck_with_minimum_distance = min(trucks_with_equal_costs, key=lambda truck: c.time_diff_matrix.at[truck.start_depot, shipment_tw.end_location])
-                minimum_distance = c.time_diff_matrix.at[truck_with_minimum_distance.start_depot, shipment_tw.end_location]
-                trucks_with_equal_costs_and_equal_distance = list(filter(lambda truck: c.time_diff_matrix.at[truck.start_depot, shipment_tw.end_location] == minimum_distance, trucks_with_equal_costs))
+                truck_with_minimum_distance = min(trucks_with_equal_costs, key=lambda truck: c.time_diff_table[truck.start_depot_index][shipment_tw.end_location_index])
+                minimum_distance = c.time_diff_table[truck_with_minimum_distance.start_depot_index][shipment_tw.end_location_index]
+                trucks_with_equal_costs_and_equal_distance = list(filter(lambda truck: c.time_diff_table[truck.start_depot_index][shipment_tw.end_location_index] == minimum_distance, trucks_with_equal_costs))
                 # truck_with_minimum_shipments = min(trucks_with_equal_costs, key= lambda truck: len(truck.shipments))
                 # minimum_number_of_shipments = len(truck_with_minimum_shipments.shipments)
                 # trucks_with_equal_costs_and_equal_shipmens = list(filter(lambda truck: len(truck.shipments) == minimum_number_of_shipments, trucks_with_equal_costs))
@@ -74,14 +72,18 @@ class RandomizedtiesCSbeforeafter:
                 random_best_truck.add_shipment(cheapest_compatible_shipment_truck(random_best_truck, shipment_tw))
                 # shift_shipments_forward(random_best_truck)
                 placed = True
-            if not placed and len(inactive_trucks) > 0:
+            if not placed and pools.has_idle_trucks():
                 if shipment_tw.latest_end_time < 10:
                     shipment = Shipment(start_time=shipment_tw.earliest_start_time, input_shipment=shipment_tw)
                 else:
                     shipment = Shipment(start_time=shipment_tw.latest_start_time, input_shipment=shipment_tw)
-                the_best_truck = min(inactive_trucks, key=lambda truck: cost_inactive_truck(truck, shipment))
+                the_best_truck = min(pools.get_idle_trucks(), key=lambda truck: cost_inactive_truck(truck, shipment))
                 the_best_truck.add_shipment(shipment)
+                pools.activate(the_best_truck)
                 placed = True
+                if self.cost_bound is not None and \
+                        c.fixed_cost_new_truck * max(len(pools.active_trucks), min_number_of_trucks) >= self.cost_bound:
+                    return None
             if not placed:
                 print("Shipment could not be placed")
                 pass
@@ -89,12 +91,11 @@ class RandomizedtiesCSbeforeafter:
             # not_finished_schedule = Schedule(config=self.config, trucks=[truck for truck in trucks if truck.is_active()])
             # not_finished_schedule.metrics()
             # not_finished_schedule.visualize()
-        schedule = Schedule(config=self.config, trucks=[truck for truck in trucks if truck.is_active()])
+        schedule = Schedule(config=self.config, trucks=list(pools.active_trucks))
 
         for truck in schedule.trucks:
             if not truck.is_splittable():
-                shift_shipments_forward(truck)
-                shift_shipments_backward(truck)
+                TruckTiming(truck).place()
         # print(counter)
         schedule.post_improve_depots()
 
@@ -118,7 +119,7 @@ def get_active_trucks_with_space(shipment_tw, active_trucks):
                        active_trucks))
 
 def driving_time_between_shipments(left_shipment, right_shipment):
-    return c.time_diff_matrix.at[left_shipment.end_location, right_shipment.start_location]
+    return c.time_diff_table[left_shipment.end_location_index][right_shipment.start_location_index]
 
 
 def are_compatible(ship1, ship2):
@@ -202,7 +203,7 @@ def cost_active_truck_after(truck: Truck, shipment: Shipment):
                c.weight_empty_driving_time * driving_time_between_shipments(last_shipment, shipment)
         if shipment.start_time > c.start_time_last_shipment + 8 or \
                 (duration_with_potential_shipment(truck, shipment) > c.day_duration_last_shipment and shipment.start_time > 12):
-            cost += c.weight_empty_driving_time * c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+            cost += c.weight_empty_driving_time * c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
         return cost
     else:
         return 1000000000
@@ -217,7 +218,7 @@ def cost_active_truck_before(truck: Truck, shipment: Shipment):
            c.weight_empty_driving_time * driving_time_between_shipments(shipment, first_shipment)
     if shipment.start_time < c.start_time_first_shipment - 4 or \
             (duration_with_potential_shipment(truck, shipment) > c.day_duration_last_shipment and shipment.start_time < 12):
-        cost += c.weight_empty_driving_time * c.time_diff_matrix.at[truck.start_depot, shipment.start_location]
+        cost += c.weight_empty_driving_time * c.time_diff_table[truck.start_depot_index][shipment.start_location_index]
         return cost
     else:
         return float('inf')
@@ -235,11 +236,11 @@ def cost_active_truck(truck: Truck, shipment: Shipment):
 def cost_inactive_truck(truck: Truck, shipment: Shipment):
     if shipment.end_time < 10:
         cost = truck.startup_cost + c.weight_empty_driving_time * (
-            c.time_diff_matrix.at[truck.start_depot, shipment.start_location]
+            c.time_diff_table[truck.start_depot_index][shipment.start_location_index]
         )
     else:
         cost = truck.startup_cost + c.weight_empty_driving_time * (
-            c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+            c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
         )
     return cost
 
@@ -247,15 +248,15 @@ def cost_inactive_truck(truck: Truck, shipment: Shipment):
 def duration_with_potential_shipment(truck: Truck, shipment: Shipment):
     duration_with_shipment = float('inf')
     if fits_after(truck, shipment.input_shipment):
-        duration_with_shipment = c.time_diff_matrix.at[
-                                     truck.start_depot, truck.shipments[0].start_location] + \
+        duration_with_shipment = c.time_diff_table[
+                                     truck.start_depot_index][truck.shipments[0].start_location_index] + \
                                  (shipment.end_time - truck.shipments[0].start_time) + \
-                                 c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+                                 c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     elif fits_before(truck, shipment.input_shipment):
-        duration_with_shipment = c.time_diff_matrix.at[
-                                     truck.start_depot, shipment.start_location] + \
+        duration_with_shipment = c.time_diff_table[
+                                     truck.start_depot_index][shipment.start_location_index] + \
                                  (truck.shipments[-1].end_time - shipment.start_time) + \
-                                 c.time_diff_matrix.at[truck.shipments[-1].end_location, truck.start_depot]
+                                 c.time_diff_table[truck.shipments[-1].end_location_index][truck.start_depot_index]
     return duration_with_shipment
 
 
@@ -263,25 +264,25 @@ def duration_with_potential_shipment(truck: Truck, shipment: Shipment):
 #     last_shipment = truck.shipments[-1]
 #     if are_compatible_tw(last_shipment, shipment_tw):
 #         shipment = cheapest_compatible_shipment(truck.shipments[-1], shipment_tw)
-#         duration_with_shipment = c.time_diff_matrix.at[
-#                                      truck.start_depot, truck.shipments[0].start_location] + \
+#         duration_with_shipment = c.time_diff_table[
+#                                      truck.start_depot_index][truck.shipments[0].start_location_index] + \
 #                                  (shipment.end_time - truck.shipments[0].start_time) + \
-#                                  c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+#                                  c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
 #     else:
 #         duration_with_shipment = 10000
 #     return duration_with_shipment
 
 
 def driving_time_with_potential_shipment(truck: Truck, shipment: Shipment):
-    driving_time_with_shipment = c.time_diff_matrix.at[
-        truck.start_depot, truck.shipments[0].start_location]
+    driving_time_with_shipment = c.time_diff_table[
+        truck.start_depot_index][truck.shipments[0].start_location_index]
     for ship in truck.shipments:
         ship_duration = ship.end_time - ship.start_time - c.loading_time
         driving_time_with_shipment += ship_duration
-    driving_time_with_shipment += c.time_diff_matrix.at[
-        truck.shipments[-1].end_location, shipment.start_location]
+    driving_time_with_shipment += c.time_diff_table[
+        truck.shipments[-1].end_location_index][shipment.start_location_index]
     driving_time_with_shipment += (shipment.end_time - shipment.start_time) - c.loading_time
-    driving_time_with_shipment += c.time_diff_matrix.at[shipment.end_location, truck.start_depot]
+    driving_time_with_shipment += c.time_diff_table[shipment.end_location_index][truck.start_depot_index]
     return driving_time_with_shipment
 
 def shift_first_shipment(truck: Truck):
@@ -296,29 +297,3 @@ def shift_first_shipment(truck: Truck):
             new_start_waiting = min(second_shipment.start_time, potential_latest_start_waiting)
             new_start_time = new_start_waiting - driving_time_between_shipments(first_shipment, second_shipment) - first_shipment.get_length()
             first_shipment.set_start_time(new_start_time)
-
-def shift_shipments_forward(truck: Truck):
-    if len(truck.shipments) > 1:
-        last_shipment = truck.shipments[-1]
-        for i in range(len(truck.shipments)):
-            left_shipment: Shipment = truck.shipments[-(i+1)]
-            right_shipment: Shipment = truck.shipments[-i]
-            start_waiting = left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment)
-            end_waiting = right_shipment.start_time
-            if end_waiting - start_waiting > 0:
-                potential_latest_start_waiting = left_shipment.input_shipment.latest_end_time + \
-                                                 driving_time_between_shipments(left_shipment, right_shipment)
-                new_start_waiting = min(right_shipment.start_time, potential_latest_start_waiting)
-                new_start_time = new_start_waiting - driving_time_between_shipments(left_shipment, right_shipment) - left_shipment.get_length()
-                left_shipment.set_start_time(new_start_time)
-
-def shift_shipments_backward(truck: Truck):
-    if len(truck.shipments) > 1:
-        for i in range(len(truck.shipments)-1):
-            left_shipment: Shipment = truck.shipments[i]
-            right_shipment: Shipment = truck.shipments[i+1]
-            start_waiting = left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment)
-            end_waiting = right_shipment.start_time
-            if end_waiting - start_waiting > 0:
-                new_start_time = max(left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment), right_shipment.input_shipment.earliest_start_time)
-                right_shipment.set_start_time(new_start_time)
\ No newline at end of file
@@ -0,0 +1,117 @@
+import copy
+import math
+import time
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.Schedule import Schedule
+from ilp_models.MDVSP_TW_FixedOBStartDepots_model import MDVSPTWFixedOBStartDepotsModel
+
+
+# ---------------------------------------------- RollingHorizon Class ------------------------------------------------
+
+class RollingHorizon:
+    """
+    Rolling horizon driver for the network models of ilp_models, so that the size of the models does not grow with the
+    length of the day. The day is solved in slices of window_length hours, and every next slice starts window_length -
+    overlap hours later. A slice has the shipments that are not committed yet and whose time window opens before the
+    end of the slice. After a slice is solved, the shipments that start before the next slice are committed with their
+    start times, and the later ones are left for the next slice. Every truck with committed shipments that one of the
+    shipments left can still continue, see ShipmentArcs.get_continuation_arcs, is carried into the next slice as an
+    input truck of the model: a fixed partial truck that can be continued from the end of its last shipment, within the
+    maximum duration, or sent back to its depot. The other trucks are finished and go straight into the schedule, and
+    take up the capacity of their depot in the next slices. The last slice, which has all remaining shipments, commits
+    everything. The time_limit is for the whole day, every slice gets an equal share of what is left of it over the
+    slices that are left.
+    """
+
+    def __init__(self, input: InputTW, config: Config, model_class=MDVSPTWFixedOBStartDepotsModel,
+                 window_length: float = 4, overlap: float = 2, solver: str = 'auto', time_limit=c.ilp_time_limit):
+        if not 0 <= overlap < window_length:
+            raise ValueError('The overlap must be at least 0 and shorter than the window length')
+        self.input = input
+        self.shipments_tw = input.shipments_tw
+        self.config = config
+        self.model_class = model_class
+        self.window_length = window_length
+        self.overlap = overlap
+        self.solver = solver
+        self.time_limit = time_limit
+        self.slice_sizes = []
+        self.slice_arcs = []
+        self.slice_times = []
+        self.solve_time = None
+
+    def get_solution(self):
+        """
+        Solve the slices in order
+        :return: Schedule, or None if a slice has no feasible solution
+        """
+        tic = time.time()
+        self.slice_sizes, self.slice_arcs, self.slice_times = [], [], []
+        remaining = sorted(self.shipments_tw, key=lambda shipment_tw: shipment_tw.earliest_start_time)
+        trucks = []
+        finished_trucks = []
+        slice_start = remaining[0].earliest_start_time if len(remaining) > 0 else 0
+        while len(remaining) > 0:
+            slice_end = slice_start + self.window_length
+            commit_end = slice_end - self.overlap
+            slice_shipments_tw = [shipment_tw for shipment_tw in remaining if shipment_tw.earliest_start_time < slice_end]
+            slice_start = commit_end
+            if len(slice_shipments_tw) == 0:
+                continue
+            is_last = len(slice_shipments_tw) == len(remaining)
+            number_of_slices = 1 if remaining[-1].earliest_start_time < slice_end else \
+                math.floor((remaining[-1].earliest_start_time - slice_end) / (self.window_length - self.overlap)) + 2
+
+            slice_tic = time.time()
+            slice_input = copy.copy(self.input)
+            slice_input.shipments_tw = slice_shipments_tw
+            slice_input.depots = {depot: capacity - sum(truck.start_depot == depot for truck in finished_trucks)
+                                  for depot, capacity in self.input.depots.items()}
+            time_limit = max(self.time_limit - (slice_tic - tic), 0) / number_of_slices
+            model = self.model_class(input=slice_input, config=self.config, solver=self.solver, time_limit=time_limit,
+                                     input_trucks=trucks)
+            schedule = model.get_solution()
+            self.slice_sizes.append(len(slice_shipments_tw))
+            self.slice_arcs.append(model.network.get_number_of_arcs())
+            self.slice_times.append(time.time() - slice_tic)
+            if model.solution_flows is None:
+                print('No feasible solution for the slice from ' + str(commit_end - self.window_length))
+                return None
+
+            trucks = []
+            committed = set()
+            for truck in schedule.get_trucks():
+                if not is_last:
+                    while len(truck.shipments) > 0 and truck.get_last_shipment().start_time >= commit_end:
+                        truck.remove_ith_shipment(-1)
+                if len(truck.shipments) > 0:
+                    trucks.append(truck)
+                    committed.update(shipment.input_shipment.id for shipment in truck.shipments)
+            remaining = [shipment_tw for shipment_tw in remaining if shipment_tw.id not in committed]
+            trucks, finished = self.__split_continued_trucks(trucks, remaining)
+            finished_trucks += finished
+        self.solve_time = time.time() - tic
+        return Schedule(config=self.config, trucks=finished_trucks + trucks)
+
+    def __split_continued_trucks(self, trucks: list, remaining: list):
+        """
+        Split the trucks into the ones that a discretized shipment of remaining can continue in the model, and the ones
+        that are finished
+        :return: continued trucks, finished trucks
+        """
+        if len(remaining) == 0:
+            return [], trucks
+        remaining_input = copy.copy(self.input)
+        remaining_input.shipments_tw = remaining
+        model = self.model_class(input=remaining_input, config=self.config)
+        continued, finished = [], []
+        for truck in trucks:
+            positions, _ = model.shipment_arcs.get_continuation_arcs(truck, model.get_depot_positions(truck.start_depot),
+                                                                      model.max_waiting_time)
+            if len(positions) > 0:
+                continued.append(truck)
+            else:
+                finished.append(truck)
+        return continued, finished
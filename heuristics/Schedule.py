@@ -1,5 +1,5 @@
 from heuristics.Config import Config
-from heuristics.Truck import Truck
+from heuristics.Truck import Truck, snapshot_trucks
 import constants as c
 import matplotlib.pyplot as plt
 from matplotlib.lines import Line2D
@@ -13,6 +13,9 @@ from heuristics.InputTW import InputTW
 # Files
 from heuristics.Config import Config
 from heuristics.Truck import Truck
+from heuristics.LocalSearch import LocalSearch
+from heuristics.DepotAssignment import assign_depots
+from heuristics.TruckTiming import TruckTiming
 
 
 class Schedule:
@@ -37,6 +40,15 @@ class Schedule:
             i -= 1
         return string
 
+    def snapshot(self):
+        """
+        Copy of the schedule whose trucks are snapshots, see Truck.snapshot
+        :return: Schedule
+        """
+        snapshot = copy.copy(self)
+        snapshot.trucks = snapshot_trucks(self.trucks)
+        return snapshot
+
     def add_truck(self, truck: Truck):
         self.trucks.append(truck)
 
@@ -152,22 +164,34 @@ class Schedule:
         for truck in self.get_trucks():
             if truck.get_start_time() > 1.25:
                 for depot in self.get_depots():
-                    depot_score_dict[depot] = c.time_diff_matrix.at[depot, truck.shipments[0].start_location] + \
-                                              c.time_diff_matrix.at[truck.shipments[-1].end_location, depot]
+                    depot_index = c.location_index[depot]
+                    depot_score_dict[depot] = c.time_diff_table[depot_index][truck.shipments[0].start_location_index] + \
+                                              c.time_diff_table[truck.shipments[-1].end_location_index][depot_index]
                 best_depot = min(self.get_depots(), key=lambda depot: depot_score_dict[depot])
                 if depot_score_dict[truck.start_depot] > depot_score_dict[best_depot]:
                     # print('We can improve: ', depot_score_dict[truck.start_depot], ' ----> ', depot_score_dict[best_depot])
                     truck.change_depot_to(best_depot)
 
-    def post_optimize_depots(self):
-        pass
+    def post_optimize_depots(self, depots: dict, fixed_trucks: list = ()):
+        """
+        Give the trucks the depots with the lowest total costs within the capacities of depots, see assign_depots. The
+        fixed_trucks keep their depot.
+        :return: number of trucks that changed depot
+        """
+        return assign_depots(self.trucks, depots, fixed_trucks)
 
 
 
     def post_shift_shipments(self):
         for truck in self.trucks:
-            shift_shipments_backward(truck)
-            shift_shipments_forward(truck)
+            TruckTiming(truck).place()
+
+    def post_optimize_timing(self):
+        """
+        Give the shipments of every truck the start times with the lowest move costs, see Truck.optimize_timing
+        :return: decrease of the move costs
+        """
+        return sum(truck.optimize_timing() for truck in self.trucks)
 
 
     # def post_equalize_day_durations(self):
@@ -186,7 +210,16 @@ class Schedule:
     #         best_shipment = min(potential_shipments, key=lambda shipment: cost(short_truck, shipment))
 
     def post_optimize_last_shipments_only(self):
-        pass
+        """
+        Improve the schedule by exchanging the last shipments of trucks only, with the tail exchanges of LocalSearch
+        """
+        LocalSearch().improve(self, moves=['tail_exchange'])
+
+    def post_local_search(self, number_of_neighbours: int = 10, policy: str = 'first'):
+        """
+        Improve the schedule with the relocate, exchange and tail exchange moves of LocalSearch
+        """
+        LocalSearch(number_of_neighbours=number_of_neighbours, policy=policy).improve(self)
 
     def swap_last_shipments(self, truck_1: Truck, truck_2: Truck):
         if truck_1 not in self.get_trucks() or truck_2 not in self.get_trucks():
@@ -215,6 +248,39 @@ class Schedule:
                     truck_1.add_shipment(ship_2)
                     truck_2.remove_shipment(ship_2)
 
+    def get_relocate_costs(self, truck_1: Truck, i, truck_2: Truck):
+        """
+        Change in move costs if the ith shipment of truck_1 would be moved to truck_2, without changing the trucks
+        :return: float
+        """
+        if truck_1 is truck_2:
+            raise ValueError('Cannot relocate a shipment within one truck')
+        return truck_1.get_removal_costs(i) + truck_2.get_insertion_costs(truck_1.shipments[i])
+
+    def get_exchange_costs(self, truck_1: Truck, i, truck_2: Truck, j):
+        """
+        Change in move costs if the ith shipment of truck_1 and the jth shipment of truck_2 would be exchanged, without
+        changing the trucks
+        :return: float
+        """
+        if truck_1 is truck_2:
+            raise ValueError('Cannot exchange shipments within one truck')
+        return truck_1.get_exchange_costs(i, truck_2.shipments[j]) + \
+               truck_2.get_exchange_costs(j, truck_1.shipments[i])
+
+    def relocate_shipment(self, truck_1: Truck, i, truck_2: Truck):
+        shipment = truck_1.shipments[i]
+        truck_1.remove_ith_shipment(i)
+        truck_2.add_shipment(shipment)
+
+    def exchange_shipments(self, truck_1: Truck, i, truck_2: Truck, j):
+        shipment_1 = truck_1.shipments[i]
+        shipment_2 = truck_2.shipments[j]
+        truck_1.remove_ith_shipment(i)
+        truck_2.remove_ith_shipment(j)
+        truck_1.add_shipment(shipment_2)
+        truck_2.add_shipment(shipment_1)
+
     def get_number_of_shipments(self):
         number = 0
         for truck in self.trucks:
@@ -293,7 +359,7 @@ class Schedule:
             S = len(truck.shipments)
             depot = truck.start_depot
             # Pull out trips
-            pull_out_time = c.time_diff_matrix.at[depot, truck.shipments[0].start_location]
+            pull_out_time = c.time_diff_table[truck.start_depot_index][truck.shipments[0].start_location_index]
             self.total_pull_out_time += pull_out_time
             # Shipment trips
             shipment_time = 0
@@ -304,20 +370,20 @@ class Schedule:
             # Driving empty in between shipments
             empty_driving_time = 0
             for i in range(S - 1):
-                one_empty_driving_time = c.time_diff_matrix.at[
-                    truck.shipments[i].end_location, truck.shipments[i + 1].start_location]
+                one_empty_driving_time = c.time_diff_table[
+                    truck.shipments[i].end_location_index][truck.shipments[i + 1].start_location_index]
                 empty_driving_time += one_empty_driving_time
             self.total_empty_driving_time += empty_driving_time
             # Waiting time in between shipments
             waiting_time = 0
             for i in range(S - 1):
                 one_waiting_time = truck.shipments[i + 1].start_time - truck.shipments[i].end_time - \
-                                   c.time_diff_matrix.at[
-                                       truck.shipments[i].end_location, truck.shipments[i + 1].start_location]
+                                   c.time_diff_table[
+                                       truck.shipments[i].end_location_index][truck.shipments[i + 1].start_location_index]
                 waiting_time += one_waiting_time
             self.total_waiting_time += waiting_time
             # Pull in trips
-            pull_in_time = c.time_diff_matrix.at[truck.shipments[-1].end_location, depot]
+            pull_in_time = c.time_diff_table[truck.shipments[-1].end_location_index][truck.start_depot_index]
             self.total_pull_in_time += pull_in_time
             planned_time = truck.get_end_time() - truck.get_start_time()
             self.total_planned_time += planned_time
@@ -404,9 +470,9 @@ class Schedule:
             elif depot == 'DC1':
                 stem_color = 'tab:blue'
             gnt.broken_barh(
-                [(truck.shipments[0].start_time - c.time_diff_matrix.at[
-                    depot, truck.shipments[0].start_location],
-                  c.time_diff_matrix.at[depot, truck.shipments[0].start_location])],
+                [(truck.shipments[0].start_time - c.time_diff_table[
+                    truck.start_depot_index][truck.shipments[0].start_location_index],
+                  c.time_diff_table[truck.start_depot_index][truck.shipments[0].start_location_index])],
                 (y, bar_height), facecolors=stem_color, edgecolor='black')
             # Shipment trips
             for i in range(S):
@@ -431,23 +497,23 @@ class Schedule:
             # Driving empty in between shipments
             for i in range(S - 1):
                 gnt.broken_barh([(truck.shipments[i].end_time,
-                                  c.time_diff_matrix.at[
-                                      truck.shipments[i].end_location, truck.shipments[i + 1].start_location])],
+                                  c.time_diff_table[
+                                      truck.shipments[i].end_location_index][truck.shipments[i + 1].start_location_index])],
                                 (y, bar_height), facecolors='tab:blue', edgecolor='black')
             # Waiting time in between shipments
             for i in range(S - 1):
                 gnt.broken_barh(
                     [(truck.shipments[i].end_time +
-                      c.time_diff_matrix.at[
-                          truck.shipments[i].end_location, truck.shipments[i + 1].start_location],
+                      c.time_diff_table[
+                          truck.shipments[i].end_location_index][truck.shipments[i + 1].start_location_index],
                       truck.shipments[i + 1].start_time - truck.shipments[i].end_time -
-                      c.time_diff_matrix.at[
-                          truck.shipments[i].end_location, truck.shipments[i + 1].start_location])],
+                      c.time_diff_table[
+                          truck.shipments[i].end_location_index][truck.shipments[i + 1].start_location_index])],
                     (y, bar_height), facecolors='tab:grey', edgecolor='black')
             # Pull in trips
             gnt.broken_barh([(truck.shipments[-1].end_time,
-                              c.time_diff_matrix.at[
-                                  truck.shipments[-1].end_location, depot])],
+                              c.time_diff_table[
+                                  truck.shipments[-1].end_location_index][truck.start_depot_index])],
                             (y, bar_height), facecolors=stem_color, edgecolor='black')
             # Extra waiting time too short truck days
             if truck.is_too_short():
@@ -592,7 +658,7 @@ class Schedule:
             sheet1.write(i, 3, to_time_duration(truck.get_duration()))
             sheet1.write(i, 4, truck.start_depot)
             sheet1.write(i, 5,
-                         to_time_duration(c.time_diff_matrix.at[truck.start_depot, truck.shipments[0].start_location]))
+                         to_time_duration(c.time_diff_table[truck.start_depot_index][truck.shipments[0].start_location_index]))
             j = 1
             for shipment in truck.shipments:
                 sheet1.write(i, j * 6, shipment.id)
@@ -601,13 +667,13 @@ class Schedule:
                 sheet1.write(i, 3 + j * 6, to_time_moment(shipment.end_time))
                 sheet1.write(i, 4 + j * 6, shipment.end_location)
                 if j < len(truck.shipments):
-                    sheet1.write(i, 5 + j * 6, to_time_duration(c.time_diff_matrix.at[
-                                                                    shipment.end_location, truck.shipments[
+                    sheet1.write(i, 5 + j * 6, to_time_duration(c.time_diff_table[
+                                                                    shipment.end_location_index][truck.shipments[
                                                                         truck.shipments.index(
-                                                                            shipment) + 1].start_location]))
+                                                                            shipment) + 1].start_location_index]))
                 j += 1
             sheet1.write(i, 5 + m * 6,
-                         to_time_duration(c.time_diff_matrix.at[truck.shipments[-1].end_location, truck.start_depot]))
+                         to_time_duration(c.time_diff_table[truck.shipments[-1].end_location_index][truck.start_depot_index]))
             i += 1
 
         sheet2 = wb.add_sheet('Summary')
@@ -648,7 +714,7 @@ class Schedule:
 
 
 def merge_schedules(schedule_1: Schedule, schedule_2: Schedule):
-    merged_schedule = copy.deepcopy(schedule_1)
+    merged_schedule = schedule_1.snapshot()
     for truck in schedule_2.trucks:
         merged_schedule.add_truck(truck)
     return merged_schedule
@@ -690,30 +756,4 @@ def to_time_duration(number):
     return "%d:%02d" % (hours, minutes)
 
 def driving_time_between_shipments(left_shipment, right_shipment):
-    return c.time_diff_matrix.at[left_shipment.end_location, right_shipment.start_location]
-
-def shift_shipments_forward(truck: Truck):
-    if len(truck.shipments) > 1:
-        last_shipment = truck.shipments[-1]
-        for i in range(len(truck.shipments)):
-            left_shipment = truck.shipments[-(i+1)]
-            right_shipment = truck.shipments[-i]
-            start_waiting = left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment)
-            end_waiting = right_shipment.start_time
-            if end_waiting - start_waiting > 0:
-                potential_latest_start_waiting = left_shipment.input_shipment.latest_end_time + \
-                                                 driving_time_between_shipments(left_shipment, right_shipment)
-                new_start_waiting = min(right_shipment.start_time, potential_latest_start_waiting)
-                new_start_time = new_start_waiting - driving_time_between_shipments(left_shipment, right_shipment) - left_shipment.get_length()
-                left_shipment.set_start_time(new_start_time)
-
-def shift_shipments_backward(truck: Truck):
-    if len(truck.shipments) > 1:
-        for i in range(len(truck.shipments)-1):
-            left_shipment = truck.shipments[i]
-            right_shipment = truck.shipments[i+1]
-            start_waiting = left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment)
-            end_waiting = right_shipment.start_time
-            if end_waiting - start_waiting > 0:
-                new_start_time = max(left_shipment.end_time + driving_time_between_shipments(left_shipment, right_shipment), right_shipment.input_shipment.earliest_start_time)
-                right_shipment.set_start_time(new_start_time)
+    return c.time_diff_table[left_shipment.end_location_index][right_shipment.start_location_index]
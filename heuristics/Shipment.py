@@ -17,6 +17,8 @@ class ShipmentTW:
         self.latest_end_time = earliest_end_time + (latest_start_time - earliest_start_time)
         self.start_location = start_location
         self.end_location = end_location
+        self.start_location_index = c.location_index.get(start_location)
+        self.end_location_index = c.location_index.get(end_location)
         self.type = type
 
     def __str__(self):
@@ -88,6 +90,7 @@ class Shipment:
     def __init__(self, id: str = '', start_time: float = 0, end_time: float = 0, start_location: str = '',
                  end_location: str = '', type: str = '', input_shipment: ShipmentTW = None):
         self.start_time = 0
+        self.truck = None
         if input_shipment is not None:
             self.input_shipment = input_shipment
             if id != '':
@@ -97,6 +100,8 @@ class Shipment:
             self.set_start_time(start_time)
             self.start_location = input_shipment.start_location
             self.end_location = input_shipment.end_location
+            self.start_location_index = input_shipment.start_location_index
+            self.end_location_index = input_shipment.end_location_index
             self.type = input_shipment.type
         else:
             self.input_shipment = None
@@ -105,17 +110,28 @@ class Shipment:
             self.end_time = end_time
             self.start_location = start_location
             self.end_location = end_location
+            self.start_location_index = c.location_index.get(start_location)
+            self.end_location_index = c.location_index.get(end_location)
             self.type = type
 
     def set_start_time(self, start_time: float):
+        if self.truck is not None:
+            self.truck.before_shipment_shifted(self)
         self.start_time = round(start_time, 3)
         if self.input_shipment is not None:
             self.end_time = round(start_time + self.input_shipment.get_length(), 3)
+        if self.truck is not None:
+            self.truck.on_shipment_shifted(self)
 
     def get_length(self):
         length = self.end_time - self.start_time
         return length
 
+    def __copy__(self):
+        shipment = Shipment.__new__(Shipment)
+        shipment.__dict__.update(self.__dict__)
+        return shipment
+
     def __str__(self):
         return 'id: ' + str(self.id) + '\n' + \
                'start time: ' + str(self.start_time) + ' end time: ' + str(self.end_time) + '\n' + \
@@ -128,7 +144,7 @@ class Shipment:
 
 def are_compatible(ship1: Shipment, ship2: Shipment):
     compatibility = False
-    if ship1.end_time + c.time_diff_matrix.at[ship1.end_location, ship2.start_location] <= ship2.start_time:
+    if ship1.end_time + c.time_diff_table[ship1.end_location_index][ship2.start_location_index] <= ship2.start_time:
         compatibility = True
     return compatibility
 
@@ -0,0 +1,173 @@
+import numpy as np
+import constants as c
+
+
+# ---------------------------------------------- ShipmentArcs Class ---------------------------------------------------
+
+class ShipmentArcs:
+    """
+    The arcs of the multi depot network flow models between discretized shipments. The start and end times and the
+    start and end location indices of the shipments are kept in NumPy arrays, so the compatibility arcs of a depot are
+    found with one broadcast over all pairs of its shipments instead of a double loop in Python. Shipments are referred
+    to by their position in the list the arcs were built from, and arcs are returned in the order the double loop over
+    that list would visit them.
+    """
+
+    def __init__(self, shipments: list):
+        self.shipments = shipments
+        self.ids = [shipment.id for shipment in shipments]
+        self.start_time = np.array([shipment.start_time for shipment in shipments], dtype=float)
+        self.end_time = np.array([shipment.end_time for shipment in shipments], dtype=float)
+        self.start_location_index = np.array([shipment.start_location_index for shipment in shipments], dtype=np.intp)
+        self.end_location_index = np.array([shipment.end_location_index for shipment in shipments], dtype=np.intp)
+        self.is_inbound = np.array(['IB' in shipment.type for shipment in shipments], dtype=bool)
+
+    def get_depot_positions(self, depot):
+        """
+        The shipments that can be executed by a truck of depot: all inbound shipments and the shipments that start at
+        the depot
+        :return: array of positions
+        """
+        starts_at_depot = c.time_diff_array[self.start_location_index, c.location_index[depot]] < 1
+        return np.flatnonzero(self.is_inbound | starts_at_depot)
+
+    def get_compatibility_arcs(self, positions, max_waiting_time=None):
+        """
+        The pairs of shipments in positions such that the second shipment can be started after executing the first one
+        and driving to its start location, with a waiting time of at most max_waiting_time (by default the maximum
+        waiting time, np.inf for no maximum), and their costs
+        :return: positions of the first shipments, positions of the second shipments, costs
+        """
+        if max_waiting_time is None:
+            max_waiting_time = c.max_waiting_time
+        empty_driving_time, waiting_time = self.__get_waiting_times(positions)
+        first, second = np.nonzero((0 <= waiting_time) & (waiting_time <= max_waiting_time))
+        costs = c.weight_waiting_time * waiting_time[first, second] + \
+            c.weight_empty_driving_time * empty_driving_time[first, second]
+        return positions[first], positions[second], costs
+
+    def get_first_match_arcs(self, positions):
+        """
+        For every shipment in positions and every location, the arc to the shipment in positions that starts first at
+        that location and can be started after it, ties broken by position. The starts at a location are sorted once and
+        the first match of every shipment is found with a binary search in them, so no pair of shipments is compared
+        and the time is O(N log N) per location instead of O(N^2).
+        :return: positions of the first shipments, positions of the second shipments, costs
+        """
+        positions = np.asarray(positions)
+        end_time = self.end_time[positions]
+        end_location_index = self.end_location_index[positions]
+        start_order = positions[np.lexsort((positions, self.start_time[positions], self.start_location_index[positions]))]
+        start_location_index = self.start_location_index[start_order]
+        locations, location_starts = np.unique(start_location_index, return_index=True)
+        location_ends = np.append(location_starts[1:], len(start_order))
+        first, second, costs = [], [], []
+        for location, location_start, location_end in zip(locations.tolist(), location_starts.tolist(),
+                                                          location_ends.tolist()):
+            seconds = start_order[location_start:location_end]
+            start_times = self.start_time[seconds]
+            empty_driving_time = c.time_diff_array[end_location_index, location]
+            matches = self.__search_first_starts(start_times, end_time, empty_driving_time)
+            has_match = matches < len(seconds)
+            matches = matches[has_match]
+            waiting_time = start_times[matches] - end_time[has_match] - empty_driving_time[has_match]
+            first.append(positions[has_match])
+            second.append(seconds[matches])
+            costs.append(c.weight_waiting_time * waiting_time + c.weight_empty_driving_time * empty_driving_time[has_match])
+        if len(first) == 0:
+            return positions[:0], positions[:0], np.zeros(0)
+        first, second, costs = np.concatenate(first), np.concatenate(second), np.concatenate(costs)
+        # Same order as the compatibility arcs: by first shipment, then by start location of the second shipment
+        order = np.argsort(first, kind='stable')
+        return first[order], second[order], costs[order]
+
+    @staticmethod
+    def __search_first_starts(start_times, end_time, empty_driving_time):
+        """
+        The index in the sorted start_times of the first start with a waiting time of at least 0 after every end, or
+        len(start_times) if there is none. The binary search is on end_time + empty_driving_time and corrected by one
+        step where that rounds differently than the waiting time start_time - end_time - empty_driving_time of
+        get_compatibility_arcs.
+        :return: array of indices
+        """
+        matches = np.searchsorted(start_times, end_time + empty_driving_time, side='left')
+        # One step back if the start before the match is compatible after all
+        previous = np.maximum(matches - 1, 0)
+        is_earlier = (matches > 0) & (start_times[previous] - end_time - empty_driving_time >= 0)
+        matches[is_earlier] = np.searchsorted(start_times, start_times[previous[is_earlier]], side='left')
+        # One step forward if the match is not compatible after all
+        current = np.minimum(matches, len(start_times) - 1)
+        is_later = (matches < len(start_times)) & (start_times[current] - end_time - empty_driving_time < 0)
+        matches[is_later] = np.searchsorted(start_times, start_times[current[is_later]], side='right')
+        return matches
+
+    def get_connection_arcs(self, positions):
+        """
+        The connection arcs of the time space network of the shipments in positions: of the first match arcs into a
+        shipment, only the one from the shipment that ends last at each location, ties broken by position. Together
+        with the waiting arcs every pair of compatible shipments is connected by a path with the same costs as the arc
+        between them.
+        :return: positions of the first shipments, positions of the second shipments, costs
+        """
+        first_positions, second_positions, costs = self.get_first_match_arcs(positions)
+        order = np.lexsort((-first_positions, -self.end_time[first_positions], second_positions,
+                            self.end_location_index[first_positions]))
+        first_positions, second_positions, costs = first_positions[order], second_positions[order], costs[order]
+        is_latest = np.ones(len(order), dtype=bool)
+        is_latest[1:] = (second_positions[1:] != second_positions[:-1]) | \
+            (self.end_location_index[first_positions[1:]] != self.end_location_index[first_positions[:-1]])
+        return first_positions[is_latest], second_positions[is_latest], costs[is_latest]
+
+    def get_waiting_arcs(self, positions, is_start):
+        """
+        The waiting arcs of the time space network between the starts (is_start) or the ends of the shipments in
+        positions: from every shipment to the next one in time at the same location, and their costs
+        :return: positions of the first shipments, positions of the second shipments, costs
+        """
+        times = self.start_time if is_start else self.end_time
+        location_index = self.start_location_index if is_start else self.end_location_index
+        order = positions[np.lexsort((positions, times[positions], location_index[positions]))]
+        is_same_location = location_index[order[1:]] == location_index[order[:-1]]
+        first, second = order[:-1][is_same_location], order[1:][is_same_location]
+        return first, second, c.weight_waiting_time * (times[second] - times[first])
+
+    def __get_waiting_times(self, positions):
+        empty_driving_time = c.time_diff_array[np.ix_(self.end_location_index[positions],
+                                                      self.start_location_index[positions])]
+        waiting_time = self.start_time[positions][np.newaxis, :] - self.end_time[positions][:, np.newaxis] - \
+            empty_driving_time
+        return empty_driving_time, waiting_time
+
+    def get_continuation_arcs(self, truck, positions, max_waiting_time=None):
+        """
+        The shipments in positions that truck can execute after its last shipment, with a waiting time of at most
+        max_waiting_time (by default the maximum waiting time, np.inf for no maximum) and without making the truck longer
+        than the maximum duration, and the costs of the arcs to them
+        :return: positions, costs
+        """
+        if max_waiting_time is None:
+            max_waiting_time = c.max_waiting_time
+        last_shipment = truck.get_last_shipment()
+        empty_driving_time = c.time_diff_array[last_shipment.end_location_index, self.start_location_index[positions]]
+        waiting_time = self.start_time[positions] - last_shipment.end_time - empty_driving_time
+        duration = self.end_time[positions] + \
+            c.time_diff_array[self.end_location_index[positions], truck.start_depot_index] - truck.get_start_time()
+        is_continuation = (0 <= waiting_time) & (waiting_time <= max_waiting_time) & (duration <= c.max_duration)
+        costs = c.weight_waiting_time * waiting_time + c.weight_empty_driving_time * empty_driving_time
+        return positions[is_continuation], costs[is_continuation]
+
+    def get_pull_out_costs(self, depot, positions, fixed_cost_new_truck):
+        """
+        The costs of the arcs from depot to the shipments in positions: the fixed cost of a new truck plus the empty
+        driving time from the depot
+        :return: array of costs
+        """
+        return fixed_cost_new_truck + \
+            c.weight_empty_driving_time * c.time_diff_array[c.location_index[depot], self.start_location_index[positions]]
+
+    def get_pull_in_costs(self, depot, positions):
+        """
+        The costs of the arcs from the shipments in positions back to depot
+        :return: array of costs
+        """
+        return c.weight_empty_driving_time * c.time_diff_array[self.end_location_index[positions], c.location_index[depot]]
@@ -0,0 +1,60 @@
+# Files
+from heuristics.Truck import Truck
+
+
+# -------------------------------------------- ShipmentRegistry Class -------------------------------------------------
+
+class ShipmentRegistry:
+    """
+    The shipments of a search that fixes trucks round by round. Every ShipmentTW gets an integer id, its position in the
+    list it was registered with, and the registry keeps the integer ids that still have to be planned and the set that
+    is fixed on a truck. The remaining integer ids are the keys of a dict, which keeps them in the order they were
+    registered in, so fixing trucks with k shipments costs O(k) deletions and the remaining shipments are never sorted
+    again.
+    """
+
+    def __init__(self, shipments_tw: list):
+        self.shipments_tw = list(shipments_tw)
+        self.__integer_ids = {}
+        for integer_id, shipment_tw in enumerate(self.shipments_tw):
+            self.__integer_ids.setdefault(shipment_tw.id, []).append(integer_id)
+        self.remaining = dict.fromkeys(range(len(self.shipments_tw)))
+        self.fixed = set()
+
+    def __len__(self):
+        return len(self.remaining)
+
+    def get_integer_ids(self, truck: Truck):
+        """
+        The integer ids of the registered shipments that are on truck
+        :return: list of int
+        """
+        return [integer_id for shipment in truck.shipments for integer_id in self.__integer_ids.get(shipment.id, [])]
+
+    def fix(self, trucks: list):
+        """
+        Move the shipments of trucks from the remaining to the fixed shipments
+        :return: number of shipments that were fixed
+        """
+        number_fixed = 0
+        for truck in trucks:
+            for integer_id in self.get_integer_ids(truck):
+                if integer_id in self.remaining:
+                    del self.remaining[integer_id]
+                    self.fixed.add(integer_id)
+                    number_fixed += 1
+        return number_fixed
+
+    def get_remaining_shipments_tw(self):
+        """
+        The shipments that still have to be planned, in the order they were registered in
+        :return: list of ShipmentTW
+        """
+        return [self.shipments_tw[integer_id] for integer_id in self.remaining]
+
+    def get_fixed_shipments_tw(self):
+        """
+        The shipments that are fixed on a truck, in the order they were registered in
+        :return: list of ShipmentTW
+        """
+        return [self.shipments_tw[integer_id] for integer_id in sorted(self.fixed)]
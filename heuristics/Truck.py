@@ -1,70 +1,242 @@
 import constants as c
 from heuristics.Shipment import Shipment, ShipmentTW
+from heuristics.TruckTiming import TruckTiming
+import copy
 import util
 
 
+# Change in move costs of a move that makes an infeasible truck feasible, added to its new move costs. It is below the
+# change of any move between feasible trucks, so such a move is always taken first.
+feasibility_repair_delta = -1000000000
+
+
 class Truck:
     id_accumulator = 1
 
     def __init__(self, start_depot, shipments=None):
         self.start_depot = start_depot
+        self.start_depot_index = c.location_index.get(start_depot)
         self.startup_cost = c.fixed_cost_new_truck
 
         if shipments is not None:
-            self.shipments = shipments
+            self.__shipments = shipments
         else:
-            self.shipments = []
+            self.__shipments = []
+        self.__shared = False
+        for shipment in self.__shipments:
+            shipment.truck = self
         self.id = Truck.id_accumulator
         Truck.id_accumulator += 1
+        self.__update_from(0)
 
     def __str__(self):
         return 'Truck %2d starts at depot %6s, has total cost %s and executes the shipments: %s' % (
             self.id, self.start_depot, self.get_total_costs(),
-            [shipment.id for shipment in self.shipments])
+            [shipment.id for shipment in self.__shipments])
+
+    @property
+    def shipments(self):
+        """
+        The shipments of the truck. Callers may change their start times, so a truck that still shares its shipments
+        with a snapshot takes its own copy first.
+        """
+        if self.__shared:
+            self.__own()
+        return self.__shipments
+
+    def get_shipments(self):
+        """
+        The shipments of the truck to read only. Unlike the shipments attribute no copy is taken if they are shared with
+        a snapshot, so neither the list nor the shipments may be changed.
+        :return: list of Shipment
+        """
+        return self.__shipments
+
+    def snapshot(self):
+        """
+        Copy of the truck that shares the shipments and running aggregates with this truck, so taking it is O(1). Either
+        truck copies them when it is first changed, or when its shipments are read, so only the trucks that change are
+        copied, see __own.
+        :return: Truck
+        """
+        snapshot = copy.copy(self)
+        snapshot.__shared = True
+        self.__shared = True
+        return snapshot
+
+    def __own(self):
+        """
+        Give the truck its own shipments and running aggregates. A shipment points back to one truck, which is notified
+        when it is shifted, so that truck keeps the shipment itself and leaves a copy in the shared list for the trucks
+        it shares with. The other trucks copy the shipments and point them to themselves. This way a shipment that is
+        shifted through a reference from before the snapshot only changes the truck it points to.
+        """
+        self.__shared = False
+        shared_shipments = self.__shipments
+        self.__shipments = list(shared_shipments)
+        for k, shipment in enumerate(shared_shipments):
+            shipment_copy = copy.copy(shipment)
+            if shipment.truck is self:
+                shipment_copy.truck = None
+                shared_shipments[k] = shipment_copy
+            else:
+                shipment_copy.truck = self
+                self.__shipments[k] = shipment_copy
+        self.__waiting_sums = list(self.__waiting_sums)
+        self.__driving_sums = list(self.__driving_sums)
+        self.__infeasible_sums = list(self.__infeasible_sums)
+        self.__relief_points_per_shipment = list(self.__relief_points_per_shipment)
 
     def is_active(self):
         is_active = False
-        if len(self.shipments) > 0:
+        if len(self.__shipments) > 0:
             is_active = True
         return is_active
 
     def add_shipment(self, shipment: Shipment):
-        util.insert(seq=self.shipments, item=shipment, key=lambda ship: ship.start_time)
+        if self.__shared:
+            self.__own()
+        shipments = self.__shipments
+        i = get_insertion_index(shipments, shipment.start_time)
+        shipments.insert(i, shipment)
+        shipment.truck = self
+        self.__update_from(i)
 
     def remove_ith_shipment(self, i):
-        del self.shipments[i]
+        if self.__shared:
+            self.__own()
+        if i < 0:
+            i += len(self.__shipments)
+        shipment = self.__shipments[i]
+        del self.__shipments[i]
+        if shipment.truck is self:
+            shipment.truck = None
+        self.__update_from(i)
 
     def remove_shipment(self, shipment: Shipment):
-        if shipment not in self.shipments:
+        if shipment not in self.__shipments:
             print('Removed shipment not in truck')
         else:
-            self.shipments.remove(shipment)
+            self.remove_ith_shipment(self.__shipments.index(shipment))
+
+    def before_shipment_shifted(self, shipment: Shipment):
+        """
+        Called by Shipment.set_start_time for a shipment on this truck, before its start time changes
+        """
+        if self.__shared:
+            self.__own()
+
+    def on_shipment_shifted(self, shipment: Shipment):
+        """
+        Called by Shipment.set_start_time for a shipment on this truck, after its start time changed
+        """
+        try:
+            i = self.__shipments.index(shipment)
+        except ValueError:
+            return
+        self.__update_from(i)
+
+    def set_start_times(self, start_times):
+        """
+        Give the shipments of the truck start_times, in their order, with one update of the aggregates for all of them
+        """
+        if self.__shared:
+            self.__own()
+        position = None
+        for i, (shipment, start_time) in enumerate(zip(self.__shipments, start_times)):
+            if shipment.start_time != round(start_time, 3):
+                shipment.truck = None
+                shipment.set_start_time(start_time)
+                shipment.truck = self
+                if position is None:
+                    position = i
+        if position is not None:
+            self.__update_from(position)
+
+    def optimize_timing(self):
+        """
+        Give the shipments the start times in their time windows with the lowest move costs, see TruckTiming.optimize
+        :return: decrease of the move costs
+        """
+        return TruckTiming(self).optimize()
+
+    def __update_from(self, position):
+        """
+        Update the running aggregates of the truck after the shipments from position on have changed. The aggregates
+        are prefix sums that are accumulated in the same order as a full recomputation, so all metrics are exact. Adding
+        a shipment at the end is O(1), a change at position p costs O(n - p).
+        """
+        shipments = self.__shipments
+        if len(shipments) == 0:
+            self.__pull_out = 0
+            self.__pull_in = 0
+            self.__waiting_sums = []
+            self.__driving_sums = []
+            self.__infeasible_sums = []
+            self.__relief_points_per_shipment = []
+            self.__relief_points = []
+            self.__duration = 0
+            self.__waiting_time = 7
+            self.__empty_driving_time = 0
+            return
+        table = c.time_diff_table
+        if position <= 0:
+            position = 1
+            self.__pull_out = table[self.start_depot_index][shipments[0].start_location_index]
+            self.__waiting_sums = [0]
+            self.__driving_sums = [0 + self.__pull_out]
+            self.__infeasible_sums = [0]
+            self.__relief_points_per_shipment = [self.__get_shipment_relief_points(shipments[0])]
+        waiting_sums = self.__waiting_sums
+        driving_sums = self.__driving_sums
+        infeasible_sums = self.__infeasible_sums
+        relief_points_per_shipment = self.__relief_points_per_shipment
+        del waiting_sums[position:]
+        del driving_sums[position:]
+        del infeasible_sums[position:]
+        del relief_points_per_shipment[position:]
+        for k in range(position, len(shipments)):
+            left_shipment = shipments[k - 1]
+            right_shipment = shipments[k]
+            driving_time = table[left_shipment.end_location_index][right_shipment.start_location_index]
+            waiting_sums.append(waiting_sums[-1] + (right_shipment.start_time - left_shipment.end_time - driving_time))
+            driving_sums.append(driving_sums[-1] + driving_time)
+            infeasible_sums.append(infeasible_sums[-1] + (left_shipment.start_time + driving_time > right_shipment.start_time))
+            relief_points_per_shipment.append(self.__get_shipment_relief_points(right_shipment))
+        self.__relief_points = None
+        self.__pull_in = table[shipments[-1].end_location_index][self.start_depot_index]
+        self.__duration = round(self.__pull_out + (shipments[-1].end_time - shipments[0].start_time) + self.__pull_in, 2)
+        self.__waiting_time = waiting_sums[-1]
+        if self.__duration < 7:
+            self.__waiting_time += 7 - self.__duration
+        self.__empty_driving_time = driving_sums[-1] + self.__pull_in
+
+    def __get_shipment_relief_points(self, shipment: Shipment):
+        relief_points = []
+        if shipment.start_location == self.start_depot:
+            relief_points.append(shipment.start_time)
+        if shipment.end_location == self.start_depot:
+            relief_points.append(shipment.end_time)
+        return relief_points
 
     def get_first_shipment(self):
-        return self.shipments[0]
+        return self.__shipments[0]
+
+    def get_last_shipment(self):
+        return self.__shipments[-1]
 
     def get_end_time(self):
-        end_time_last_shipment = self.shipments[-1].end_time
-        driving_back_time = c.time_diff_matrix.at[self.shipments[-1].end_location, self.start_depot]
+        end_time_last_shipment = self.__shipments[-1].end_time
+        driving_back_time = self.__pull_in
         return end_time_last_shipment + driving_back_time
 
     def get_start_time(self):
-        start_time_first_shipment = self.shipments[0].start_time
-        driving_to_time = c.time_diff_matrix.at[self.start_depot, self.shipments[0].start_location]
+        start_time_first_shipment = self.__shipments[0].start_time
+        driving_to_time = self.__pull_out
         return start_time_first_shipment - driving_to_time
 
     def get_max_duration(self):
-        if self.get_start_time() < 1.25:
-            if self.get_waiting_time() < 1:
-                max_duration = 11
-            else:
-                max_duration = 11.25
-        else:
-            if self.get_waiting_time() < 1:
-                max_duration = 13.5
-            else:
-                max_duration = 14
-        return max_duration
+        return get_max_duration(self.get_start_time(), self.get_waiting_time())
 
     def is_too_long(self):
         too_long = False
@@ -82,35 +254,36 @@ class Truck:
         if depot == self.start_depot:
             print('Depot is already ', depot)
         else:
+            if self.__shared:
+                self.__own()
             self.start_depot = depot
+            self.start_depot_index = c.location_index.get(depot)
+            self.__update_from(0)
 
 
     def is_feasible(self):
         is_feasible = True
-        for i in range(len(self.shipments) - 1):
-            if self.shipments[i].start_time + c.time_diff_matrix.at[
-                self.shipments[i].end_location, self.shipments[i + 1].start_location] > \
-                    self.shipments[i + 1].start_time:
-                is_feasible = False
-                infeasible_truck = str(self.id)
+        if self.is_active() and self.__infeasible_sums[-1] > 0:
+            is_feasible = False
         # if self.is_too_long() and len(self.get_split_relief_points()) == 0:
         #     is_feasible = False
         return is_feasible
 
     def get_relief_points(self):
-        relief_points = []
-        for i in range(len(self.shipments)):
-            if self.shipments[i].start_location == self.start_depot:
-                relief_points.append(self.shipments[i].start_time)
-            if self.shipments[i].end_location == self.start_depot:
-                relief_points.append(self.shipments[i].end_time)
-        return relief_points
+        if self.__relief_points is None:
+            self.__relief_points = [relief_point for relief_points in self.__relief_points_per_shipment
+                                    for relief_point in relief_points]
+        return list(self.__relief_points)
 
     def get_split_relief_points(self):
         split_relief_points = []
-        for relief_point in self.get_relief_points():
-            if relief_point - self.get_start_time() > c.min_duration_split and \
-                    self.get_end_time() - relief_point > c.min_duration_split:
+        relief_points = self.get_relief_points()
+        if len(relief_points) > 0:
+            start_time = self.get_start_time()
+            end_time = self.get_end_time()
+        for relief_point in relief_points:
+            if relief_point - start_time > c.min_duration_split and \
+                    end_time - relief_point > c.min_duration_split:
                 split_relief_points.append(relief_point)
         return split_relief_points
 
@@ -131,26 +304,14 @@ class Truck:
         return empty_driving_costs
 
     def get_empty_driving_time(self):
-        empty_driving_time = 0
-        if self.is_active():
-            empty_driving_time += c.time_diff_matrix.at[self.start_depot, self.shipments[0].start_location]
-            for i in range(len(self.shipments) - 1):
-                empty_driving_time += c.time_diff_matrix.at[self.shipments[i].end_location, self.shipments[i + 1].start_location]
-            empty_driving_time += c.time_diff_matrix.at[self.shipments[-1].end_location, self.start_depot]
-        return empty_driving_time
+        return self.__empty_driving_time
 
     def get_waiting_costs(self):
         waiting_costs = c.weight_waiting_time * self.get_waiting_time()**2
         return waiting_costs
 
     def get_waiting_time(self):
-        waiting_time = 0
-        for i in range(len(self.shipments) - 1):
-            waiting_time += self.shipments[i + 1].start_time - self.shipments[i].end_time - \
-                    c.time_diff_matrix.at[self.shipments[i].end_location, self.shipments[i + 1].start_location]
-        if self.get_duration() < 7:
-            waiting_time += 7 - self.get_duration()
-        return waiting_time
+        return self.__waiting_time
 
     def get_length_costs(self):
         l = self.get_duration()
@@ -170,20 +331,206 @@ class Truck:
 
 
     def get_duration(self):
-        duration = 0
-        if self.is_active():
-            duration = c.time_diff_matrix.at[self.start_depot, self.shipments[0].start_location] + \
-                       (self.shipments[-1].end_time - self.shipments[0].start_time) + \
-                       c.time_diff_matrix.at[self.shipments[-1].end_location, self.start_depot]
-        return round(duration, 2)
+        return self.__duration
 
     def get_trip(self):
-        trip = [self.start_depot] + [shipment.shipment_id for shipment in self.shipments] + [
+        trip = [self.start_depot] + [shipment.shipment_id for shipment in self.__shipments] + [
             self.start_depot]
         return trip
 
+    def get_move_costs(self):
+        """
+        Costs of the truck day as used in move evaluation: the total costs, plus a penalty if the truck day is too long
+        and cannot be split. An infeasible truck day costs infinity.
+        :return: float
+        """
+        if not self.is_feasible():
+            return float('inf')
+        move_costs = self.get_total_costs()
+        if self.is_active() and self.is_too_long() and not self.is_splittable():
+            move_costs += c.penalty_too_long_without_split
+        return move_costs
+
+    def get_insertion_costs(self, shipment: Shipment):
+        """
+        Change in move costs if the shipment would be added to the truck. The truck is not changed.
+        :return: float
+        """
+        return self.__get_move_costs_delta(None, shipment)
+
+    def get_removal_costs(self, i):
+        """
+        Change in move costs if the ith shipment would be removed from the truck. The truck is not changed.
+        :return: float
+        """
+        return self.__get_move_costs_delta(i, None)
+
+    def get_exchange_costs(self, i, shipment: Shipment):
+        """
+        Change in move costs if the ith shipment would be replaced by the given shipment. The truck is not changed.
+        :return: float
+        """
+        return self.__get_move_costs_delta(i, shipment)
+
+    def get_tail_exchange_costs(self, i, shipments: list):
+        """
+        Change in move costs if the shipments from the ith on would be replaced by the given shipments, which start after
+        the (i-1)th shipment and are sorted by start time. The truck is not changed.
+        :return: float
+        """
+        new_move_costs = self.__get_move_costs_of_tail(i, self.__shipments[max(i - 1, 0):i] + list(shipments))
+        return get_move_costs_delta(self.get_move_costs(), new_move_costs)
+
+    def __get_move_costs_delta(self, removed_index, inserted_shipment):
+        new_move_costs = self.__get_move_costs_with(removed_index, inserted_shipment)
+        return get_move_costs_delta(self.get_move_costs(), new_move_costs)
+
+    def __get_move_costs_with(self, removed_index, inserted_shipment):
+        """
+        Move costs of the truck day after removing the shipment at removed_index and adding inserted_shipment, as
+        remove_ith_shipment and add_shipment would do. The prefix sums before the first changed position are reused, so
+        only the changed tail of the truck is walked through and the result equals the costs after the actual change.
+        """
+        shipments = self.__shipments
+        n = len(shipments)
+        position = n
+        if removed_index is not None:
+            if removed_index < 0:
+                removed_index += n
+            position = removed_index
+        if inserted_shipment is not None:
+            inserted_index = get_insertion_index(shipments, inserted_shipment.start_time, removed_index)
+            position = min(position, inserted_index)
+
+        # The new truck equals the old one before position, the tail starts at the last unchanged shipment
+        offset = max(position - 1, 0)
+        tail = shipments[offset:]
+        if removed_index is not None:
+            del tail[removed_index - offset]
+        if inserted_shipment is not None:
+            tail.insert(inserted_index - offset, inserted_shipment)
+        return self.__get_move_costs_of_tail(position, tail)
+
+    def __get_move_costs_of_tail(self, position, tail):
+        """
+        Move costs of the truck day with the shipments before position, followed by tail, which starts with the shipment
+        at position - 1 if position > 0. The prefix sums before position are reused, so only tail is walked through.
+        """
+        shipments = self.__shipments
+        if len(tail) == 0:
+            return 0
+
+        table = c.time_diff_table
+        if position <= 0:
+            first_shipment = tail[0]
+            pull_out = table[self.start_depot_index][first_shipment.start_location_index]
+            waiting_sum = 0
+            driving_sum = 0 + pull_out
+            infeasible_sum = 0
+        else:
+            first_shipment = shipments[0]
+            pull_out = self.__pull_out
+            waiting_sum = self.__waiting_sums[position - 1]
+            driving_sum = self.__driving_sums[position - 1]
+            infeasible_sum = self.__infeasible_sums[position - 1]
+            if infeasible_sum > 0:
+                return float('inf')
+        for k in range(1, len(tail)):
+            left_shipment = tail[k - 1]
+            right_shipment = tail[k]
+            driving_time = table[left_shipment.end_location_index][right_shipment.start_location_index]
+            waiting_sum = waiting_sum + (right_shipment.start_time - left_shipment.end_time - driving_time)
+            driving_sum = driving_sum + driving_time
+            infeasible_sum = infeasible_sum + (left_shipment.start_time + driving_time > right_shipment.start_time)
+        if infeasible_sum > 0:
+            return float('inf')
+
+        last_shipment = tail[-1]
+        pull_in = table[last_shipment.end_location_index][self.start_depot_index]
+        duration = round(pull_out + (last_shipment.end_time - first_shipment.start_time) + pull_in, 2)
+        waiting_time = waiting_sum
+        if duration < 7:
+            waiting_time += 7 - duration
+        empty_driving_time = driving_sum + pull_in
+        move_costs = int(self.startup_cost + c.weight_empty_driving_time * empty_driving_time +
+                         c.weight_waiting_time * waiting_time**2)
+
+        start_time = first_shipment.start_time - pull_out
+        if duration > get_max_duration(start_time, waiting_time):
+            end_time = last_shipment.end_time + pull_in
+            if position <= 0:
+                relief_points = []
+                new_shipments = tail
+            else:
+                relief_points = [relief_point for relief_points in self.__relief_points_per_shipment[:position]
+                                 for relief_point in relief_points]
+                new_shipments = tail[1:]
+            for shipment in new_shipments:
+                relief_points += self.__get_shipment_relief_points(shipment)
+            if not any(relief_point - start_time > c.min_duration_split and
+                       end_time - relief_point > c.min_duration_split for relief_point in relief_points):
+                move_costs += c.penalty_too_long_without_split
+        return move_costs
+
 #------------------------------------------------- Help Functions ----------------------------------------------------
 
+def get_max_duration(start_time, waiting_time):
+    if start_time < 1.25:
+        if waiting_time < 1:
+            max_duration = 11
+        else:
+            max_duration = 11.25
+    else:
+        if waiting_time < 1:
+            max_duration = 13.5
+        else:
+            max_duration = 14
+    return max_duration
+
+
+def get_insertion_index(shipments, start_time, removed_index=None):
+    """
+    Position at which add_shipment puts a shipment with start_time in shipments, which are sorted by start time, after
+    the shipment at removed_index is removed. Binary search, so the start times are not collected into a list first.
+    :return: int
+    """
+    n = len(shipments)
+    if n == 0 or start_time > shipments[-1].start_time:
+        low = n
+    else:
+        low, high = 0, n
+        while low < high:
+            middle = (low + high) // 2
+            if shipments[middle].start_time < start_time:
+                low = middle + 1
+            else:
+                high = middle
+    if removed_index is not None and removed_index < low:
+        low -= 1
+    return low
+
+
+def get_move_costs_delta(move_costs, new_move_costs):
+    """
+    Change in move costs from move_costs to new_move_costs. A move that makes an infeasible truck feasible gets
+    feasibility_repair_delta plus the new move costs, and a move after which the truck is infeasible infinity.
+    :return: float
+    """
+    if new_move_costs == float('inf'):
+        return float('inf')
+    if move_costs == float('inf'):
+        return feasibility_repair_delta + new_move_costs
+    if new_move_costs == move_costs:
+        return 0
+    return new_move_costs - move_costs
+
+
+def snapshot_trucks(trucks):
+    if trucks is None:
+        return None
+    return [truck.snapshot() for truck in trucks]
+
+
 # def shipment_to_truck(shipment):
 #     if shipment.type != 'T':
 #         return print('This shipment never was a truck')
@@ -0,0 +1,228 @@
+import constants as c
+from heuristics.Shipment import Shipment
+
+
+# ------------------------------------------------- Truck Timing ------------------------------------------------------
+
+class TruckTiming:
+    """
+    Timing of the shipments of a truck in their time windows, in the style of Savelsbergh. In O(n) it computes for
+    every shipment the earliest and latest start time of any feasible timing of the truck, and the forward time slack of
+    the current start times. After that, whether a shipment can be inserted at a position or a shipment can be delayed
+    is O(1).
+    """
+
+    def __init__(self, truck):
+        self.truck = truck
+        self.shipments = truck.shipments
+        shipments = self.shipments
+        table = c.time_diff_table
+        n = len(shipments)
+        self.time_windows = [get_time_window(shipment) for shipment in shipments]
+        self.lengths = [shipment.end_time - shipment.start_time for shipment in shipments]
+        self.driving_times = [table[shipments[k].end_location_index][shipments[k + 1].start_location_index]
+                              for k in range(n - 1)]
+
+        self.earliest_start_times = [0] * n
+        self.latest_start_times = [0] * n
+        self.forward_slacks = [0] * n
+        if n == 0:
+            return
+        self.earliest_start_times[0] = self.time_windows[0][0]
+        for k in range(1, n):
+            self.earliest_start_times[k] = max(self.time_windows[k][0], self.earliest_start_times[k - 1] +
+                                               self.lengths[k - 1] + self.driving_times[k - 1])
+        self.latest_start_times[-1] = self.time_windows[-1][1]
+        self.forward_slacks[-1] = self.time_windows[-1][1] - shipments[-1].start_time
+        for k in range(n - 2, -1, -1):
+            self.latest_start_times[k] = min(self.time_windows[k][1], self.latest_start_times[k + 1] -
+                                             self.lengths[k] - self.driving_times[k])
+            waiting_time = shipments[k + 1].start_time - shipments[k].end_time - self.driving_times[k]
+            self.forward_slacks[k] = min(self.time_windows[k][1] - shipments[k].start_time,
+                                         waiting_time + self.forward_slacks[k + 1])
+
+    def is_feasible(self):
+        """
+        True if the shipments can be timed in their time windows in their order
+        :return: bool
+        """
+        return all(earliest_start <= latest_start + 1e-6
+                   for earliest_start, latest_start in zip(self.earliest_start_times, self.latest_start_times))
+
+    def can_insert(self, shipment: Shipment, position):
+        """
+        True if shipment can be inserted before the shipment at position, or at the end if position is the number of
+        shipments, with all shipments in their time windows. The other shipments may be retimed.
+        :return: bool
+        """
+        table = c.time_diff_table
+        earliest_start, latest_start = get_time_window(shipment)
+        length = shipment.end_time - shipment.start_time
+        if position > 0:
+            previous_shipment = self.shipments[position - 1]
+            earliest_start = max(earliest_start, self.earliest_start_times[position - 1] + self.lengths[position - 1] +
+                                 table[previous_shipment.end_location_index][shipment.start_location_index])
+        if position < len(self.shipments):
+            next_shipment = self.shipments[position]
+            latest_start = min(latest_start, self.latest_start_times[position] - length -
+                               table[shipment.end_location_index][next_shipment.start_location_index])
+        return earliest_start <= latest_start + 1e-6
+
+    def can_delay(self, i, delay):
+        """
+        True if the ith shipment can start delay later than now, with the shipments after it only pushed as far as
+        needed, in their time windows
+        :return: bool
+        """
+        return delay <= self.forward_slacks[i] + 1e-6
+
+    def get_best_start_times(self, min_differences=()):
+        """
+        Start times with the least waiting time and duration. The waiting time between the shipments is the time
+        between the start of the first and the end of the last shipment minus what is fixed, so the first shipment
+        starts as late as it can and every next one as early as it can after that. min_differences are (i, j,
+        difference) with i < j, for which shipment j has to start at least difference after shipment i. Every
+        constraint runs forward, so one pass back gives the latest start of the first shipment and one pass forward the
+        rest.
+        :return: list of floats, or None if the shipments cannot be timed in their time windows
+        """
+        n = len(self.shipments)
+        if n == 0:
+            return []
+        if len(min_differences) == 0:
+            latest_start_times = self.latest_start_times
+        else:
+            latest_start_times = [0] * n
+            for k in range(n - 1, -1, -1):
+                latest_start_times[k] = self.time_windows[k][1]
+                if k < n - 1:
+                    latest_start_times[k] = min(latest_start_times[k], latest_start_times[k + 1] - self.lengths[k] -
+                                                self.driving_times[k])
+                for i, j, difference in min_differences:
+                    if i == k:
+                        latest_start_times[k] = min(latest_start_times[k], latest_start_times[j] - difference)
+        start_times = []
+        for k in range(n):
+            if k == 0:
+                start_time = latest_start_times[0]
+            else:
+                start_time = max(self.time_windows[k][0], start_times[-1] + self.lengths[k - 1] +
+                                 self.driving_times[k - 1])
+            for i, j, difference in min_differences:
+                if j == k:
+                    start_time = max(start_time, start_times[i] + difference)
+            if start_time < self.time_windows[k][0] - 1e-6 or start_time > latest_start_times[k] + 1e-6:
+                return None
+            start_times.append(start_time)
+        return start_times
+
+    def optimize(self):
+        """
+        Give the shipments of the truck the start times with the lowest move costs, see Truck.get_move_costs. The
+        waiting costs only grow with the span of the day, so get_best_start_times is optimal unless the truck is too
+        long and cannot be split. Then the penalty can only be avoided by a waiting time of at least 1 hour, which
+        raises the maximum duration, or by a split at a relief point, which needs 7 hours before and after it. Each of
+        those is a set of extra min_differences, and the cheapest of the timings is taken. A truck of which the current
+        start times are infeasible is retimed as well, but has no finite decrease, so 0 is returned for it.
+        :return: decrease of the move costs
+        """
+        truck = self.truck
+        shipments = self.shipments
+        n = len(shipments)
+        costs_before = truck.get_move_costs()
+        start_times = self.get_best_start_times()
+        if start_times is None:
+            return 0
+        best_start_times = [shipment.start_time for shipment in shipments]
+        best_costs = costs_before
+        truck.set_start_times(start_times)
+        costs = truck.get_move_costs()
+        if costs < best_costs:
+            best_start_times, best_costs = start_times, costs
+        if truck.is_too_long() and not truck.is_splittable():
+            table = c.time_diff_table
+            pull_out = table[truck.start_depot_index][shipments[0].start_location_index]
+            pull_in = table[shipments[-1].end_location_index][truck.start_depot_index]
+            margin = 0.002
+            candidates = []
+            if n > 1 and truck.get_waiting_time() < 1:
+                candidates.append([(0, n - 1, start_times[-1] - start_times[0] + 1 - truck.get_waiting_time() +
+                                    margin)])
+            for k, shipment in enumerate(shipments):
+                for location, offset in [(shipment.start_location, 0), (shipment.end_location, self.lengths[k])]:
+                    if location != truck.start_depot:
+                        continue
+                    # The relief point at start_times[k] + offset has to be more than 7 hours after the start and
+                    # before the end of the truck day
+                    before = c.min_duration_split - pull_out - offset + margin
+                    after = c.min_duration_split - pull_in - self.lengths[-1] + offset + margin
+                    if (k == 0 and before > 0) or (k == n - 1 and after > 0):
+                        continue
+                    candidates.append([(i, j, difference) for i, j, difference in [(0, k, before), (k, n - 1, after)]
+                                       if i < j])
+            for min_differences in candidates:
+                start_times = self.get_best_start_times(min_differences)
+                if start_times is None:
+                    continue
+                truck.set_start_times(start_times)
+                costs = truck.get_move_costs()
+                if costs < best_costs:
+                    best_start_times, best_costs = start_times, costs
+        truck.set_start_times(best_start_times)
+        if costs_before == float('inf'):
+            return 0
+        return costs_before - best_costs
+
+    def place(self):
+        """
+        Give the shipments of the truck the start times of get_best_start_times
+        :return: True if the truck could be timed
+        """
+        start_times = self.get_best_start_times()
+        if start_times is None:
+            return False
+        self.truck.set_start_times(start_times)
+        return True
+
+
+def get_time_window(shipment: Shipment):
+    """
+    The earliest and latest start time of shipment, its start time if it has no time window
+    :return: (float, float)
+    """
+    if shipment.input_shipment is None:
+        return shipment.start_time, shipment.start_time
+    return shipment.input_shipment.earliest_start_time, shipment.input_shipment.latest_start_time
+
+
+def shift_shipments_forward(truck):
+    """
+    Start every shipment but the last as late as its time window and the next shipment allow, from the back, so the
+    waiting time before the next shipment is as short as possible. The last shipment does not move.
+    """
+    shipments = truck.shipments
+    if len(shipments) < 2:
+        return
+    timing = TruckTiming(truck)
+    start_times = [shipment.start_time for shipment in shipments]
+    for k in range(len(shipments) - 2, -1, -1):
+        latest_start = min(timing.time_windows[k][1], start_times[k + 1] - timing.lengths[k] - timing.driving_times[k])
+        start_times[k] = max(start_times[k], latest_start)
+    truck.set_start_times(start_times)
+
+
+def shift_shipments_backward(truck):
+    """
+    Start every shipment but the first as early as its time window and the previous shipment allow, from the front, so
+    the waiting time after the previous shipment is as short as possible. The first shipment does not move.
+    """
+    shipments = truck.shipments
+    if len(shipments) < 2:
+        return
+    timing = TruckTiming(truck)
+    start_times = [shipment.start_time for shipment in shipments]
+    for k in range(1, len(shipments)):
+        earliest_start = max(timing.time_windows[k][0], start_times[k - 1] + timing.lengths[k - 1] +
+                             timing.driving_times[k - 1])
+        start_times[k] = min(start_times[k], earliest_start)
+    truck.set_start_times(start_times)
@@ -24,8 +24,10 @@ input_ilp = InputTW(shipments_file_time_windows=config.shipments_file_time_windo
 #input_ilp.print()
 
 tic = time.time()
+# The best schedule of a short randomized search is the MIP start of the ILP
+heuristic_start, _, _ = RandomizedSearch(input=input_ilp, config=config).get_solution(number_iterations=number_of_iterations)
 mdvsptwilp = MDVSPTWILP(input=input_ilp, config=config)
-ilp_solution: Schedule = mdvsptwilp.get_solution()
+ilp_solution: Schedule = mdvsptwilp.get_solution(start=heuristic_start)
 ilp_solution.post_shift_shipments()
 ilp_solution.post_improve_depots()
 # print('\n')
@@ -13,6 +13,7 @@ from heuristics.RandomizedtiesCS import RandomizedtiesCS
 import constants as c
 from heuristics.Schedule import Schedule
 from heuristics.Schedule import merge_schedules
+from heuristics.ShipmentRegistry import ShipmentRegistry
 from check import shipments_occurance
 import util
 import time
@@ -48,14 +49,9 @@ partial_heur_solution = Schedule(config=config, trucks=efficient_trucks)
 # print('Number of efficient fixed trucks: ', len(efficient_trucks))
 
 
-def exclude_truck_shipments_from_list(trucks, shipments):
-    return list(filter(
-        lambda shipment_tw: shipment_tw.id not in util.flatten(list(
-            map(lambda truck: list(map(lambda shipment: shipment.id, truck.shipments)),
-                trucks))),
-        shipments))
-
-shipments_to_be_placed = exclude_truck_shipments_from_list(efficient_trucks, input.shipments_tw)
+registry = ShipmentRegistry(input.shipments_tw)
+registry.fix(efficient_trucks)
+shipments_to_be_placed = registry.get_remaining_shipments_tw()
 
 input_greedy = InputTW(shipments_tw=shipments_to_be_placed)
 
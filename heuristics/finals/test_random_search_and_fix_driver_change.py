@@ -13,6 +13,7 @@ from heuristics.RandomizedtiesCS import RandomizedtiesCS
 import constants as c
 from heuristics.Schedule import Schedule
 from heuristics.Schedule import merge_schedules
+from heuristics.ShipmentRegistry import ShipmentRegistry
 from check import shipments_occurance
 import time
 
@@ -76,22 +77,9 @@ splittable_solution = Schedule(config=config, trucks=splittable_trucks)
 
 # splittable_trucks = heur_solution.get_splittable_trucks()
 #
-def flatten(list_of_lists):
-    if len(list_of_lists) == 0:
-        return list_of_lists
-    if isinstance(list_of_lists[0], list):
-        return flatten(list_of_lists[0]) + flatten(list_of_lists[1:])
-    return list_of_lists[:1] + flatten(list_of_lists[1:])
-#
-def exclude_truck_shipments_from_list(trucks, shipments):
-    return list(filter(
-        lambda shipment_tw: shipment_tw.id not in flatten(list(
-            map(lambda truck: list(map(lambda shipment: shipment.id, truck.shipments)),
-                trucks))),
-        shipments))
-
-
-shipments_to_be_placed = exclude_truck_shipments_from_list(fixed_trucks, input.shipments_tw)
+registry = ShipmentRegistry(input.shipments_tw)
+registry.fix(fixed_trucks)
+shipments_to_be_placed = registry.get_remaining_shipments_tw()
 
 #print('Number of infeasible trucks destroyed: ', number_infeasible_trucks)
 # print('Number of shipments to be replaced: ', len(shipments_to_be_placed))
@@ -14,6 +14,7 @@ from heuristics.RandomizedtiesCS import RandomizedtiesCS
 import constants as c
 from heuristics.Schedule import Schedule
 from heuristics.Schedule import merge_schedules
+from heuristics.ShipmentRegistry import ShipmentRegistry
 from check import shipments_occurance
 import util
 import time
@@ -42,14 +43,9 @@ running_time = toc - tic
 print('Running time: ', running_time)
 heur_solution.visualize(with_truck_costs=True, save=True)
 
-def exclude_truck_shipments_from_list(trucks, shipments):
-    return list(filter(
-        lambda shipment_tw: shipment_tw.id not in util.flatten(list(
-            map(lambda truck: list(map(lambda shipment: shipment.id, truck.shipments)),
-                trucks))),
-        shipments))
-
-shipments_tbd = exclude_truck_shipments_from_list(trucks, input.shipments_tw)
+registry = ShipmentRegistry(input.shipments_tw)
+registry.fix(trucks)
+shipments_tbd = registry.get_remaining_shipments_tw()
 
 add_greedily = RandomizedSearchbeforeafter(input=input, config=config, input_trucks=trucks,
                                 sorted_shipments_tw=shipments_tbd)
@@ -0,0 +1,289 @@
+import time
+import numpy as np
+import constants as c
+import util
+from heuristics.Config import Config
+from heuristics.FlowNetwork import FlowNetwork
+from heuristics.FlowSolvers import solve_flow_network
+from heuristics.InputTW import InputTW
+from heuristics.NetworkCache import NetworkCache, get_cache_key
+from heuristics.Schedule import Schedule
+from heuristics.Shipment import Shipment
+from heuristics.ShipmentArcs import ShipmentArcs
+from heuristics.Truck import Truck, snapshot_trucks
+
+
+# ---------------------------------------------- NetworkModel Class ---------------------------------------------------
+
+class NetworkModel:
+    """
+    The network flow models of ilp_models, built in three stages that can be run and timed separately: build() turns
+    the input into a FlowNetwork, solve() solves it with FlowSolvers and extract() decomposes the flow into the trucks
+    of a Schedule. A model has a layer per depot with a start and an end node and the shipments that can be executed
+    from the depot, and every shipment is executed exactly once in all layers together. The formulations are
+    subclasses that set:
+    - with_time_windows: discretize the time windows with the config, otherwise every shipment starts at its earliest
+      start time, or at its start time for InputFixed
+    - is_time_space: time space layers, with a start and an end event per shipment, waiting arcs between the events at
+      a location and connection arcs between them, instead of an arc between every pair of compatible shipments
+    - max_waiting_time: the maximum waiting time on the arcs between shipments, None for the one in constants and
+      np.inf for no maximum
+    A single depot model is made by giving depot, the other models have a layer for every depot of the input. With a
+    NetworkCache the network is loaded from disk when it was built before from the same input and config.
+    The input_trucks are fixed partial trucks, for instance of an earlier part of the day, that are continued or sent
+    back to their depot: every input truck is a node in the layer of its depot, with an arc from the start node of the
+    depot, so it counts for the capacity, arcs to the shipments that can follow its last shipment within the maximum
+    duration and an arc to the end node of the depot.
+    """
+
+    with_time_windows = False
+    is_time_space = False
+    max_waiting_time = np.inf
+
+    def __init__(self, input, config: Config, solver: str = 'auto', depot: str = None, time_limit=c.ilp_time_limit,
+                 cache: NetworkCache = None, input_trucks: list = None):
+        self.input = input
+        self.config = config
+        self.solver = solver
+        self.time_limit = time_limit
+        self.cache = cache
+        self.is_cache_hit = False
+        if self.with_time_windows:
+            self.shipments = get_discretized_shipments(input, config)
+        else:
+            self.shipments = get_fixed_shipments(input)
+        self.number_of_input_shipments = len({get_input_id(shipment) for shipment in self.shipments})
+        if depot is not None:
+            self.depots = {depot: self.number_of_input_shipments}
+        else:
+            self.depots = input.depots
+        self.shipment_arcs = ShipmentArcs(self.shipments)
+        self.input_trucks = snapshot_trucks(input_trucks) if input_trucks is not None else []
+        # Named by position, like the input trucks in the cache key, so that a cached network fits other trucks alike
+        self.truck_nodes = {'truck_' + str(k): truck for k, truck in enumerate(self.input_trucks)
+                            if truck.start_depot in self.depots}
+        self.network = None
+        self.shipment_nodes = None
+        self.solution_flows = None
+        self.solver_used = None
+        self.objective = None
+        self.build_time = None
+        self.solve_time = None
+        self.extract_time = None
+
+    def get_solution(self):
+        """
+        Build, solve and extract the model
+        :return: Schedule
+        """
+        self.build()
+        self.solve()
+        return self.extract()
+
+    # ----- Build -----
+
+    def build(self):
+        """
+        Build the network of the model, or load it from the cache. The shipment nodes are kept in shipment_nodes, with
+        their shipment
+        :return: FlowNetwork
+        """
+        tic = time.time()
+        self.shipment_nodes = {}
+        for depot in self.depots:
+            for position in self.get_depot_positions(depot).tolist():
+                self.shipment_nodes[self.get_node(depot, position)] = self.shipments[position]
+        if self.cache is not None:
+            key = get_cache_key(type(self).__name__, self.input, self.config, depots=sorted(self.depots.items()),
+                                input_trucks=[(truck.start_depot, truck.get_start_time(), truck.get_last_shipment().end_time,
+                                               truck.get_last_shipment().end_location) for truck in self.input_trucks])
+            self.network, self.is_cache_hit = self.cache.get_network(key, self.build_network)
+        else:
+            self.network = self.build_network()
+        self.build_time = time.time() - tic
+        return self.network
+
+    def build_network(self):
+        """
+        The network of the model, with a layer for every depot
+        :return: FlowNetwork
+        """
+        flow_upper, costs, nodes, exactly_one = {}, {}, [], {}
+        for depot in self.depots:
+            positions = self.get_depot_positions(depot)
+            shipment_nodes = [self.get_node(depot, position) for position in positions.tolist()]
+            for position, node in zip(positions.tolist(), shipment_nodes):
+                exactly_one.setdefault(get_input_id(self.shipments[position]), []).append(node)
+            if self.is_time_space:
+                self.__add_time_space_layer(flow_upper, costs, nodes, depot, positions)
+            else:
+                self.__add_connection_layer(flow_upper, costs, nodes, depot, positions)
+            self.__add_input_trucks(flow_upper, costs, nodes, exactly_one, depot, positions)
+            add_arc(flow_upper, costs, depot + '_t', depot + '_s', self.number_of_input_shipments + len(self.truck_nodes),
+                    0)
+            nodes += shipment_nodes + [depot + '_s', depot + '_t']
+        max_outflow = {depot + '_s': capacity for depot, capacity in self.depots.items()}
+        return FlowNetwork(flow_upper=flow_upper, costs=costs, nodes=nodes, exactly_one=exactly_one,
+                           max_outflow=max_outflow)
+
+    def get_depot_positions(self, depot):
+        """
+        The positions of the shipments in the layer of depot, by default all shipments
+        :return: array of positions
+        """
+        return np.arange(len(self.shipments))
+
+    def get_compatibility_arcs(self, positions):
+        """
+        The arcs between the shipments in positions of a connection layer
+        :return: positions of the first shipments, positions of the second shipments, costs
+        """
+        return self.shipment_arcs.get_compatibility_arcs(positions, self.max_waiting_time)
+
+    def get_node(self, depot, position, suffix=''):
+        return depot + '_' + self.shipment_arcs.ids[position] + suffix
+
+    def __add_connection_layer(self, flow_upper, costs, nodes, depot, positions):
+        self.__add_arcs(flow_upper, costs, depot, *self.get_compatibility_arcs(positions), upper=1)
+        self.__add_depot_arcs(flow_upper, costs, depot, positions, '', '')
+
+    def __add_time_space_layer(self, flow_upper, costs, nodes, depot, positions):
+        for position in positions.tolist():
+            node = self.get_node(depot, position)
+            add_arc(flow_upper, costs, node + '_s', node, 1, 0)
+            add_arc(flow_upper, costs, node, node + '_e', 1, 0)
+            nodes += [node + '_s', node + '_e']
+        upper = self.number_of_input_shipments
+        self.__add_arcs(flow_upper, costs, depot, *self.shipment_arcs.get_waiting_arcs(positions, is_start=True),
+                        upper=upper, first_suffix='_s', second_suffix='_s')
+        self.__add_arcs(flow_upper, costs, depot, *self.shipment_arcs.get_waiting_arcs(positions, is_start=False),
+                        upper=upper, first_suffix='_e', second_suffix='_e')
+        self.__add_arcs(flow_upper, costs, depot, *self.shipment_arcs.get_connection_arcs(positions), upper=upper,
+                        first_suffix='_e', second_suffix='_s')
+        self.__add_depot_arcs(flow_upper, costs, depot, positions, '_s', '_e')
+
+    def __add_arcs(self, flow_upper, costs, depot, first_positions, second_positions, arc_costs, upper,
+                   first_suffix='', second_suffix=''):
+        for first, second, cost in zip(first_positions.tolist(), second_positions.tolist(), arc_costs.tolist()):
+            add_arc(flow_upper, costs, self.get_node(depot, first, first_suffix),
+                    self.get_node(depot, second, second_suffix), upper, cost)
+
+    def __add_depot_arcs(self, flow_upper, costs, depot, positions, pull_out_suffix, pull_in_suffix):
+        pull_out_costs = self.shipment_arcs.get_pull_out_costs(depot, positions, c.fixed_cost_new_truck)
+        pull_in_costs = self.shipment_arcs.get_pull_in_costs(depot, positions)
+        for position, pull_out_cost, pull_in_cost in zip(positions.tolist(), pull_out_costs.tolist(),
+                                                         pull_in_costs.tolist()):
+            add_arc(flow_upper, costs, depot + '_s', self.get_node(depot, position, pull_out_suffix), 1, pull_out_cost)
+            add_arc(flow_upper, costs, self.get_node(depot, position, pull_in_suffix), depot + '_t', 1, pull_in_cost)
+
+    def __add_input_trucks(self, flow_upper, costs, nodes, exactly_one, depot, positions):
+        suffix = '_s' if self.is_time_space else ''
+        for node, truck in self.truck_nodes.items():
+            if truck.start_depot != depot:
+                continue
+            add_arc(flow_upper, costs, depot + '_s', node, 1, 0)
+            for position, cost in zip(*[array.tolist() for array in
+                                        self.shipment_arcs.get_continuation_arcs(truck, positions,
+                                                                                 self.max_waiting_time)]):
+                add_arc(flow_upper, costs, node, self.get_node(depot, position, suffix), 1, cost)
+            add_arc(flow_upper, costs, node, depot + '_t', 1, c.weight_empty_driving_time *
+                    c.time_diff_table[truck.get_last_shipment().end_location_index][truck.start_depot_index])
+            nodes.append(node)
+            exactly_one[node] = [node]
+
+    # ----- Solve -----
+
+    def solve(self):
+        """
+        Solve the network of the model, which is built first if it is not built yet
+        :return: dict with the flow on the arcs with positive flow or None
+        """
+        if self.network is None:
+            self.build()
+        tic = time.time()
+        self.solution_flows, self.solver_used = solve_flow_network(self.network, self.config.gap_percentage,
+                                                                   time_limit=self.time_limit, solver=self.solver)
+        if self.solution_flows is not None:
+            self.objective = self.network.get_objective(self.solution_flows)
+        self.solve_time = time.time() - tic
+        return self.solution_flows
+
+    # ----- Extract -----
+
+    def extract(self):
+        """
+        The trucks of the solution: every unit of flow from the start node to the end node of a depot is a truck of the
+        depot that executes the shipments of the shipment nodes on its path, or continues a snapshot of the input truck
+        of the first node on its path, so the input trucks of the model are left as they are
+        :return: Schedule
+        """
+        tic = time.time()
+        trucks = []
+        if self.solution_flows is not None:
+            paths = util.decompose_flow(self.solution_flows, [depot + '_s' for depot in self.depots],
+                                        [depot + '_t' for depot in self.depots])
+            for path in paths:
+                if path[1] in self.truck_nodes:
+                    truck = self.truck_nodes[path[1]].snapshot()
+                else:
+                    truck = Truck(start_depot=path[0][:-2])
+                for node in path[1:-1]:
+                    if node in self.shipment_nodes:
+                        truck.add_shipment(self.shipment_nodes[node])
+                trucks.append(truck)
+        schedule = Schedule(config=self.config, trucks=trucks)
+        self.extract_time = time.time() - tic
+        return schedule
+
+
+# ---------------------------------------------- Help Functions ----------------------------------------------------
+
+def add_arc(flow_upper: dict, costs: dict, from_node, to_node, upper, cost):
+    flow_upper[from_node, to_node] = upper
+    costs[from_node, to_node] = cost
+
+
+def get_fixed_shipments(input):
+    """
+    The shipments of input with fixed times: the shipments of InputFixed, or every shipment of InputTW at the earliest
+    start time of its time window
+    :return: list of Shipment
+    """
+    if isinstance(input, InputTW):
+        return [Shipment(input_shipment=shipment_tw, start_time=shipment_tw.earliest_start_time)
+                for shipment_tw in input.shipments_tw]
+    return list(input.shipments)
+
+
+def get_discretized_shipments(input: InputTW, config: Config):
+    return [shipment for shipment_tw in input.shipments_tw for shipment in shipment_tw.discretize_time_windows(config)]
+
+
+def get_input_id(shipment: Shipment):
+    """
+    The id of the shipment of the input that shipment is (a discretized copy of)
+    :return: str
+    """
+    return shipment.input_shipment.id if shipment.input_shipment is not None else shipment.id
+
+
+def run(model_class, **kwargs):
+    """
+    Solve a model on the shipments of the test date and print the size of the network, the times of the stages and the
+    schedule
+    """
+    config = Config(
+        shipments_file_time_windows='/test_data/Data ' + c.test_date + ' - Shipments.csv',
+        gap_percentage=1.0,
+        time_window_interval_in_minutes=20,
+        max_number_shipment_multiplication=5
+    )
+    input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+    model = model_class(input=input, config=config, **kwargs)
+    schedule = model.get_solution()
+    print(schedule)
+    print('ARCS: ', model.network.get_number_of_arcs())
+    print('BUILD TIME: ', model.build_time)
+    print('SOLVE TIME: ', model.solve_time)
+    print('EXTRACT TIME: ', model.extract_time)
+    print('OBJECTIVE: ', model.objective)
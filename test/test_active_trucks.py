@@ -0,0 +1,57 @@
+import unittest
+
+import constants as c
+from heuristics.ActiveTrucks import ActiveTrucks
+from heuristics.InputTW import InputTW
+from heuristics.Shipment import Shipment
+from heuristics.Truck import Truck
+from heuristics import RandomizedCS
+
+
+class TestActiveTrucks(unittest.TestCase):
+
+    def setUp(self):
+        self.input = InputTW(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', depots_file=c.depots_file)
+
+    def test_score_equals_truck_by_truck(self):
+        sorted_shipments_tw = sorted(self.input.shipments_tw, key=lambda shipment_tw: shipment_tw.latest_start_time)
+        trucks = [Truck(depot) for depot, number_of_trucks in self.input.depots.items() for _ in range(number_of_trucks)]
+        active_trucks = ActiveTrucks()
+        for shipment_tw in sorted_shipments_tw:
+            positions, start_times, costs = active_trucks.score(shipment_tw, before=True, max_duration=c.max_duration)
+            trucks_with_space = RandomizedCS.get_active_trucks_with_space(shipment_tw, active_trucks.trucks)
+            self.assertEqual([active_trucks.trucks[i] for i in positions], trucks_with_space)
+            for truck, start_time, cost in zip(trucks_with_space, start_times, costs):
+                shipment = RandomizedCS.cheapest_compatible_shipment_truck(truck, shipment_tw)
+                self.assertEqual(Shipment(input_shipment=shipment_tw, start_time=float(start_time)).start_time,
+                                 shipment.start_time)
+                self.assertEqual(cost, RandomizedCS.cost_active_truck(truck, shipment))
+            if len(positions) > 0:
+                the_best_truck = active_trucks.trucks[positions[0]]
+                the_best_truck.add_shipment(Shipment(input_shipment=shipment_tw, start_time=float(start_times[0])))
+                active_trucks.update(positions[0])
+            else:
+                rank, the_best_truck = next((rank, truck) for rank, truck in enumerate(trucks) if not truck.is_active())
+                the_best_truck.add_shipment(Shipment(start_time=shipment_tw.earliest_start_time, input_shipment=shipment_tw))
+                active_trucks.add_truck(the_best_truck, rank)
+
+    def test_init_with_many_trucks(self):
+        sorted_shipments_tw = sorted(self.input.shipments_tw, key=lambda shipment_tw: shipment_tw.latest_start_time)
+        trucks = [Truck(depot) for depot, number_of_trucks in self.input.depots.items() for _ in range(number_of_trucks)]
+        active_trucks = ActiveTrucks()
+        for rank, (truck, shipment_tw) in enumerate(zip(trucks[:40], sorted_shipments_tw)):
+            truck.add_shipment(Shipment(start_time=shipment_tw.earliest_start_time, input_shipment=shipment_tw))
+            active_trucks.add_truck(truck, rank)
+
+        # More trucks than the initial capacity of the arrays
+        copied_active_trucks = ActiveTrucks(active_trucks.trucks, active_trucks.ranks)
+        self.assertEqual(len(copied_active_trucks), 40)
+        for shipment_tw in sorted_shipments_tw[40:80]:
+            for result, copied_result in zip(active_trucks.score(shipment_tw, before=True, max_duration=c.max_duration),
+                                             copied_active_trucks.score(shipment_tw, before=True,
+                                                                        max_duration=c.max_duration)):
+                self.assertEqual(result.tolist(), copied_result.tolist())
+        shipment_tw = sorted_shipments_tw[40]
+        trucks[40].add_shipment(Shipment(start_time=shipment_tw.earliest_start_time, input_shipment=shipment_tw))
+        copied_active_trucks.add_truck(trucks[40], 40)
+        self.assertEqual(copied_active_trucks.trucks[-1], trucks[40])
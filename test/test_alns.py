@@ -0,0 +1,70 @@
+import random
+import unittest
+from unittest import mock
+
+import constants as c
+from heuristics.ALNS import ALNS, get_costs
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RandomizedSearch import RandomizedSearch
+
+
+class TestALNS(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=1.0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=5)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows, depots_file=c.depots_file)
+
+    def test_improves_initial_solution(self):
+        random.seed(0)
+        initial_solution = RandomizedSearch(input=self.input, config=self.config).get_construction()
+        initial_shipments = [(shipment.id, shipment.start_time) for truck in initial_solution.get_trucks()
+                             for shipment in truck.shipments]
+        initial_costs = get_costs(initial_solution)
+
+        alns = ALNS(input=self.input, config=self.config, initial_solution=initial_solution, time_limit=2)
+        solution = alns.get_solution()
+        self.assertGreater(alns.number_of_iterations, 0)
+        self.assertLessEqual(alns.best_costs, initial_costs)
+        self.assertEqual(alns.best_costs, get_costs(solution))
+        shipment_ids = [shipment.input_shipment.id for truck in solution.get_trucks() for shipment in truck.shipments]
+        self.assertCountEqual(shipment_ids, [shipment_tw.id for shipment_tw in self.input.shipments_tw])
+        self.assertTrue(solution.is_feasible())
+
+        # The initial solution is left as it was
+        self.assertEqual([(shipment.id, shipment.start_time) for truck in initial_solution.get_trucks()
+                          for shipment in truck.shipments], initial_shipments)
+        self.assertEqual(get_costs(initial_solution), initial_costs)
+
+    def test_costs_of_repaired_schedules(self):
+        random.seed(0)
+        initial_solution = RandomizedSearch(input=self.input, config=self.config).get_construction()
+        alns = ALNS(input=self.input, config=self.config, initial_solution=initial_solution, time_limit=1)
+        repair = alns._ALNS__repair
+        repaired = []
+
+        def logged_repair(*args):
+            repaired.append(repair(*args))
+            return repaired[-1]
+
+        with mock.patch.object(alns, '_ALNS__repair', side_effect=logged_repair):
+            alns.get_solution()
+        # The costs updated from the trucks that changed are the costs of the whole schedule
+        for candidate, candidate_total in [result for result in repaired if result is not None]:
+            self.assertEqual(candidate_total, get_costs(candidate))
+
+    def test_weights_update_every_segment(self):
+        random.seed(0)
+        initial_solution = RandomizedSearch(input=self.input, config=self.config).get_construction()
+        alns = ALNS(input=self.input, config=self.config, initial_solution=initial_solution, time_limit=2,
+                    segment_length=2, start_worsening=1e-9, end_worsening=1e-9)
+        update_weights = alns._ALNS__update_weights
+        with mock.patch.object(alns, '_ALNS__update_weights', side_effect=update_weights) as mocked:
+            alns.get_solution()
+        # Also the segments of which the last candidate is rejected update the weights
+        self.assertEqual(mocked.call_count, alns.number_of_iterations // 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
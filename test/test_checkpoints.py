@@ -0,0 +1,42 @@
+import random
+import unittest
+from unittest import mock
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RandomizedtiesCS import RandomizedtiesCS
+
+
+def get_trips(schedule):
+    return sorted([(truck.start_depot, truck.get_total_costs(), [(shipment.id, shipment.start_time) for shipment in truck.shipments])
+                   for truck in schedule.trucks])
+
+
+class TestCheckpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=1.0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=5)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows, depots_file=c.depots_file)
+
+    def test_resume_equals_construction_from_scratch(self):
+        # Ties are broken by the last truck, so that constructions do not depend on the random stream
+        with mock.patch('random.randint', side_effect=lambda a, b: b):
+            cs = RandomizedtiesCS(input=self.input, config=self.config, checkpoints=True)
+            first_schedule = cs.get_solution().snapshot()
+            first_trips = get_trips(first_schedule)
+            order = cs.sorted_shipments_tw
+            swaps = [(40, 120), (5, 30), (110, 60), (110, 60), (0, 100)]
+            trips = first_trips
+            for k, (r1, r2) in enumerate(swaps):
+                order[r1], order[r2] = order[r2], order[r1]
+                schedule = cs.get_solution()
+                from_scratch = RandomizedtiesCS(input=self.input, config=self.config, sorted_shipments_tw=list(order)).get_solution()
+                self.assertEqual(get_trips(schedule), get_trips(from_scratch))
+                if k % 2 == 1:
+                    order[r1], order[r2] = order[r2], order[r1]
+                    self.assertEqual(get_trips(cs.get_solution()), trips)
+                else:
+                    trips = get_trips(schedule)
+            self.assertEqual(get_trips(first_schedule), first_trips)
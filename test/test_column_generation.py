@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+
+import constants as c
+from heuristics.ColumnGeneration import ColumnGeneration
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.MDVSPTWILP import MDVSPTWILP
+
+
+class TestColumnGeneration(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=2)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows,
+                             depots_file=c.depots_file)
+        self.input.shipments_tw = self.input.shipments_tw[:30]
+
+    def test_solution_covers_every_shipment_once(self):
+        schedule = ColumnGeneration(input=self.input, config=self.config).get_solution()
+        shipment_ids = [shipment.input_shipment.id for truck in schedule.get_trucks() for shipment in truck.shipments]
+        self.assertCountEqual(shipment_ids, [shipment_tw.id for shipment_tw in self.input.shipments_tw])
+        for truck in schedule.get_trucks():
+            self.assertTrue(truck.is_feasible())
+            self.assertFalse(truck.is_too_long() and not truck.is_splittable())
+            for shipment in truck.shipments:
+                self.assertGreaterEqual(shipment.start_time, shipment.input_shipment.earliest_start_time - 1e-3)
+                self.assertLessEqual(shipment.start_time, shipment.input_shipment.latest_start_time + 1e-3)
+
+    def test_priced_trucks_have_negative_reduced_costs(self):
+        column_generation = ColumnGeneration(input=self.input, config=self.config)
+        shipment_duals = np.full(len(self.input.shipments_tw), 60000.0)
+        positions = column_generation.positions
+        for depot in self.input.depots:
+            trucks = column_generation.price(depot, shipment_duals, 0)
+            for truck in trucks:
+                self.assertLess(truck.get_total_costs() - sum(
+                    shipment_duals[positions[shipment.input_shipment.id]] for shipment in truck.shipments), 1)
+        self.assertEqual(column_generation.price('Ermelo', np.zeros(len(self.input.shipments_tw)), 0), [])
+
+    def test_not_worse_than_start(self):
+        start = MDVSPTWILP(input=self.input, config=self.config, solver='highs').get_solution()
+        start.trucks = [truck for truck in start.get_trucks() if not (truck.is_too_long() and not truck.is_splittable())]
+        if sum(len(truck.shipments) for truck in start.get_trucks()) < len(self.input.shipments_tw):
+            self.skipTest('start has trucks that are too long')
+        schedule = ColumnGeneration(input=self.input, config=self.config).get_solution(start=start)
+        self.assertLessEqual(schedule.get_total_costs(), start.get_total_costs())
@@ -0,0 +1,27 @@
+import unittest
+
+import util
+
+
+class TestDecomposeFlow(unittest.TestCase):
+
+    def test_trips_per_depot(self):
+        flows = {('A_s', 'A_1'): 1, ('A_s', 'A_2'): 1, ('A_1', 'A_3'): 1, ('A_3', 'A_t'): 1, ('A_2', 'A_t'): 1,
+                 ('A_t', 'A_s'): 2, ('B_s', 'B_4'): 1, ('B_4', 'B_t'): 1, ('B_t', 'B_s'): 1}
+        paths = util.decompose_flow(flows, ['A_s', 'B_s'], ['A_t', 'B_t'])
+        self.assertEqual(paths, [['A_s', 'A_1', 'A_3', 'A_t'], ['A_s', 'A_2', 'A_t'], ['B_s', 'B_4', 'B_t']])
+
+    def test_shared_nodes_in_time_space_network(self):
+        # Two trucks wait at the same time node, the flow on the waiting arc is 2
+        flows = {('s', '1_s'): 1, ('1_s', '1_e'): 1, ('1_e', 'w'): 1, ('s', 'w'): 1, ('w', 'x'): 2, ('x', '2_s'): 1,
+                 ('2_s', '2_e'): 1, ('2_e', 't'): 1, ('x', 't'): 1, ('t', 's'): 2}
+        paths = util.decompose_flow(flows, ['s'], ['t'])
+        self.assertEqual(len(paths), 2)
+        used_arcs = [(path[i], path[i + 1]) for path in paths for i in range(len(path) - 1)]
+        for arc, flow in flows.items():
+            if arc != ('t', 's'):
+                self.assertEqual(used_arcs.count(arc), flow)
+
+    def test_flow_not_conserved(self):
+        with self.assertRaises(ValueError):
+            util.decompose_flow({('s', '1'): 1}, ['s'], ['t'])
@@ -0,0 +1,87 @@
+import random
+import unittest
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.DepotAssignment import assign_depots, get_depot_costs, infeasible_costs
+from heuristics.InputTW import InputTW
+from heuristics.RandomizedSearch import RandomizedSearch
+
+
+class TestDepotAssignment(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=1.0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=5)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows, depots_file=c.depots_file)
+        random.seed(0)
+        self.schedule = RandomizedSearch(input=self.input, config=self.config).get_construction()
+
+    def test_depot_costs_equal_move_costs(self):
+        trucks = self.schedule.get_trucks()
+        depots = list(self.input.depots)
+        costs = get_depot_costs(trucks, depots)
+        for i, truck in enumerate(trucks):
+            for j, depot in enumerate(depots):
+                if depot != truck.start_depot:
+                    truck.change_depot_to(depot)
+                self.assertEqual(costs[i, j], truck.get_move_costs())
+
+    def test_capacities(self):
+        trucks = self.schedule.get_trucks()
+        # Without capacities every truck gets its cheapest depot
+        depots = {depot: len(trucks) for depot in self.input.depots}
+        assign_depots(trucks, depots)
+        costs = get_depot_costs(trucks, list(depots))
+        self.assertEqual(sum(truck.get_move_costs() for truck in trucks), costs.min(axis=1).sum())
+
+        # With room for 5 trucks at every depot but one the other trucks go there
+        depots = {depot: 5 for depot in self.input.depots}
+        depots['Ermelo'] = len(trucks)
+        costs_before = sum(truck.get_move_costs() for truck in trucks)
+        assign_depots(trucks, depots)
+        for depot, capacity in depots.items():
+            self.assertLessEqual(self.schedule.get_number_of_trucks_per_depot(depot), capacity)
+        self.assertGreaterEqual(sum(truck.get_move_costs() for truck in trucks), costs_before)
+
+        # Without room for all trucks they are left as they are
+        depots_before = [truck.start_depot for truck in trucks]
+        self.assertEqual(assign_depots(trucks, {'Ermelo': len(trucks) - 1}), 0)
+        self.assertEqual([truck.start_depot for truck in trucks], depots_before)
+
+    def test_fixed_trucks(self):
+        trucks = self.schedule.get_trucks()
+        fixed_trucks = trucks[::2]
+        fixed_depots = [truck.start_depot for truck in fixed_trucks]
+        depots = {depot: len(trucks) for depot in self.input.depots}
+        assign_depots(trucks, depots, fixed_trucks)
+        self.assertEqual([truck.start_depot for truck in fixed_trucks], fixed_depots)
+
+        # The fixed trucks take up the capacity of their depot, also if they alone do not fit in it
+        depots = {depot: 0 for depot in self.input.depots}
+        depots['Ermelo'] = len(trucks[1::2]) + fixed_depots.count('Ermelo')
+        assign_depots(trucks, depots, fixed_trucks)
+        self.assertEqual([truck.start_depot for truck in fixed_trucks], fixed_depots)
+        self.assertTrue(all(truck.start_depot == 'Ermelo' for truck in trucks[1::2]))
+
+    def test_infeasible_depot_costs(self):
+        trucks = self.schedule.get_trucks()
+        depots = list(self.input.depots)
+        costs = get_depot_costs(trucks, depots, infeasible_costs=infeasible_costs)
+        number_infeasible = 0
+        for i, truck in enumerate(trucks):
+            start_depot = truck.start_depot
+            for j, depot in enumerate(depots):
+                if depot != truck.start_depot:
+                    truck.change_depot_to(depot)
+                too_long = truck.is_too_long() and not truck.is_splittable()
+                if too_long and depot != start_depot:
+                    self.assertEqual(costs[i, j], infeasible_costs)
+                    number_infeasible += 1
+                else:
+                    self.assertEqual(costs[i, j], truck.get_move_costs())
+        self.assertGreater(number_infeasible, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+
+import constants as c
+from heuristics.Config import Config
+import heuristics.DepotDecomposition as depot_decomposition
+from heuristics.DepotDecomposition import DepotDecomposition, DepotLayerModel
+from heuristics.InputTW import InputTW
+
+
+class TestDepotDecomposition(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=2)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows,
+                             depots_file=c.depots_file)
+        self.input.shipments_tw = self.input.shipments_tw[:30]
+
+    def test_bounds_enclose_optimum(self):
+        decomposition = DepotDecomposition(input=self.input, config=self.config, max_iterations=20, solver='highs')
+        schedule = decomposition.get_solution()
+        shipment_ids = [shipment.input_shipment.id for truck in schedule.get_trucks() for shipment in truck.shipments]
+        self.assertCountEqual(shipment_ids, [shipment_tw.id for shipment_tw in self.input.shipments_tw])
+        model = DepotLayerModel(input=self.input, config=self.config, solver='highs')
+        model.get_solution()
+        self.assertLessEqual(decomposition.lower_bound, model.objective + 1e-3)
+        self.assertGreaterEqual(decomposition.upper_bound, model.objective - 1e-3)
+        self.assertGreater(decomposition.lower_bound, 0.9 * model.objective)
+        for truck in schedule.get_trucks():
+            self.assertIn(truck.start_depot, self.input.depots)
+
+    def test_parallel_equals_serial(self):
+        results = []
+        for number_of_workers in [1, 2]:
+            decomposition = DepotDecomposition(input=self.input, config=self.config, number_of_workers=number_of_workers,
+                                               max_iterations=5, primal_interval=2, solver='highs')
+            decomposition.get_solution()
+            results.append((decomposition.lower_bounds, decomposition.upper_bound))
+        self.assertEqual(results[0], results[1])
+
+    def test_restricted_solves_get_the_time_left(self):
+        decomposition = DepotDecomposition(input=self.input, config=self.config, max_iterations=20, primal_interval=5,
+                                           solver='highs', time_limit=60)
+        solve_flow_network = depot_decomposition.solve_flow_network
+        with mock.patch.object(depot_decomposition, 'solve_flow_network', side_effect=solve_flow_network) as mocked:
+            decomposition.get_solution()
+        time_limits = [call.kwargs['time_limit'] for call in mocked.call_args_list]
+        self.assertGreater(len(time_limits), 0)
+        for time_limit in time_limits:
+            self.assertLessEqual(time_limit, 60)
+        self.assertEqual(time_limits, sorted(time_limits, reverse=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+import constants as c
+from heuristics.DepotPools import DepotPools
+from heuristics.InputTW import InputTW
+from heuristics.Shipment import Shipment
+from heuristics.Truck import Truck
+
+
+class TestDepotPools(unittest.TestCase):
+
+    def setUp(self):
+        self.input = InputTW(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', depots_file=c.depots_file)
+        self.depots = {'Ermelo': 3, 'FC1': 2}
+
+    def new_shipment(self, i):
+        ship_tw = self.input.shipments_tw[i]
+        return Shipment(start_time=ship_tw.earliest_start_time, input_shipment=ship_tw)
+
+    def test_one_idle_truck_per_depot(self):
+        pools = DepotPools(self.depots)
+        self.assertEqual([truck.start_depot for truck in pools.get_idle_trucks()], ['Ermelo', 'FC1'])
+        for i in range(3):
+            truck = pools.get_idle_trucks()[0]
+            truck.add_shipment(self.new_shipment(i))
+            pools.activate(truck)
+        self.assertEqual(pools.get_remaining_capacity('Ermelo'), 0)
+        self.assertEqual([truck.start_depot for truck in pools.get_idle_trucks()], ['FC1'])
+        truck = pools.get_idle_trucks()[0]
+        truck.add_shipment(self.new_shipment(3))
+        self.assertEqual(pools.activate(truck), 3)
+        self.assertEqual(pools.active_ranks, [0, 1, 2, 3])
+        self.assertTrue(pools.has_idle_trucks())
+
+    def test_input_trucks(self):
+        active_truck = Truck('FC1', [self.new_shipment(0)])
+        idle_truck = Truck('Ermelo')
+        pools = DepotPools(self.depots, [active_truck, idle_truck])
+        self.assertEqual(pools.active_trucks, [active_truck])
+        self.assertEqual(pools.get_remaining_capacity('FC1'), 1)
+        self.assertEqual(pools.get_remaining_capacity('Ermelo'), 3)
+        self.assertIs(pools.get_idle_trucks()[0], idle_truck)
+        new_truck = pools.get_idle_trucks()[1]
+        new_truck.add_shipment(self.new_shipment(1))
+        pools.activate(new_truck)
+        idle_truck.add_shipment(self.new_shipment(2))
+        pools.activate(idle_truck)
+        self.assertEqual(pools.active_trucks, [active_truck, idle_truck, new_truck])
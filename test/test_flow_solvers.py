@@ -0,0 +1,79 @@
+import unittest
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.FlowNetwork import FlowNetwork
+from heuristics.FlowSolvers import solve_flow_network, get_solver_names, gp
+from heuristics.InputTW import InputTW
+from heuristics.ShipmentArcs import ShipmentArcs
+
+
+class TestFlowSolvers(unittest.TestCase):
+
+    def get_network(self, depots, number_of_shipments, max_number_shipment_multiplication):
+        config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=0,
+                        time_window_interval_in_minutes=20,
+                        max_number_shipment_multiplication=max_number_shipment_multiplication)
+        input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+        shipments_tw = [shipment_tw for shipment_tw in input.shipments_tw if 'IB' in shipment_tw.type or any(
+            c.time_diff_table[shipment_tw.start_location_index][c.location_index[depot]] < 1 for depot in depots)]
+        shipments = [shipment for shipment_tw in shipments_tw[:number_of_shipments]
+                     for shipment in shipment_tw.discretize_time_windows(config)]
+        shipment_arcs = ShipmentArcs(shipments)
+        flow_upper, costs, nodes, exactly_one = {}, {}, [], {}
+        for depot, number_of_trucks in depots.items():
+            positions = shipment_arcs.get_depot_positions(depot)
+            node_ids = [depot + '_' + shipment_arcs.ids[position] for position in positions]
+            nodes += node_ids
+            for position, node in zip(positions, node_ids):
+                exactly_one.setdefault(shipments[position].input_shipment.id, []).append(node)
+            first_positions, second_positions, arc_costs = shipment_arcs.get_compatibility_arcs(positions)
+            for first, second, cost in zip(first_positions, second_positions, arc_costs.tolist()):
+                arc = (depot + '_' + shipment_arcs.ids[first], depot + '_' + shipment_arcs.ids[second])
+                flow_upper[arc], costs[arc] = 1, cost
+            pull_out_costs = shipment_arcs.get_pull_out_costs(depot, positions, c.fixed_cost_new_truck).tolist()
+            pull_in_costs = shipment_arcs.get_pull_in_costs(depot, positions).tolist()
+            for node, pull_out_cost, pull_in_cost in zip(node_ids, pull_out_costs, pull_in_costs):
+                flow_upper[depot + '_s', node], costs[depot + '_s', node] = 1, pull_out_cost
+                flow_upper[node, depot + '_t'], costs[node, depot + '_t'] = 1, pull_in_cost
+            flow_upper[depot + '_t', depot + '_s'], costs[depot + '_t', depot + '_s'] = len(shipments), 0
+            nodes += [depot + '_s', depot + '_t']
+        max_outflow = {depot + '_s': number_of_trucks for depot, number_of_trucks in depots.items()}
+        return FlowNetwork(flow_upper, costs, nodes, exactly_one, max_outflow)
+
+    def assert_feasible(self, network, flows):
+        for node in network.nodes:
+            self.assertEqual(sum(flow for (i, _), flow in flows.items() if i == node),
+                             sum(flow for (_, j), flow in flows.items() if j == node))
+        for nodes in network.exactly_one.values():
+            self.assertEqual(sum(flow for (i, _), flow in flows.items() if i in nodes), 1)
+        for node, capacity in network.max_outflow.items():
+            self.assertLessEqual(sum(flow for (i, _), flow in flows.items() if i == node), capacity)
+
+    def test_single_depot_network_simplex_equals_highs(self):
+        network = self.get_network({'FC3': 40}, 40, 1)
+        self.assertTrue(network.is_pure_network())
+        self.assertEqual(get_solver_names(network), ['network_simplex'])
+        simplex_flows, solver = solve_flow_network(network, 0)
+        self.assertEqual(solver.name, 'network_simplex')
+        highs_flows, _ = solve_flow_network(network, 0, solver='highs')
+        self.assert_feasible(network, simplex_flows)
+        self.assert_feasible(network, highs_flows)
+        self.assertAlmostEqual(network.get_objective(simplex_flows), network.get_objective(highs_flows), places=3)
+
+    def test_multi_depot_highs_equals_gurobi(self):
+        network = self.get_network({'FC3': 10, 'FC1': 10}, 12, 2)
+        self.assertFalse(network.is_pure_network())
+        highs_flows, _ = solve_flow_network(network, 0, solver='highs')
+        self.assert_feasible(network, highs_flows)
+        if gp is None:
+            self.skipTest('gurobipy is not installed')
+        gurobi_flows, _ = solve_flow_network(network, 0, solver='gurobi')
+        self.assert_feasible(network, gurobi_flows)
+        self.assertAlmostEqual(network.get_objective(highs_flows), network.get_objective(gurobi_flows), places=3)
+
+    def test_infeasible(self):
+        network = self.get_network({'FC3': 1}, 40, 1)
+        flows, solver = solve_flow_network(network, 0)
+        self.assertIsNone(flows)
+        self.assertEqual(solver.status, 'NO SOLUTION')
@@ -0,0 +1,60 @@
+import unittest
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from ilp_models.MDVSP_TSN_model import MDVSPTSNModel
+from ilp_models.MDVSP_TSN_old_model import MDVSPTSNOldModel
+from ilp_models.MDVSP_TW_FixedOBStartDepots_model import MDVSPTWFixedOBStartDepotsModel
+from ilp_models.MDVSP_TW_model import MDVSPTWModel
+from ilp_models.MDVSP_model import MDVSPModel
+from ilp_models.MDVSPTW_TSN_model import MDVSPTWTSNModel
+from ilp_models.SDVSP_TSN_model import SDVSPTSNModel
+from ilp_models.SDVSP_model import SDVSPModel
+from ilp_models.VSPLPR_model import VSPLPRModel
+
+
+class TestILPModels(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=2)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows,
+                             depots_file=c.depots_file)
+        self.input.shipments_tw = self.input.shipments_tw[:20]
+
+    def test_every_shipment_executed_once(self):
+        for model_class in [SDVSPModel, SDVSPTSNModel, MDVSPModel, MDVSPTSNModel, MDVSPTSNOldModel, MDVSPTWModel,
+                            MDVSPTWTSNModel, MDVSPTWFixedOBStartDepotsModel, VSPLPRModel]:
+            model = model_class(input=self.input, config=self.config, solver='highs')
+            network = model.build()
+            self.assertIsNone(model.solution_flows)
+            self.assertGreater(network.get_number_of_arcs(), 0)
+            model.solve()
+            schedule = model.extract()
+            shipment_ids = [shipment.input_shipment.id for truck in schedule.get_trucks()
+                            for shipment in truck.shipments]
+            self.assertCountEqual(shipment_ids, [shipment_tw.id for shipment_tw in self.input.shipments_tw],
+                                  model_class.__name__)
+            for truck in schedule.get_trucks():
+                self.assertIn(truck.start_depot, self.input.depots)
+                for shipment in truck.shipments:
+                    self.assertGreaterEqual(shipment.start_time, shipment.input_shipment.earliest_start_time - 1e-3)
+                    self.assertLessEqual(shipment.start_time, shipment.input_shipment.latest_start_time + 1e-3)
+
+    def test_time_space_network_has_same_optimum(self):
+        for model_class, time_space_model_class in [(SDVSPModel, SDVSPTSNModel), (MDVSPTWModel, MDVSPTWTSNModel)]:
+            model = model_class(input=self.input, config=self.config, solver='highs')
+            model.get_solution()
+            time_space_model = time_space_model_class(input=self.input, config=self.config, solver='highs')
+            time_space_model.get_solution()
+            self.assertAlmostEqual(model.objective, time_space_model.objective, places=3)
+
+    def test_vsplpr_days_not_longer_than_max_duration(self):
+        self.input.shipments_tw = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows,
+                                          depots_file=c.depots_file).shipments_tw[:30]
+        model = VSPLPRModel(input=self.input, config=self.config)
+        schedule = model.get_solution()
+        self.assertEqual(sum(len(truck.shipments) for truck in schedule.get_trucks()), 30)
+        for truck in schedule.get_trucks():
+            self.assertLessEqual(truck.get_duration(), c.max_duration + 1e-6)
@@ -0,0 +1,50 @@
+import random
+import unittest
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.LocalSearch import LocalSearch
+from heuristics.RandomizedSearch import RandomizedSearch
+
+
+class TestLocalSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=1.0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=5)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows, depots_file=c.depots_file)
+        random.seed(0)
+        self.schedule = RandomizedSearch(input=self.input, config=self.config).get_construction()
+
+    def test_improves_within_time_windows(self):
+        for policy in ['first', 'best']:
+            schedule = self.schedule.snapshot()
+            costs_before = sum(truck.get_move_costs() for truck in schedule.get_trucks())
+            local_search = LocalSearch(policy=policy)
+            local_search.improve(schedule)
+            self.assertLess(sum(truck.get_move_costs() for truck in schedule.get_trucks()), costs_before)
+            self.assertGreater(sum(local_search.number_of_moves.values()), 0)
+
+            shipment_ids = [shipment.input_shipment.id for truck in schedule.get_trucks() for shipment in truck.shipments]
+            self.assertCountEqual(shipment_ids, [shipment_tw.id for shipment_tw in self.input.shipments_tw])
+            for truck in schedule.get_trucks():
+                self.assertTrue(truck.is_active())
+                for shipment in truck.shipments:
+                    self.assertIs(shipment.truck, truck)
+                    self.assertGreaterEqual(shipment.start_time, shipment.input_shipment.earliest_start_time - 1e-3)
+                    self.assertLessEqual(shipment.start_time, shipment.input_shipment.latest_start_time + 1e-3)
+                for shipment, next_shipment in zip(truck.shipments, truck.shipments[1:]):
+                    self.assertLessEqual(shipment.end_time + c.time_diff_table[shipment.end_location_index][
+                        next_shipment.start_location_index], next_shipment.start_time + 1e-3)
+
+    def test_only_tail_exchanges(self):
+        local_search = LocalSearch()
+        local_search.improve(self.schedule, moves=['tail_exchange'])
+        self.assertEqual(local_search.number_of_moves['relocate'], 0)
+        self.assertEqual(local_search.number_of_moves['exchange'], 0)
+        self.assertGreater(local_search.number_of_moves['tail_exchange'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import copy
+import unittest
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.DeterministicCS import DeterministicCS
+from heuristics.InputTW import InputTW
+from heuristics.Truck import Truck, feasibility_repair_delta
+
+
+class TestMoves(unittest.TestCase):
+
+    def setUp(self):
+        config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=1.0,
+                        time_window_interval_in_minutes=20, max_number_shipment_multiplication=5)
+        input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+        self.schedule = DeterministicCS(input=input, config=config).get_solution()
+        self.trucks = self.schedule.get_trucks()[:12]
+
+    def move_costs(self, *trucks):
+        return sum(truck.get_move_costs() for truck in trucks)
+
+    def assert_delta(self, delta, costs_before, costs_after):
+        if costs_after == float('inf'):
+            self.assertEqual(delta, float('inf'))
+        elif costs_before == float('inf'):
+            self.assertEqual(delta, feasibility_repair_delta + costs_after)
+        elif costs_before == costs_after:
+            self.assertEqual(delta, 0)
+        else:
+            self.assertEqual(delta, costs_after - costs_before)
+
+    def test_insertion_and_removal_costs(self):
+        for truck in self.trucks:
+            for i in range(len(truck.shipments)):
+                shipment = truck.shipments[i]
+                costs_before = truck.get_move_costs()
+                delta = truck.get_removal_costs(i)
+                truck.remove_ith_shipment(i)
+                self.assert_delta(delta, costs_before, truck.get_move_costs())
+                costs_before = truck.get_move_costs()
+                delta = truck.get_insertion_costs(shipment)
+                truck.add_shipment(shipment)
+                self.assert_delta(delta, costs_before, truck.get_move_costs())
+        truck = Truck(self.trucks[0].start_depot)
+        shipment = self.trucks[0].shipments[0]
+        self.assertEqual(truck.get_insertion_costs(shipment), Truck(truck.start_depot, [shipment]).get_total_costs())
+
+    def test_relocate_and_exchange_costs(self):
+        for truck_1 in self.trucks:
+            for truck_2 in self.trucks:
+                if truck_1 is truck_2:
+                    continue
+                for i in range(len(truck_1.shipments)):
+                    costs_before = self.move_costs(truck_1, truck_2)
+                    delta = self.schedule.get_relocate_costs(truck_1, i, truck_2)
+                    shipment = truck_1.shipments[i]
+                    self.schedule.relocate_shipment(truck_1, i, truck_2)
+                    self.assert_delta(delta, costs_before, self.move_costs(truck_1, truck_2))
+                    self.schedule.relocate_shipment(truck_2, truck_2.shipments.index(shipment), truck_1)
+                    self.assertEqual(self.move_costs(truck_1, truck_2), costs_before)
+
+                    for j in range(len(truck_2.shipments)):
+                        costs_before = self.move_costs(truck_1, truck_2)
+                        delta = self.schedule.get_exchange_costs(truck_1, i, truck_2, j)
+                        shipment_1 = truck_1.shipments[i]
+                        shipment_2 = truck_2.shipments[j]
+                        self.schedule.exchange_shipments(truck_1, i, truck_2, j)
+                        self.assert_delta(delta, costs_before, self.move_costs(truck_1, truck_2))
+                        self.schedule.exchange_shipments(truck_1, truck_1.shipments.index(shipment_2),
+                                                         truck_2, truck_2.shipments.index(shipment_1))
+
+    def test_tail_exchange_costs(self):
+        for truck_1 in self.trucks:
+            for truck_2 in self.trucks:
+                for i in range(len(truck_1.shipments) + 1):
+                    for j in range(len(truck_2.shipments) + 1):
+                        delta = truck_1.get_tail_exchange_costs(i, truck_2.shipments[j:])
+                        shipments = [copy.copy(shipment) for shipment in truck_1.shipments[:i] + truck_2.shipments[j:]]
+                        self.assert_delta(delta, truck_1.get_move_costs(),
+                                          Truck(truck_1.start_depot, shipments).get_move_costs())
+
+    def test_costs_of_infeasible_truck(self):
+        truck = next(truck for truck in self.trucks if len(truck.shipments) >= 3)
+        other_shipment = next(truck_2 for truck_2 in self.trucks if truck_2 is not truck).shipments[0]
+        # Start the second shipment before the first, so the truck cannot drive in between
+        shipment = truck.shipments[1]
+        shipment.set_start_time(truck.shipments[0].start_time - 1)
+        self.assertFalse(truck.is_feasible())
+        self.assertEqual(truck.get_move_costs(), float('inf'))
+
+        def costs_after(i=None, inserted_shipment=None, tail_index=None):
+            changed = truck.snapshot()
+            if i is not None:
+                changed.remove_ith_shipment(i)
+            if inserted_shipment is not None:
+                changed.add_shipment(copy.copy(inserted_shipment))
+            while tail_index is not None and len(changed.shipments) > tail_index:
+                changed.remove_ith_shipment(-1)
+            return changed.get_move_costs()
+
+        for i in range(len(truck.shipments)):
+            self.assert_delta(truck.get_removal_costs(i), float('inf'), costs_after(i))
+            self.assert_delta(truck.get_exchange_costs(i, other_shipment), float('inf'), costs_after(i, other_shipment))
+        self.assert_delta(truck.get_insertion_costs(other_shipment), float('inf'), costs_after(None, other_shipment))
+        self.assertEqual(truck.get_tail_exchange_costs(2, []), float('inf'))
+
+        # Removing one of the two overlapping shipments can make the truck feasible again
+        self.assertLess(min(truck.get_removal_costs(i) for i in range(2)), 0)
+        self.assert_delta(truck.get_tail_exchange_costs(1, []), float('inf'), costs_after(tail_index=1))
@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.MDVSPTWILP import MDVSPTWILP
+from heuristics.NetworkCache import NetworkCache, get_cache_key
+from heuristics.Shipment import Shipment
+from heuristics.Truck import Truck
+from ilp_models.MDVSP_TW_FixedOBStartDepots_model import MDVSPTWFixedOBStartDepotsModel
+from ilp_models.VSPLPR_model import VSPLPRModel
+
+
+class TestNetworkCache(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=2)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows,
+                             depots_file=c.depots_file)
+        self.input.shipments_tw = self.input.shipments_tw[:20]
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = NetworkCache(directory=self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_saved_network_is_loaded_unchanged(self):
+        network = VSPLPRModel(input=self.input, config=self.config).build()
+        network.max_total_flow.append((network.arcs[:3], 2))
+        self.cache.save('key', network)
+        loaded = self.cache.load('key')
+        self.assertEqual(loaded.nodes, network.nodes)
+        self.assertEqual(loaded.arcs, network.arcs)
+        self.assertEqual(loaded.flow_upper, network.flow_upper)
+        self.assertEqual(loaded.costs, network.costs)
+        self.assertEqual(loaded.exactly_one, network.exactly_one)
+        self.assertEqual(loaded.max_outflow, network.max_outflow)
+        self.assertEqual(loaded.max_total_flow, network.max_total_flow)
+        self.assertIsNone(self.cache.load('other key'))
+        self.assertEqual((self.cache.number_of_hits, self.cache.number_of_misses), (1, 1))
+
+    def test_key_changes_with_input_and_config(self):
+        key = get_cache_key('MDVSPTWILP', self.input, self.config)
+        self.assertEqual(key, get_cache_key('MDVSPTWILP', self.input, self.config))
+        self.assertNotEqual(key, get_cache_key('MDVSPTWModel', self.input, self.config))
+        config = Config(shipments_file_time_windows=self.config.shipments_file_time_windows, gap_percentage=0,
+                        time_window_interval_in_minutes=20, max_number_shipment_multiplication=3)
+        self.assertNotEqual(key, get_cache_key('MDVSPTWILP', self.input, config))
+        self.input.shipments_tw[0].latest_start_time += 0.5
+        self.assertNotEqual(key, get_cache_key('MDVSPTWILP', self.input, self.config))
+
+    def test_cached_models_give_same_solution(self):
+        costs = []
+        for is_cache_hit in [False, True]:
+            ilp = MDVSPTWILP(input=self.input, config=self.config, solver='highs', cache=self.cache)
+            costs.append(ilp.get_solution().get_total_costs())
+            self.assertEqual(ilp.is_cache_hit, is_cache_hit)
+        self.assertAlmostEqual(costs[0], costs[1], places=3)
+
+        objectives = []
+        for is_cache_hit in [False, True]:
+            model = VSPLPRModel(input=self.input, config=self.config, cache=self.cache)
+            model.get_solution()
+            objectives.append(model.objective)
+            self.assertEqual(model.is_cache_hit, is_cache_hit)
+        self.assertAlmostEqual(objectives[0], objectives[1], places=3)
+
+    def test_cached_network_continues_other_input_trucks(self):
+        # Trucks with the same depot and last shipment, but another id, get the cached network
+        shipments_tw = sorted(self.input.shipments_tw, key=lambda shipment_tw: shipment_tw.earliest_start_time)
+        first_shipment_tw = shipments_tw[0]
+        self.input.shipments_tw = shipments_tw[1:]
+        for is_cache_hit in [False, True]:
+            truck = Truck(start_depot=list(self.input.depots)[0])
+            truck.add_shipment(Shipment(input_shipment=first_shipment_tw, start_time=first_shipment_tw.earliest_start_time))
+            model = MDVSPTWFixedOBStartDepotsModel(input=self.input, config=self.config, cache=self.cache,
+                                                   input_trucks=[truck])
+            schedule = model.get_solution()
+            self.assertEqual(model.is_cache_hit, is_cache_hit)
+            shipment_ids = [shipment.input_shipment.id for truck in schedule.get_trucks() for shipment in truck.shipments]
+            self.assertCountEqual(shipment_ids, [shipment_tw.id for shipment_tw in shipments_tw])
+
+
+if __name__ == '__main__':
+    unittest.main()
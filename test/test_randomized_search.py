@@ -0,0 +1,55 @@
+import random
+import unittest
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RandomizedSearch import RandomizedSearch, BestSolutions, add_if_better, \
+    get_solutions_by_number_of_trucks
+
+
+class TestRandomizedSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=1.0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=5)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows, depots_file=c.depots_file)
+
+    def test_merging_by_number_of_trucks(self):
+        random.seed(0)
+        search = RandomizedSearch(input=self.input, config=self.config)
+        solutions = [search.get_construction() for i in range(12)]
+        # Two workers that each see half of the solutions
+        best_per_number_of_trucks = {}
+        for worker_solutions in [solutions[:6], solutions[6:]]:
+            best_solutions = BestSolutions(worker_solutions[0])
+            for solution in worker_solutions[1:]:
+                best_solutions.add(solution)
+            for number_of_trucks, solution in best_solutions.best_per_number_of_trucks.items():
+                add_if_better(best_per_number_of_trucks, number_of_trucks, solution)
+        merged = get_solutions_by_number_of_trucks(best_per_number_of_trucks)
+
+        best_costs = min(solution.get_total_costs() for solution in solutions)
+        self.assertEqual(merged[0].get_total_costs(), best_costs)
+        number_of_trucks = merged[0].get_total_number_of_trucks()
+        for k in [1, 2]:
+            with_more_trucks = [solution.get_total_costs() for solution in solutions
+                                if solution.get_total_number_of_trucks() == number_of_trucks + k]
+            if len(with_more_trucks) > 0:
+                self.assertEqual(merged[k].get_total_costs(), min(with_more_trucks))
+            else:
+                self.assertIs(merged[k], merged[0])
+
+    def test_parallel_is_reproducible(self):
+        search = RandomizedSearch(input=self.input, config=self.config)
+        costs = [[solution.get_total_costs() for solution in search.get_solution_parallel(5, number_of_workers=2, seed=1)]
+                 for run in range(2)]
+        self.assertEqual(costs[0], costs[1])
+
+    def test_cost_bound_keeps_best_solutions(self):
+        search = RandomizedSearch(input=self.input, config=self.config)
+        costs = []
+        for with_cost_bound in [False, True]:
+            random.seed(2)
+            costs.append([solution.get_total_costs() for solution in search.get_solution(10, with_cost_bound=with_cost_bound)])
+        self.assertEqual(costs[0], costs[1])
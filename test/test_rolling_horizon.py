@@ -0,0 +1,104 @@
+import copy
+import unittest
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RollingHorizon import RollingHorizon
+from ilp_models.MDVSP_TW_FixedOBStartDepots_model import MDVSPTWFixedOBStartDepotsModel
+
+
+class TestRollingHorizon(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=2)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows,
+                             depots_file=c.depots_file)
+        self.input.shipments_tw = sorted(self.input.shipments_tw,
+                                         key=lambda shipment_tw: shipment_tw.earliest_start_time)[:60]
+
+    def test_input_trucks_are_continued(self):
+        middle = self.input.shipments_tw[30].earliest_start_time
+        first_input = copy.copy(self.input)
+        first_input.shipments_tw = [shipment_tw for shipment_tw in self.input.shipments_tw
+                                    if shipment_tw.earliest_start_time < middle]
+        trucks = MDVSPTWFixedOBStartDepotsModel(input=first_input, config=self.config, solver='highs') \
+            .get_solution().get_trucks()
+        second_input = copy.copy(self.input)
+        second_input.shipments_tw = [shipment_tw for shipment_tw in self.input.shipments_tw
+                                     if shipment_tw.earliest_start_time >= middle]
+        schedule = MDVSPTWFixedOBStartDepotsModel(input=second_input, config=self.config, solver='highs',
+                                                  input_trucks=trucks).get_solution()
+
+        self.assertCountEqual([truck.id for truck in trucks],
+                              [truck.id for truck in schedule.get_trucks() if truck.id in {t.id for t in trucks}])
+        continued = {truck.id: truck for truck in schedule.get_trucks()}
+        for truck in trucks:
+            self.assertEqual([(shipment.id, shipment.start_time) for shipment in
+                              continued[truck.id].shipments[:len(truck.shipments)]],
+                             [(shipment.id, shipment.start_time) for shipment in truck.shipments])
+        shipment_ids = [shipment.input_shipment.id for truck in schedule.get_trucks() for shipment in truck.shipments]
+        self.assertCountEqual(shipment_ids, [shipment_tw.id for shipment_tw in self.input.shipments_tw])
+
+    def test_extract_twice(self):
+        middle = self.input.shipments_tw[30].earliest_start_time
+        first_input = copy.copy(self.input)
+        first_input.shipments_tw = [shipment_tw for shipment_tw in self.input.shipments_tw
+                                    if shipment_tw.earliest_start_time < middle]
+        trucks = MDVSPTWFixedOBStartDepotsModel(input=first_input, config=self.config, solver='highs') \
+            .get_solution().get_trucks()
+        second_input = copy.copy(self.input)
+        second_input.shipments_tw = [shipment_tw for shipment_tw in self.input.shipments_tw
+                                     if shipment_tw.earliest_start_time >= middle]
+        model = MDVSPTWFixedOBStartDepotsModel(input=second_input, config=self.config, solver='highs',
+                                               input_trucks=trucks)
+        first = model.get_solution()
+        second = model.extract()
+        self.assertEqual([[shipment.id for shipment in truck.shipments] for truck in first.get_trucks()],
+                         [[shipment.id for shipment in truck.shipments] for truck in second.get_trucks()])
+        self.assertEqual([len(truck.shipments) for truck in model.input_trucks], [len(truck.shipments) for truck in trucks])
+
+    def test_every_shipment_once(self):
+        rolling_horizon = RollingHorizon(input=self.input, config=self.config, window_length=2, overlap=1,
+                                         solver='highs')
+        schedule = rolling_horizon.get_solution()
+        self.assertGreater(len(rolling_horizon.slice_sizes), 1)
+        shipment_ids = [shipment.input_shipment.id for truck in schedule.get_trucks() for shipment in truck.shipments]
+        self.assertCountEqual(shipment_ids, [shipment_tw.id for shipment_tw in self.input.shipments_tw])
+        for truck in schedule.get_trucks():
+            for shipment, next_shipment in zip(truck.shipments, truck.shipments[1:]):
+                self.assertLessEqual(shipment.end_time + c.time_diff_table[shipment.end_location_index][
+                    next_shipment.start_location_index], next_shipment.start_time + 1e-6)
+
+    def test_slices_share_time_limit_and_finish_trucks(self):
+        slice_models = []
+
+        class RecordingModel(MDVSPTWFixedOBStartDepotsModel):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                if 'input_trucks' in kwargs:
+                    slice_models.append(self)
+
+        rolling_horizon = RollingHorizon(input=self.input, config=self.config, model_class=RecordingModel,
+                                         window_length=2, overlap=1, solver='highs', time_limit=60)
+        schedule = rolling_horizon.get_solution()
+        time_limits = [model.time_limit for model in slice_models]
+        # The first slice gets a share of the time limit, the last slice what is left of it
+        self.assertLess(time_limits[0], 60 / 2)
+        self.assertLessEqual(time_limits[-1], 60)
+        # The trucks that no shipment left can continue are not carried into the last slice
+        self.assertLess(len(slice_models[-1].input_trucks), len(schedule.get_trucks()))
+        shipment_ids = [shipment.input_shipment.id for truck in schedule.get_trucks() for shipment in truck.shipments]
+        self.assertCountEqual(shipment_ids, [shipment_tw.id for shipment_tw in self.input.shipments_tw])
+        for model in slice_models:
+            for depot, capacity in model.depots.items():
+                self.assertGreaterEqual(capacity, 0)
+
+    def test_overlap_longer_than_window(self):
+        with self.assertRaises(ValueError):
+            RollingHorizon(input=self.input, config=self.config, window_length=2, overlap=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.ShipmentArcs import ShipmentArcs
+
+
+class TestShipmentArcs(unittest.TestCase):
+
+    def setUp(self):
+        config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=1.0,
+                        time_window_interval_in_minutes=20, max_number_shipment_multiplication=2)
+        input = InputTW(shipments_file_time_windows=config.shipments_file_time_windows, depots_file=c.depots_file)
+        self.shipments = [shipment for shipment_tw in input.shipments_tw[:80]
+                          for shipment in shipment_tw.discretize_time_windows(config)]
+        self.shipment_arcs = ShipmentArcs(self.shipments)
+
+    def test_depot_positions(self):
+        for depot in ['Ermelo', 'FC1', 'DC2']:
+            positions = [i for i, shipment in enumerate(self.shipments) if 'IB' in shipment.type or
+                         c.time_diff_table[shipment.start_location_index][c.location_index[depot]] < 1]
+            self.assertEqual(self.shipment_arcs.get_depot_positions(depot).tolist(), positions)
+
+    def test_compatibility_arcs_equal_double_loop(self):
+        positions = self.shipment_arcs.get_depot_positions('FC1')
+        arcs = []
+        for i in positions:
+            for j in positions:
+                first, second = self.shipments[i], self.shipments[j]
+                empty_driving_time = c.time_diff_table[first.end_location_index][second.start_location_index]
+                waiting_time = second.start_time - first.end_time - empty_driving_time
+                if 0 <= waiting_time <= c.max_waiting_time:
+                    arcs.append((i, j, c.weight_waiting_time * waiting_time +
+                                 c.weight_empty_driving_time * empty_driving_time))
+        first_positions, second_positions, costs = self.shipment_arcs.get_compatibility_arcs(positions)
+        self.assertGreater(len(arcs), 0)
+        self.assertEqual(list(zip(first_positions.tolist(), second_positions.tolist(), costs.tolist())), arcs)
+
+    def test_first_match_arcs_equal_double_loop(self):
+        positions = self.shipment_arcs.get_depot_positions('FC1')
+        first_matches = {}
+        for i in positions:
+            for j in sorted(positions, key=lambda j: (self.shipments[j].start_time, j)):
+                first, second = self.shipments[i], self.shipments[j]
+                empty_driving_time = c.time_diff_table[first.end_location_index][second.start_location_index]
+                waiting_time = second.start_time - first.end_time - empty_driving_time
+                if waiting_time >= 0 and (i, second.start_location_index) not in first_matches:
+                    first_matches[i, second.start_location_index] = (
+                        j, c.weight_waiting_time * waiting_time + c.weight_empty_driving_time * empty_driving_time)
+        arcs = sorted((i, j, cost) for (i, _), (j, cost) in first_matches.items())
+        first_positions, second_positions, costs = self.shipment_arcs.get_first_match_arcs(positions)
+        self.assertGreater(len(arcs), 0)
+        self.assertEqual(sorted(zip(first_positions.tolist(), second_positions.tolist(), costs.tolist())), arcs)
+
+    def test_pull_out_and_pull_in_costs(self):
+        positions = self.shipment_arcs.get_depot_positions('Ermelo')
+        depot_index = c.location_index['Ermelo']
+        pull_out_costs = self.shipment_arcs.get_pull_out_costs('Ermelo', positions, c.fixed_cost_new_truck)
+        pull_in_costs = self.shipment_arcs.get_pull_in_costs('Ermelo', positions)
+        for position, pull_out_cost, pull_in_cost in zip(positions, pull_out_costs.tolist(), pull_in_costs.tolist()):
+            shipment = self.shipments[position]
+            self.assertEqual(pull_out_cost, c.fixed_cost_new_truck + c.weight_empty_driving_time *
+                             c.time_diff_table[depot_index][shipment.start_location_index])
+            self.assertEqual(pull_in_cost, c.weight_empty_driving_time *
+                             c.time_diff_table[shipment.end_location_index][depot_index])
+
+    def test_connection_arcs_connect_every_compatible_pair(self):
+        positions = self.shipment_arcs.get_depot_positions('FC1')
+        connection_arcs = set(zip(*[array.tolist() for array in self.shipment_arcs.get_connection_arcs(positions)[:2]]))
+        start_waiting_arcs = dict(zip(*[array.tolist() for array in
+                                        self.shipment_arcs.get_waiting_arcs(positions, is_start=True)[:2]]))
+        end_waiting_arcs = dict(zip(*[array.tolist() for array in
+                                      self.shipment_arcs.get_waiting_arcs(positions, is_start=False)[:2]]))
+        first_positions, second_positions, _ = self.shipment_arcs.get_compatibility_arcs(positions, np.inf)
+        self.assertLess(len(connection_arcs), len(first_positions))
+        for first, second in zip(first_positions.tolist(), second_positions.tolist()):
+            ends = [first]
+            while ends[-1] in end_waiting_arcs:
+                ends.append(end_waiting_arcs[ends[-1]])
+            starts = {second}
+            is_connected = False
+            for end in ends:
+                start = next((start for (arc_end, start) in connection_arcs if arc_end == end and
+                              self.shipments[start].start_location_index == self.shipments[second].start_location_index),
+                             None)
+                while start is not None and not is_connected:
+                    is_connected = start in starts
+                    start = start_waiting_arcs.get(start)
+            self.assertTrue(is_connected)
@@ -0,0 +1,29 @@
+import unittest
+
+import constants as c
+from heuristics.InputTW import InputTW
+from heuristics.Shipment import Shipment
+from heuristics.ShipmentRegistry import ShipmentRegistry
+from heuristics.Truck import Truck
+
+
+class TestShipmentRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.input = InputTW(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', depots_file=c.depots_file)
+        self.shipments_tw = sorted(self.input.shipments_tw, key=lambda shipment_tw: shipment_tw.latest_start_time)
+
+    def new_truck(self, indices):
+        shipments = [Shipment(start_time=self.shipments_tw[i].earliest_start_time, input_shipment=self.shipments_tw[i])
+                     for i in indices]
+        return Truck('FC1', shipments)
+
+    def test_fix_keeps_order(self):
+        registry = ShipmentRegistry(self.shipments_tw)
+        self.assertEqual(registry.get_remaining_shipments_tw(), self.shipments_tw)
+        self.assertEqual(registry.fix([self.new_truck([3]), self.new_truck([0])]), 2)
+        self.assertEqual(registry.fix([self.new_truck([3])]), 0)
+        remaining = [shipment_tw for i, shipment_tw in enumerate(self.shipments_tw) if i not in [0, 3]]
+        self.assertEqual(registry.get_remaining_shipments_tw(), remaining)
+        self.assertEqual(registry.get_fixed_shipments_tw(), [self.shipments_tw[0], self.shipments_tw[3]])
+        self.assertEqual(len(registry), len(self.shipments_tw) - 2)
@@ -0,0 +1,29 @@
+import unittest
+
+import constants as c
+import util
+from heuristics.Shipment import Shipment, ShipmentTW
+from heuristics.Truck import Truck
+
+
+class TestTimeDiff(unittest.TestCase):
+
+    def test_table_equals_matrix(self):
+        for from_location in c.locations:
+            for to_location in c.locations:
+                value = c.time_diff_matrix.at[from_location, to_location]
+                if isinstance(value, str):
+                    continue
+                self.assertEqual(util.time_diff(from_location, to_location), value)
+                self.assertEqual(c.time_diff_array[c.location_index[from_location], c.location_index[to_location]], value)
+
+    def test_interned_locations(self):
+        tw = ShipmentTW('id_1', 10.0, 10.5, 11.5, 12.0, 'FC1', 'DC1', 'IBDC')
+        shipment = Shipment(input_shipment=tw, start_time=10.25)
+        self.assertEqual(tw.start_location_index, c.location_index['FC1'])
+        self.assertEqual(shipment.end_location_index, c.location_index['DC1'])
+        truck = Truck('Ermelo', [shipment])
+        self.assertEqual(truck.start_depot_index, c.location_index['Ermelo'])
+        truck.change_depot_to('FC1')
+        self.assertEqual(truck.start_depot_index, c.location_index['FC1'])
+        self.assertIsNone(util.get_location_index('Unknown location'))
@@ -0,0 +1,145 @@
+import random
+import unittest
+
+import constants as c
+from heuristics.InputTW import InputTW
+from heuristics.Shipment import Shipment
+from heuristics.Truck import Truck
+
+
+def reference_metrics(truck: Truck):
+    ships = truck.shipments
+    table = c.time_diff_table
+    duration = 0
+    empty_driving_time = 0
+    waiting_time = 0
+    feasible = True
+    if len(ships) > 0:
+        duration = table[truck.start_depot_index][ships[0].start_location_index] + \
+                   (ships[-1].end_time - ships[0].start_time) + table[ships[-1].end_location_index][truck.start_depot_index]
+        empty_driving_time += table[truck.start_depot_index][ships[0].start_location_index]
+        for i in range(len(ships) - 1):
+            driving_time = table[ships[i].end_location_index][ships[i + 1].start_location_index]
+            empty_driving_time += driving_time
+            waiting_time += ships[i + 1].start_time - ships[i].end_time - driving_time
+            if ships[i].start_time + driving_time > ships[i + 1].start_time:
+                feasible = False
+        empty_driving_time += table[ships[-1].end_location_index][truck.start_depot_index]
+    duration = round(duration, 2)
+    if duration < 7:
+        waiting_time += 7 - duration
+    relief_points = []
+    for ship in ships:
+        if ship.start_location == truck.start_depot:
+            relief_points.append(ship.start_time)
+        if ship.end_location == truck.start_depot:
+            relief_points.append(ship.end_time)
+    return duration, empty_driving_time, waiting_time, feasible, relief_points
+
+
+class TestTruck(unittest.TestCase):
+
+    def setUp(self):
+        self.input = InputTW(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', depots_file=c.depots_file)
+
+    def assert_metrics(self, truck):
+        duration, empty_driving_time, waiting_time, feasible, relief_points = reference_metrics(truck)
+        self.assertEqual(truck.get_duration(), duration)
+        self.assertEqual(truck.get_empty_driving_time(), empty_driving_time)
+        self.assertEqual(truck.get_waiting_time(), waiting_time)
+        self.assertEqual(truck.is_feasible(), feasible)
+        self.assertEqual(truck.get_relief_points(), relief_points)
+
+    def test_incremental_metrics(self):
+        rng = random.Random(3)
+        depots = list(self.input.depots.keys())
+        for _ in range(20):
+            truck = Truck(rng.choice(depots))
+            self.assert_metrics(truck)
+            for ship_tw in rng.sample(self.input.shipments_tw, 8):
+                truck.add_shipment(Shipment(input_shipment=ship_tw, start_time=ship_tw.earliest_start_time))
+                self.assert_metrics(truck)
+            for _ in range(5):
+                ship = rng.choice(truck.shipments)
+                ship.set_start_time(rng.uniform(ship.input_shipment.earliest_start_time, ship.input_shipment.latest_start_time))
+                self.assert_metrics(truck)
+            truck.change_depot_to(rng.choice([depot for depot in depots if depot != truck.start_depot]))
+            self.assert_metrics(truck)
+            truck.remove_ith_shipment(-1)
+            self.assert_metrics(truck)
+            truck.remove_shipment(truck.shipments[0])
+            self.assert_metrics(truck)
+            while truck.is_active():
+                truck.remove_ith_shipment(rng.randrange(len(truck.shipments)))
+                self.assert_metrics(truck)
+
+    def test_snapshot(self):
+        rng = random.Random(5)
+        ships_tw = sorted(rng.sample(self.input.shipments_tw, 6), key=lambda ship_tw: ship_tw.earliest_start_time)
+        truck = Truck('Ermelo')
+        for ship_tw in ships_tw[:4]:
+            truck.add_shipment(Shipment(input_shipment=ship_tw, start_time=ship_tw.earliest_start_time))
+        metrics = reference_metrics(truck)
+        start_times = [ship.start_time for ship in truck.shipments]
+        snapshot = truck.snapshot()
+        self.assertEqual(snapshot.id, truck.id)
+        self.assertEqual(reference_metrics(snapshot), metrics)
+
+        ship = snapshot.shipments[0]
+        ship.set_start_time(ship.input_shipment.latest_start_time)
+        snapshot.add_shipment(Shipment(input_shipment=ships_tw[4], start_time=ships_tw[4].earliest_start_time))
+        snapshot.change_depot_to('FC1')
+        self.assert_metrics(snapshot)
+        self.assertIs(ship.truck, snapshot)
+
+        self.assertEqual(reference_metrics(truck), metrics)
+        self.assertEqual([ship.start_time for ship in truck.shipments], start_times)
+        self.assertTrue(all(ship.truck is truck for ship in truck.shipments))
+        truck.remove_ith_shipment(0)
+        self.assert_metrics(truck)
+        self.assertEqual(len(snapshot.shipments), 5)
+
+        # A shipment kept from before the snapshot only shifts the truck it is on
+        ship = truck.shipments[-1]
+        metrics = reference_metrics(truck)
+        snapshot = truck.snapshot()
+        ship.set_start_time(ship.start_time + 0.5)
+        self.assert_metrics(truck)
+        self.assert_metrics(snapshot)
+        self.assertEqual(reference_metrics(snapshot), metrics)
+
+    def test_snapshots_stay_independent(self):
+        rng = random.Random(7)
+        depots = list(self.input.depots.keys())
+        ships_tw = sorted(rng.sample(self.input.shipments_tw, 40), key=lambda ship_tw: ship_tw.earliest_start_time)
+        truck = Truck('Ermelo')
+        for ship_tw in ships_tw[:8]:
+            truck.add_shipment(Shipment(input_shipment=ship_tw, start_time=ship_tw.earliest_start_time))
+        trucks = [truck]
+        for step in range(200):
+            truck = rng.choice(trucks)
+            # A shipment held from before the change, for instance before a snapshot is taken
+            held_shipment = rng.choice(truck.shipments) if truck.is_active() else None
+            states = [(reference_metrics(other), [(ship.id, ship.start_time) for ship in other.shipments])
+                      for other in trucks]
+            operation = rng.randrange(5)
+            if operation == 0:
+                trucks.append(truck.snapshot())
+                truck = rng.choice([truck, trucks[-1]])
+            if operation <= 1 and held_shipment is not None:
+                held_shipment.set_start_time(rng.uniform(held_shipment.input_shipment.earliest_start_time,
+                                                         held_shipment.input_shipment.latest_start_time))
+                truck = held_shipment.truck
+            elif operation == 2:
+                ship_tw = rng.choice(ships_tw)
+                truck.add_shipment(Shipment(input_shipment=ship_tw, start_time=ship_tw.earliest_start_time))
+            elif operation == 3 and truck.is_active():
+                truck.remove_ith_shipment(rng.randrange(len(truck.shipments)))
+            elif operation == 4:
+                truck.change_depot_to(rng.choice([depot for depot in depots if depot != truck.start_depot]))
+            for other, (metrics, shipments) in zip(trucks, states):
+                self.assert_metrics(other)
+                if other is not truck:
+                    self.assertEqual(reference_metrics(other), metrics)
+                    self.assertEqual([(ship.id, ship.start_time) for ship in other.shipments], shipments)
+                self.assertTrue(all(ship.truck is other for ship in other.shipments))
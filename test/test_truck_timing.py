@@ -0,0 +1,128 @@
+import random
+import unittest
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.InputTW import InputTW
+from heuristics.RandomizedSearch import RandomizedSearch, run_construction
+from heuristics.RandomizedtiesCSnomaxduration import RandomizedtiesCSnomaxduration
+from heuristics.TruckTiming import TruckTiming, get_time_window, shift_shipments_backward, shift_shipments_forward
+
+
+def is_timeable(shipments):
+    """
+    True if the shipments, each started as early as it can, all start in their time windows
+    """
+    start_time = None
+    for k, shipment in enumerate(shipments):
+        earliest_start, latest_start = get_time_window(shipment)
+        if k > 0:
+            previous_shipment = shipments[k - 1]
+            earliest_start = max(earliest_start, start_time + previous_shipment.end_time - previous_shipment.start_time +
+                                 c.time_diff_table[previous_shipment.end_location_index][shipment.start_location_index])
+        if earliest_start > latest_start + 1e-6:
+            return False
+        start_time = earliest_start
+    return True
+
+
+class TestTruckTiming(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=1.0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=5)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows, depots_file=c.depots_file)
+        random.seed(0)
+        self.schedule = RandomizedSearch(input=self.input, config=self.config).get_construction()
+        self.trucks = self.schedule.get_trucks()
+
+    def test_place_beats_shifts(self):
+        for truck in self.trucks:
+            shifted = truck.snapshot()
+            shift_shipments_forward(shifted)
+            shift_shipments_backward(shifted)
+            placed = truck.snapshot()
+            self.assertTrue(TruckTiming(placed).place())
+            self.assertLessEqual(placed.get_waiting_time(), shifted.get_waiting_time() + 1e-6)
+            self.assertLessEqual(placed.get_duration(), shifted.get_duration() + 1e-6)
+            self.assertEqual(placed.get_empty_driving_time(), truck.get_empty_driving_time())
+            for shipment in placed.shipments:
+                earliest_start, latest_start = get_time_window(shipment)
+                self.assertGreaterEqual(shipment.start_time, earliest_start - 1e-3)
+                self.assertLessEqual(shipment.start_time, latest_start + 1e-3)
+            for shipment, next_shipment in zip(placed.shipments, placed.shipments[1:]):
+                self.assertLessEqual(shipment.end_time + c.time_diff_table[shipment.end_location_index][
+                    next_shipment.start_location_index], next_shipment.start_time + 1e-3)
+
+    def test_shift_forward_keeps_last_shipment(self):
+        for truck in self.trucks:
+            last_start_time = truck.get_last_shipment().start_time
+            duration = truck.get_duration()
+            shift_shipments_forward(truck)
+            self.assertEqual(truck.get_last_shipment().start_time, last_start_time)
+            self.assertLessEqual(truck.get_duration(), duration)
+
+    def test_can_insert(self):
+        random.seed(1)
+        shipments = [shipment for truck in self.trucks for shipment in truck.shipments]
+        for truck in self.trucks[:20]:
+            timing = TruckTiming(truck)
+            for shipment in random.sample(shipments, 20):
+                for position in range(len(truck.shipments) + 1):
+                    self.assertEqual(timing.can_insert(shipment, position),
+                                     is_timeable(truck.shipments[:position] + [shipment] + truck.shipments[position:]))
+
+    def test_can_delay(self):
+        for truck in self.trucks:
+            timing = TruckTiming(truck)
+            shipments = truck.shipments
+            for i in range(len(shipments)):
+                for delay in [timing.forward_slacks[i], timing.forward_slacks[i] + 0.01]:
+                    # Delay shipment i and push the shipments after it as far as needed
+                    start_time = shipments[i].start_time + delay
+                    fits = start_time <= get_time_window(shipments[i])[1] + 1e-6
+                    for k in range(i + 1, len(shipments)):
+                        start_time = max(shipments[k].start_time, start_time + timing.lengths[k - 1] +
+                                         timing.driving_times[k - 1])
+                        fits = fits and start_time <= get_time_window(shipments[k])[1] + 1e-6
+                    self.assertEqual(timing.can_delay(i, delay), fits)
+
+    def test_optimize_timing(self):
+        # Without the maximum duration in the construction there are trucks that are too long
+        random.seed(0)
+        schedule = run_construction(RandomizedtiesCSnomaxduration(input=self.input, config=self.config))
+        costs_before = sum(truck.get_move_costs() for truck in schedule.get_trucks())
+        self.assertGreater(schedule.post_optimize_timing(), 0)
+        self.assertLess(sum(truck.get_move_costs() for truck in schedule.get_trucks()), costs_before)
+
+        # No random timing in the time windows is cheaper
+        random.seed(1)
+        for truck in schedule.get_trucks():
+            self.assertEqual(truck.optimize_timing(), 0)
+            costs = truck.get_move_costs()
+            timing = TruckTiming(truck)
+            start_times = [shipment.start_time for shipment in truck.shipments]
+            for sample in range(20):
+                random_start_times = []
+                for k in range(len(truck.shipments)):
+                    earliest_start = timing.time_windows[k][0] if k == 0 else max(
+                        timing.time_windows[k][0], random_start_times[-1] + timing.lengths[k - 1] +
+                        timing.driving_times[k - 1])
+                    random_start_times.append(random.uniform(earliest_start, timing.latest_start_times[k]))
+                truck.set_start_times(random_start_times)
+                self.assertGreaterEqual(truck.get_move_costs(), costs)
+            truck.set_start_times(start_times)
+
+    def test_optimize_infeasible_truck(self):
+        truck = next(truck for truck in self.trucks if len(truck.shipments) >= 2)
+        # Start the second shipment before the first, so the current timing is infeasible
+        shipment = truck.shipments[1]
+        shipment.set_start_time(truck.shipments[0].start_time - 1)
+        self.assertEqual(truck.get_move_costs(), float('inf'))
+        self.assertEqual(truck.optimize_timing(), 0)
+        self.assertTrue(truck.is_feasible())
+        self.assertLess(truck.get_move_costs(), float('inf'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+import constants as c
+from heuristics.Config import Config
+from heuristics.FlowSolvers import gp
+from heuristics.InputTW import InputTW
+from heuristics.MDVSPTWILP import MDVSPTWILP
+
+
+class TestWarmStart(unittest.TestCase):
+
+    def setUp(self):
+        self.config = Config(shipments_file_time_windows='/test_data/Data 31_03 - Shipments.csv', gap_percentage=0,
+                             time_window_interval_in_minutes=20, max_number_shipment_multiplication=2)
+        self.input = InputTW(shipments_file_time_windows=self.config.shipments_file_time_windows,
+                             depots_file=c.depots_file)
+        self.input.shipments_tw = self.input.shipments_tw[:14]
+
+    def test_solution_as_start(self):
+        if gp is None:
+            self.skipTest('gurobipy is not installed')
+        schedule = MDVSPTWILP(input=self.input, config=self.config, solver='gurobi').get_solution()
+        ilp = MDVSPTWILP(input=self.input, config=self.config, solver='gurobi')
+        warm_schedule = ilp.get_solution(start=schedule)
+        self.assertEqual(ilp.number_start_trucks_not_mapped, 0)
+        self.assertIsNotNone(ilp.solver_used.time_to_first_incumbent)
+        self.assertEqual(ilp.solver_used.gap, 0)
+        self.assertEqual(warm_schedule.get_total_costs(), schedule.get_total_costs())
+
+    def test_start_ignored_without_mip_start(self):
+        schedule = MDVSPTWILP(input=self.input, config=self.config, solver='highs').get_solution()
+        ilp = MDVSPTWILP(input=self.input, config=self.config, solver='highs')
+        warm_schedule = ilp.get_solution(start=schedule)
+        self.assertEqual(ilp.number_start_trucks_not_mapped, 0)
+        self.assertIsNone(ilp.solver_used.time_to_first_incumbent)
+        self.assertEqual(warm_schedule.get_total_costs(), schedule.get_total_costs())
@@ -16,6 +16,13 @@ def random_0_or_1_or_2():
     else:
         return 0
 
+# Location lookups on the interned travel time matrix
+def get_location_index(location):
+    return c.location_index.get(location)
+
+def time_diff(from_location, to_location):
+    return c.time_diff_table[c.location_index[from_location]][c.location_index[to_location]]
+
 # Format function for dictionary
 def format_dict(d, indent=0):
     for key, value in d.items():
@@ -53,9 +60,41 @@ def insert(seq, item, key=lambda v: v):
     keys.insert(i, k)  # Insert key of item to keys list.
     seq.insert(i, item)  # Insert the item itself in the corresponding place.
 
-def flatten(list_of_lists):
-    if len(list_of_lists) == 0:
-        return list_of_lists
-    if isinstance(list_of_lists[0], list):
-        return flatten(list_of_lists[0]) + flatten(list_of_lists[1:])
-    return list_of_lists[:1] + flatten(list_of_lists[1:])
+# Lower bound on the number of trucks: the part between the latest start and the earliest end of a shipment is driven
+# whatever its start time, so shipments whose parts overlap all need a different truck
+def get_min_number_of_trucks(shipments_tw):
+    events = []
+    for shipment_tw in shipments_tw:
+        if shipment_tw.latest_start_time < shipment_tw.earliest_end_time:
+            events.append((shipment_tw.latest_start_time, 1))
+            events.append((shipment_tw.earliest_end_time, -1))
+    min_number_of_trucks = 0
+    number_of_trucks = 0
+    for time, change in sorted(events):
+        number_of_trucks += change
+        min_number_of_trucks = max(min_number_of_trucks, number_of_trucks)
+    return min_number_of_trucks
+
+
+# Flow decomposition of an integer network flow solution into truck trips: every unit of flow leaving a start node is
+# followed along arcs with flow left until it reaches an end node. Every unit of flow on an arc is used once, so this
+# takes time linear in the total length of the trips.
+def decompose_flow(flows: dict, start_nodes: list, end_nodes: list):
+    successors = {}
+    for (from_node, to_node), flow in flows.items():
+        successors.setdefault(from_node, []).extend([to_node] * int(round(flow)))
+    for nodes in successors.values():
+        nodes.reverse()
+    end_nodes = set(end_nodes)
+    paths = []
+    for start_node in start_nodes:
+        while len(successors.get(start_node, [])) > 0:
+            path = [start_node]
+            node = start_node
+            while node not in end_nodes:
+                if len(successors.get(node, [])) == 0:
+                    raise ValueError('Flow is not conserved in node ' + str(node))
+                node = successors[node].pop()
+                path.append(node)
+            paths.append(path)
+    return paths